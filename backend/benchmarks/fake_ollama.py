@@ -0,0 +1,238 @@
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from datetime import datetime, timezone
+from typing import List, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from pydantic import BaseModel
+
+USER_SECTION = re.compile(r"<\|start_header_id\|>user<\|end_header_id\|>(.*?)(?:<\|eot_id\|>|$)", re.S)
+WORD = re.compile(r"[a-z][a-z0-9+#.\-]*[a-z0-9+#]|[a-z]")
+STOPWORDS = frozenset("""
+    a about above after all also an and any are as at be been being but by can could did do does
+    for from had has have having he her here his how i if in into is it its just may me more most
+    my no not of on once only or other our out over own same she should so some such than that the
+    their them then there these they this those through to too under until up very was we were
+    what when where which while who whom why will with would you your resume job requirements
+    keywords looking experience experienced knowledge strong using work works team daily plus
+    required build operate services candidate
+""".split())
+
+KIND_LISTING_KEYWORDS = "listing_keywords"
+KIND_LISTING_KEYWORDS_BATCH = "listing_keywords_batch"
+KIND_RESUME_KEYWORDS = "resume_keywords"
+KIND_MISSING_KEYWORDS = "missing_keywords"
+KIND_SUMMARY = "summary"
+KIND_OTHER = "other"
+
+
+class FakeOllamaConfig(BaseModel):
+    first_token_ms: float = 50.0
+    token_ms: float = 10.0
+    parallel: int = 4
+    max_queue: int = 512
+    failure_rate: float = 0.0
+    seed: Optional[int] = None
+
+
+class FakeOllamaStats(BaseModel):
+    requests: int = 0
+    failures: int = 0
+    rejected: int = 0
+    in_flight: int = 0
+    peak_in_flight: int = 0
+    waiting: int = 0
+    peak_waiting: int = 0
+    by_kind: dict = {}
+
+
+def classify_prompt(prompt: str) -> str:
+    if "keyword extraction engine" in prompt and "numbered job listings" in prompt:
+        return KIND_LISTING_KEYWORDS_BATCH
+    if "keyword extraction engine" in prompt:
+        return KIND_LISTING_KEYWORDS if "listing text" in prompt else KIND_RESUME_KEYWORDS
+    if "NOT mentioned in the resume" in prompt:
+        return KIND_MISSING_KEYWORDS
+    if "resume analysis engine" in prompt:
+        return KIND_SUMMARY
+    return KIND_OTHER
+
+
+def extract_keywords(text: str, limit: int = 10) -> List[str]:
+    """The most frequent non-stopwords of the text; ties keep their order of appearance."""
+    words = [word for word in WORD.findall(text.lower()) if word not in STOPWORDS and len(word) > 1]
+    counts = {}
+    for word in words:
+        counts[word] = counts.get(word, 0) + 1
+    return sorted(counts, key=lambda word: -counts[word])[:limit]
+
+
+def _section(text: str, title: str) -> List[str]:
+    match = re.search(rf"{title}:\s*\n(.*?)(?:\n\s*\n|$)", text, re.S)
+    if not match:
+        return []
+    return [item.strip().lower() for item in re.split(r"[\n,]", match.group(1)) if item.strip()]
+
+
+def render_response(prompt: str) -> str:
+    """Deterministic stand-in for the model's answer to one of the application's prompts."""
+    kind = classify_prompt(prompt)
+    user_match = USER_SECTION.search(prompt)
+    user_text = user_match.group(1) if user_match else prompt
+    if kind == KIND_LISTING_KEYWORDS_BATCH:
+        items = re.findall(r"^\[(\d+)\] (.*)$", user_text, re.M)
+        return json.dumps({number: extract_keywords(text) for number, text in items})
+    if kind in (KIND_LISTING_KEYWORDS, KIND_RESUME_KEYWORDS):
+        return "\n".join(extract_keywords(user_text, limit=10 if kind == KIND_LISTING_KEYWORDS else 20))
+    resume_keywords = _section(user_text, "Resume Keywords")
+    job_keywords = _section(user_text, "Job Requirements")
+    missing = [keyword for keyword in job_keywords if keyword not in resume_keywords]
+    if kind == KIND_MISSING_KEYWORDS:
+        return "\n".join(missing)
+    if kind == KIND_SUMMARY:
+        matching = [keyword for keyword in job_keywords if keyword in resume_keywords]
+        return (
+            f"The candidate's background aligns with the role through {', '.join(matching) or 'general experience'}. "
+            f"The requirements for {', '.join(missing) or 'no further skills'} are absent or underrepresented in the resume."
+        )
+    return "OK"
+
+
+def create_app(config: FakeOllamaConfig = None) -> FastAPI:
+    """
+    Builds an app speaking the subset of the Ollama HTTP API the backend uses. At most
+    config.parallel requests generate at once and up to config.max_queue wait, as with
+    OLLAMA_NUM_PARALLEL and OLLAMA_MAX_QUEUE; generation takes first_token_ms plus token_ms
+    per output token, and a request fails with probability failure_rate.
+    """
+    config = config or FakeOllamaConfig()
+    app = FastAPI(title="Fake Ollama")
+    stats = FakeOllamaStats()
+    rng = random.Random(config.seed)
+    semaphore = asyncio.Semaphore(max(1, config.parallel))
+
+    def error(status_code: int, message: str) -> JSONResponse:
+        return JSONResponse({"error": message}, status_code=status_code)
+
+    @app.get("/")
+    async def root() -> PlainTextResponse:
+        return PlainTextResponse("Ollama is running")
+
+    @app.get("/api/version")
+    async def version() -> dict:
+        return {"version": "0.0.0-fake"}
+
+    @app.get("/api/tags")
+    async def tags() -> dict:
+        return {"models": []}
+
+    @app.get("/stats")
+    async def get_stats() -> dict:
+        return stats.model_dump()
+
+    @app.post("/api/chat")
+    async def chat(request: Request):
+        body = await request.json()
+        model = body.get("model", "")
+        messages = body.get("messages") or []
+        prompt = "\n".join(message.get("content", "") for message in messages if message.get("role") == "user")
+        kind = classify_prompt(prompt)
+        stats.requests += 1
+        stats.by_kind[kind] = stats.by_kind.get(kind, 0) + 1
+
+        if stats.waiting >= config.max_queue:
+            stats.rejected += 1
+            return error(503, "server busy, please try again. maximum pending requests exceeded")
+        if rng.random() < config.failure_rate:
+            stats.failures += 1
+            return error(500, "injected failure")
+
+        max_tokens = (body.get("options") or {}).get("num_predict") or 0
+        tokens = re.findall(r"\s*\S+", render_response(prompt))
+        if max_tokens > 0:
+            tokens = tokens[:max_tokens]
+        started = time.monotonic()
+
+        stats.waiting += 1
+        stats.peak_waiting = max(stats.peak_waiting, stats.waiting)
+        await semaphore.acquire()
+        stats.waiting -= 1
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+
+        def final_chunk(content: str) -> dict:
+            return {
+                "model": model,
+                "created_at": datetime.now(timezone.utc).isoformat(),
+                "message": {"role": "assistant", "content": content},
+                "done": True,
+                "done_reason": "stop",
+                "total_duration": int((time.monotonic() - started) * 1e9),
+                "prompt_eval_count": len(prompt.split()),
+                "eval_count": len(tokens),
+            }
+
+        def release() -> None:
+            stats.in_flight -= 1
+            semaphore.release()
+
+        if not body.get("stream", True):
+            try:
+                await asyncio.sleep((config.first_token_ms + config.token_ms * len(tokens)) / 1000.0)
+                return final_chunk("".join(tokens))
+            finally:
+                release()
+
+        async def stream():
+            try:
+                await asyncio.sleep(config.first_token_ms / 1000.0)
+                for token in tokens:
+                    await asyncio.sleep(config.token_ms / 1000.0)
+                    chunk = {
+                        "model": model,
+                        "created_at": datetime.now(timezone.utc).isoformat(),
+                        "message": {"role": "assistant", "content": token},
+                        "done": False,
+                    }
+                    yield json.dumps(chunk) + "\n"
+                yield json.dumps(final_chunk("")) + "\n"
+            finally:
+                release()
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    return app
+
+
+def main(argv=None) -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Serve a fake Ollama API for LLM benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--first-token-ms", type=float, default=50.0, help="latency before the first token")
+    parser.add_argument("--token-ms", type=float, default=10.0, help="latency per generated token")
+    parser.add_argument("--parallel", type=int, default=4, help="requests generated at once")
+    parser.add_argument("--max-queue", type=int, default=512, help="waiting requests before answering 503")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="probability of answering 500")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    config = FakeOllamaConfig(
+        first_token_ms=args.first_token_ms,
+        token_ms=args.token_ms,
+        parallel=args.parallel,
+        max_queue=args.max_queue,
+        failure_rate=args.failure_rate,
+        seed=args.seed
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import json
+from pathlib import Path
+
+from src.scraping.scrapers.synthetic_scraper import SyntheticListingGenerator
+
+
+def write_recordings(
+    directory: Path,
+    count: int,
+    page_size: int,
+    generator: SyntheticListingGenerator
+) -> int:
+    """Writes count generated postings as Jooble responses of page_size jobs each, for ReplayScraper."""
+    directory.mkdir(parents=True, exist_ok=True)
+    pages = 0
+    for start in range(0, count, page_size):
+        jobs = list(generator.jobs(start, min(page_size, count - start)))
+        path = directory / f"page_{pages:07d}.json"
+        path.write_text(json.dumps({"totalCount": count, "jobs": jobs}), encoding="utf-8")
+        pages += 1
+    return pages
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic Jooble responses for the replay scraper.")
+    parser.add_argument("--count", type=int, default=10_000, help="number of listings to generate")
+    parser.add_argument("--page-size", type=int, default=50, help="listings per recorded response")
+    parser.add_argument("--out", default="benchmarks/recordings", help="directory to write responses to")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--vocabulary-size", type=int, default=500, help="number of distinct skills")
+    parser.add_argument("--zipf-exponent", type=float, default=1.1, help="skew of skill and company frequencies")
+    args = parser.parse_args(argv)
+    if args.count < 1 or args.page_size < 1:
+        parser.error("--count and --page-size must be positive")
+
+    generator = SyntheticListingGenerator(
+        seed=args.seed,
+        vocabulary_size=args.vocabulary_size,
+        zipf_exponent=args.zipf_exponent
+    )
+    pages = write_recordings(Path(args.out), args.count, args.page_size, generator)
+    print(f"Wrote {args.count} listings in {pages} responses to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+
+from src.prompts.llama3.listing_keywords import PROMPT as PROMPT_LISTING_KEYWORDS
+from src.prompts.llama3.matching_summary import PROMPT as SUMMARY_MATCHING_PROMPT
+from src.scraping.scrapers.synthetic_scraper import SyntheticListingGenerator
+from src.utils.processing_utils import ollama_api_call_async
+
+from config import settings
+
+KINDS = ("listing", "summary")
+
+
+def build_prompts(kind: str, count: int, seed: int) -> List[str]:
+    generator = SyntheticListingGenerator(seed=seed)
+    jobs = list(generator.jobs(0, count))
+    if kind == "listing":
+        return [PROMPT_LISTING_KEYWORDS.format(job["snippet"]) for job in jobs]
+    return [
+        SUMMARY_MATCHING_PROMPT.format("python\ndjango\nsql", "\n".join(job["snippet"].split(", ")[:8]))
+        for job in jobs
+    ]
+
+
+async def run(prompts: List[str], concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    failures = 0
+
+    async def call(prompt: str) -> None:
+        nonlocal failures
+        async with semaphore:
+            started = time.monotonic()
+            try:
+                await ollama_api_call_async(prompt)
+                latencies.append(time.monotonic() - started)
+            except Exception:
+                failures += 1
+
+    started = time.monotonic()
+    await asyncio.gather(*(call(prompt) for prompt in prompts))
+    elapsed = time.monotonic() - started
+    latencies.sort()
+    return {
+        "requests": len(prompts),
+        "failures": failures,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(statistics.median(latencies) * 1000, 1) if latencies else None,
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1] * 1000, 1) if latencies else None,
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure LLM call throughput against OLLAMA_HOST, e.g. benchmarks/fake_ollama.py."
+    )
+    parser.add_argument("--kind", choices=KINDS, default="listing", help="prompt to send")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16, help="callers issuing requests at once")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    result = asyncio.run(run(build_prompts(args.kind, args.requests, args.seed), max(1, args.concurrency)))
+    print(f"OLLAMA_HOST={settings.OLLAMA_HOST} OLLAMA_MAX_IN_FLIGHT={settings.OLLAMA_MAX_IN_FLIGHT} kind={args.kind}")
+    for key, value in result.items():
+        print(f"{key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
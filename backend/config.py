@@ -30,19 +30,116 @@ class Settings(BaseSettings):
     
     JOOBLE_API_KEY: str = Field(..., env='JOOBLE_API_KEY')
     JOOBLE_HOST: str = "https://jooble.org"
-    JOOBLE_MAX_RESULTS: int = Field(50, env='JOOBLE_MAX_RESULTS')
+    JOOBLE_MAX_RESULTS: int = Field(200, env='JOOBLE_MAX_RESULTS')
+    JOOBLE_PAGE_SIZE: int = Field(50, env='JOOBLE_PAGE_SIZE')
+    JOOBLE_PAGE_CONCURRENCY: int = Field(3, env='JOOBLE_PAGE_CONCURRENCY')
+    JOOBLE_USE_WATERMARKS: bool = Field(True, env='JOOBLE_USE_WATERMARKS')
+    JOOBLE_RECORD_DIR: str | None = Field(None, env='JOOBLE_RECORD_DIR')
+
+    # Listing source: "jooble", or "replay"/"synthetic" to benchmark without the live API
+    SCRAPER_SOURCE: str = Field("jooble", env='SCRAPER_SOURCE')
+    REPLAY_DIR: str = Field("benchmarks/recordings", env='REPLAY_DIR')
+    REPLAY_PAGES_PER_QUERY: int = Field(1, env='REPLAY_PAGES_PER_QUERY')
+    REPLAY_LATENCY_MS: float = Field(0.0, env='REPLAY_LATENCY_MS')
+    REPLAY_JITTER_MS: float = Field(0.0, env='REPLAY_JITTER_MS')
+    REPLAY_ERROR_RATE: float = Field(0.0, env='REPLAY_ERROR_RATE')
+    SYNTHETIC_LISTINGS_PER_QUERY: int = Field(500, env='SYNTHETIC_LISTINGS_PER_QUERY')
+    SYNTHETIC_TOTAL_LISTINGS: int = Field(100_000, env='SYNTHETIC_TOTAL_LISTINGS')
+    SYNTHETIC_VOCABULARY_SIZE: int = Field(500, env='SYNTHETIC_VOCABULARY_SIZE')
+    SYNTHETIC_SEED: int = Field(0, env='SYNTHETIC_SEED')
+    JOOBLE_REQUESTS_PER_SECOND: float = Field(2.0, env='JOOBLE_REQUESTS_PER_SECOND')
+    JOOBLE_BURST: int = Field(5, env='JOOBLE_BURST')
+
+    # Scraping queries run concurrently over one pooled HTTP client
+    SCRAPING_QUERY_CONCURRENCY: int = Field(8, env='SCRAPING_QUERY_CONCURRENCY')
+    HTTP_TIMEOUT: float = Field(30.0, env='HTTP_TIMEOUT')
+    HTTP_MAX_CONNECTIONS: int = Field(50, env='HTTP_MAX_CONNECTIONS')
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = Field(20, env='HTTP_MAX_KEEPALIVE_CONNECTIONS')
+
+    # Scraper requests are retried on 429/5xx and transport errors behind a per-host circuit breaker
+    HTTP_REQUEST_TIMEOUT: float = Field(15.0, env='HTTP_REQUEST_TIMEOUT')
+    HTTP_MAX_RETRIES: int = Field(3, env='HTTP_MAX_RETRIES')
+    HTTP_RETRY_BASE_DELAY: float = Field(0.5, env='HTTP_RETRY_BASE_DELAY')
+    HTTP_RETRY_MAX_DELAY: float = Field(30.0, env='HTTP_RETRY_MAX_DELAY')
+    HTTP_BREAKER_FAILURES: int = Field(5, env='HTTP_BREAKER_FAILURES')
+    HTTP_BREAKER_RESET_SECONDS: float = Field(120.0, env='HTTP_BREAKER_RESET_SECONDS')
+
+    # Scraped batches stream through pipeline stages connected by bounded channels
+    PIPELINE_CHANNEL_SIZE: int = Field(4, env='PIPELINE_CHANNEL_SIZE')
+    PIPELINE_DEDUP_CONCURRENCY: int = Field(2, env='PIPELINE_DEDUP_CONCURRENCY')
+    PIPELINE_KEYWORD_CONCURRENCY: int = Field(2, env='PIPELINE_KEYWORD_CONCURRENCY')
+    PIPELINE_EMBED_CONCURRENCY: int = Field(2, env='PIPELINE_EMBED_CONCURRENCY')
+    PIPELINE_PERSIST_CONCURRENCY: int = Field(1, env='PIPELINE_PERSIST_CONCURRENCY')
+    PIPELINE_MATCH_CONCURRENCY: int = Field(2, env='PIPELINE_MATCH_CONCURRENCY')
+
+    # Scraped listings are written in batches; company ids are cached by name
+    LISTING_INGEST_BATCH_SIZE: int = Field(500, env='LISTING_INGEST_BATCH_SIZE')
+    COMPANY_CACHE_ENTRIES: int = Field(10000, env='COMPANY_CACHE_ENTRIES')
 
     LOGGING_LEVEL: int = logging.DEBUG
     LOGGING_FORMAT: str = "%(name)s @ %(asctime)s [%(levelname)s]: %(message)s"
 
+    # Worker roles (resume, match, scrape, all) run inside the API process. Set to an empty
+    # string when the pipelines run in separate `python -m src.worker` processes.
+    API_WORKER_ROLES: str = Field("all", env='API_WORKER_ROLES')
+
+    # Load NLP models in the background after startup instead of on first use
+    MODEL_WARMUP_ENABLED: bool = Field(True, env='MODEL_WARMUP_ENABLED')
+
+    # Threads running CPU-bound model inference (keyword extraction, embedding)
+    INFERENCE_WORKERS: int = Field(2, env='INFERENCE_WORKERS')
+
+    # Embedding batching: concurrent requests are encoded together once the batch is full
+    # or the oldest request has waited EMBEDDING_BATCH_WAIT_MS
+    EMBEDDING_BATCH_SIZE: int = Field(64, env='EMBEDDING_BATCH_SIZE')
+    EMBEDDING_BATCH_WAIT_MS: float = Field(5.0, env='EMBEDDING_BATCH_WAIT_MS')
+
+    # Embedding cache: in-process LRU in front of the embedding_cache table
+    EMBEDDING_CACHE_MEMORY_ENTRIES: int = Field(20000, env='EMBEDDING_CACHE_MEMORY_ENTRIES')
+    EMBEDDING_CACHE_PERSISTENT: bool = Field(True, env='EMBEDDING_CACHE_PERSISTENT')
+    EMBEDDING_CACHE_MAX_ROWS: int = Field(500000, env='EMBEDDING_CACHE_MAX_ROWS')
+
+    # LLM response cache: in-process LRU in front of the llm_response_cache table
+    LLM_CACHE_ENABLED: bool = Field(True, env='LLM_CACHE_ENABLED')
+    LLM_CACHE_MEMORY_ENTRIES: int = Field(10000, env='LLM_CACHE_MEMORY_ENTRIES')
+    LLM_CACHE_PERSISTENT: bool = Field(True, env='LLM_CACHE_PERSISTENT')
+    LLM_CACHE_MAX_ROWS: int = Field(200000, env='LLM_CACHE_MAX_ROWS')
+    LLM_CACHE_TTL_SECONDS: float = Field(30 * 24 * 3600, env='LLM_CACHE_TTL_SECONDS')
+
+    # Durable job queue (jobs table) shared by resume processing and matching
+    JOB_LEASE_SECONDS: float = Field(300.0, env='JOB_LEASE_SECONDS')
+    JOB_MAX_ATTEMPTS: int = Field(5, env='JOB_MAX_ATTEMPTS')
+    JOB_POLL_INTERVAL: float = Field(1.0, env='JOB_POLL_INTERVAL')
+    RESUME_WORKERS: int = Field(1, env='RESUME_WORKERS')
+
     MATCHING_COSINE_THRESHOLD: float = Field(0.3, env='MATCHING_COSINE_THRESHOLD')
+    # Matching queue: job workers per process and the number of pairs allowed in the cosine
+    # and LLM stages at once
+    MATCHING_WORKERS: int = Field(8, env='MATCHING_WORKERS')
+    # Matches stored while a batch is being written go out together in the next one, up to
+    # MATCH_WRITER_BATCH_SIZE; each match worker waits for its own match, so a batch holds at
+    # most MATCHING_WORKERS matches
+    MATCH_WRITER_BATCH_SIZE: int = Field(64, env='MATCH_WRITER_BATCH_SIZE')
+    MATCHING_LLM_CONCURRENCY: int = Field(2, env='MATCHING_LLM_CONCURRENCY')
+    # Nearest-neighbour candidates fetched per resume/listing before the matching queue
+    MATCHING_CANDIDATES_TOP_K: int = Field(100, env='MATCHING_CANDIDATES_TOP_K')
+    MATCHING_HNSW_EF_SEARCH: int = Field(100, env='MATCHING_HNSW_EF_SEARCH')
+    # In-memory listing index used for exact top-K search on resume upload
+    LISTING_INDEX_ENABLED: bool = Field(True, env='LISTING_INDEX_ENABLED')
+    LISTING_INDEX_COMPACT_RATIO: float = Field(0.2, env='LISTING_INDEX_COMPACT_RATIO')
+    LISTING_INDEX_COMPACT_INTERVAL_SECONDS: int = Field(1800, env='LISTING_INDEX_COMPACT_INTERVAL_SECONDS')
     
     # Ollama optimization settings
     OLLAMA_ENABLED: bool = Field(True, env='OLLAMA_ENABLED')
+    OLLAMA_HOST: str = Field("http://localhost:11434", env='OLLAMA_HOST')
     OLLAMA_TIMEOUT: float = Field(30.0, env='OLLAMA_TIMEOUT')
-    OLLAMA_MAX_WORKERS: int = Field(2, env='OLLAMA_MAX_WORKERS')
+    OLLAMA_MAX_IN_FLIGHT: int = Field(8, env='OLLAMA_MAX_IN_FLIGHT')
     OLLAMA_MODEL: str = Field("llama3", env='OLLAMA_MODEL')
     OLLAMA_CONTEXT_SIZE: int = Field(2048, env='OLLAMA_CONTEXT_SIZE')
     OLLAMA_MAX_TOKENS: int = Field(256, env='OLLAMA_MAX_TOKENS')
+
+    # Listing keywords from the LLM instead of KeyBERT, several listings per prompt
+    LISTING_LLM_KEYWORDS: bool = Field(False, env='LISTING_LLM_KEYWORDS')
+    LISTING_LLM_BATCH_MAX_ITEMS: int = Field(16, env='LISTING_LLM_BATCH_MAX_ITEMS')
     
 settings = Settings()
\ No newline at end of file
@@ -5,6 +5,11 @@ from src.db.schemas.resume import Resume
 from src.db.schemas.company import Company
 from src.db.schemas.user import User
 from src.db.schemas.listing import Listing
+from src.db.schemas.embedding_cache import EmbeddingCacheEntry
+from src.db.schemas.match_evaluation import MatchEvaluation
+from src.db.schemas.job import Job
+from src.db.schemas.scrape_watermark import ScrapeWatermark
+from src.db.schemas.llm_response_cache import LLMResponseCacheEntry
 
 from logging.config import fileConfig
 
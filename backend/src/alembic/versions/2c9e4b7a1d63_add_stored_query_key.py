@@ -0,0 +1,57 @@
+"""Add stored query key
+
+Revision ID: 2c9e4b7a1d63
+Revises: f1a7c3e95b42
+Create Date: 2026-10-18 21:03:51.462019
+
+"""
+import hashlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c9e4b7a1d63'
+down_revision: Union[str, None] = 'f1a7c3e95b42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _query_key(keywords, location, radius, salary) -> str:
+    # Same as stored_query_key in aggregating_query_manager
+    parts = (
+        ",".join(sorted(keywords.split(","))) if keywords else "",
+        location or "",
+        radius or "",
+        "" if salary is None else str(salary)
+    )
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('stored_queries', sa.Column('query_key', sa.String(length=64), nullable=True))
+    connection = op.get_bind()
+    rows = connection.execute(
+        sa.text("SELECT id, keywords, location, radius, salary FROM stored_queries ORDER BY id")
+    ).all()
+    seen = set()
+    for row in rows:
+        key = _query_key(row.keywords, row.location, row.radius, row.salary)
+        if key in seen:
+            connection.execute(sa.text("DELETE FROM stored_queries WHERE id = :id"), {"id": row.id})
+            continue
+        seen.add(key)
+        connection.execute(
+            sa.text("UPDATE stored_queries SET query_key = :key WHERE id = :id"), {"key": key, "id": row.id}
+        )
+    op.alter_column('stored_queries', 'query_key', nullable=False)
+    op.create_unique_constraint('uq_stored_queries_query_key', 'stored_queries', ['query_key'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_stored_queries_query_key', 'stored_queries', type_='unique')
+    op.drop_column('stored_queries', 'query_key')
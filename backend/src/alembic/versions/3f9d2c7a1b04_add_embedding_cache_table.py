@@ -0,0 +1,37 @@
+"""Add embedding cache table
+
+Revision ID: 3f9d2c7a1b04
+Revises: c12529f517cb
+Create Date: 2026-10-18 10:12:41.208311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9d2c7a1b04'
+down_revision: Union[str, None] = 'c12529f517cb'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('embedding_cache',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('model_name', sa.String(), nullable=False),
+    sa.Column('embedding', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_embedding_cache_last_used_at'), 'embedding_cache', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_embedding_cache_last_used_at'), table_name='embedding_cache')
+    op.drop_table('embedding_cache')
@@ -0,0 +1,48 @@
+"""Add match evaluations and resume embedding watermark
+
+Revision ID: 5e7b93a0c4d8
+Revises: d2a6f8c39e15
+Create Date: 2026-10-18 12:35:17.940662
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e7b93a0c4d8'
+down_revision: Union[str, None] = 'd2a6f8c39e15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('match_evaluations',
+    sa.Column('resume_id', sa.Integer(), nullable=False),
+    sa.Column('listing_id', sa.Integer(), nullable=False),
+    sa.Column('cosine_similarity', sa.Float(), nullable=False),
+    sa.Column('evaluated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['listing_id'], ['listings.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['resume_id'], ['resumes.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('resume_id', 'listing_id')
+    )
+    op.create_index(op.f('ix_match_evaluations_listing_id'), 'match_evaluations', ['listing_id'], unique=False)
+    op.add_column('resumes', sa.Column('embedding_updated_at', sa.DateTime(timezone=True), nullable=True))
+    op.execute('UPDATE resumes SET embedding_updated_at = uploaded_at WHERE embedding IS NOT NULL')
+    # Pairs matched before this migration count as evaluated.
+    op.execute("""
+        INSERT INTO match_evaluations (resume_id, listing_id, cosine_similarity, evaluated_at)
+        SELECT resume_id, listing_id, max(cosine_similarity), max(matched_at)
+        FROM matches
+        GROUP BY resume_id, listing_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('resumes', 'embedding_updated_at')
+    op.drop_index(op.f('ix_match_evaluations_listing_id'), table_name='match_evaluations')
+    op.drop_table('match_evaluations')
@@ -0,0 +1,34 @@
+"""Add scrape watermarks table
+
+Revision ID: 6d3b8f1e2a95
+Revises: e4c8a1f7b260
+Create Date: 2026-10-18 17:12:26.845013
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d3b8f1e2a95'
+down_revision: Union[str, None] = 'e4c8a1f7b260'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('scrape_watermarks',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('source', sa.String(), nullable=False),
+    sa.Column('watermark', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('key')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('scrape_watermarks')
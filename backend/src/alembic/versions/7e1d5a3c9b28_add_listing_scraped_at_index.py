@@ -0,0 +1,29 @@
+"""Add listing scraped_at index
+
+Revision ID: 7e1d5a3c9b28
+Revises: 2c9e4b7a1d63
+Create Date: 2026-10-18 21:47:09.318264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e1d5a3c9b28'
+down_revision: Union[str, None] = '2c9e4b7a1d63'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The listing index syncs listings inserted or re-embedded since its last scraped_at
+    op.create_index(op.f('ix_listings_scraped_at'), 'listings', ['scraped_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_listings_scraped_at'), table_name='listings')
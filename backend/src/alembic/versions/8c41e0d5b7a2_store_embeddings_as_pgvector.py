@@ -0,0 +1,53 @@
+"""Store embeddings as pgvector columns
+
+Revision ID: 8c41e0d5b7a2
+Revises: 3f9d2c7a1b04
+Create Date: 2026-10-18 11:03:52.517904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from pgvector.sqlalchemy import Vector
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c41e0d5b7a2'
+down_revision: Union[str, None] = '3f9d2c7a1b04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+EMBEDDING_DIMENSIONS = 384
+TABLES = ('listings', 'resumes')
+
+
+def upgrade() -> None:
+    """Upgrade schema - convert comma-joined embedding strings to vector(384)."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS vector')
+    for table in TABLES:
+        op.add_column(table, sa.Column('embedding_vec', Vector(EMBEDDING_DIMENSIONS), nullable=True))
+        # Rows whose text does not hold exactly 384 values cannot be cast and are left NULL;
+        # they are re-embedded the next time the listing or resume is processed.
+        op.execute(f"""
+            UPDATE {table}
+            SET embedding_vec = ('[' || embedding || ']')::vector({EMBEDDING_DIMENSIONS})
+            WHERE embedding IS NOT NULL
+              AND embedding <> ''
+              AND array_length(string_to_array(embedding, ','), 1) = {EMBEDDING_DIMENSIONS}
+        """)
+        op.drop_column(table, 'embedding')
+        op.alter_column(table, 'embedding_vec', new_column_name='embedding')
+
+
+def downgrade() -> None:
+    """Downgrade schema - convert vector(384) embeddings back to comma-joined strings."""
+    for table in TABLES:
+        op.add_column(table, sa.Column('embedding_text', sa.String(), nullable=True))
+        op.execute(f"""
+            UPDATE {table}
+            SET embedding_text = trim(both '[]' from embedding::text)
+            WHERE embedding IS NOT NULL
+        """)
+        op.drop_column(table, 'embedding')
+        op.alter_column(table, 'embedding_text', new_column_name='embedding')
@@ -0,0 +1,36 @@
+"""Add unique match pair constraint
+
+Revision ID: b7e2c5d9a813
+Revises: 9a1f4e6c2d37
+Create Date: 2026-10-18 15:21:09.552184
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c5d9a813'
+down_revision: Union[str, None] = '9a1f4e6c2d37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Keep the most recent row of each duplicated (resume_id, listing_id) pair
+    op.execute("""
+        DELETE FROM matches older
+        USING matches newer
+        WHERE older.resume_id = newer.resume_id
+          AND older.listing_id = newer.listing_id
+          AND older.id < newer.id
+    """)
+    op.create_unique_constraint('uq_matches_resume_id_listing_id', 'matches', ['resume_id', 'listing_id'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('uq_matches_resume_id_listing_id', 'matches', type_='unique')
@@ -0,0 +1,40 @@
+"""Add HNSW embedding indexes
+
+Revision ID: d2a6f8c39e15
+Revises: 8c41e0d5b7a2
+Create Date: 2026-10-18 11:47:09.331820
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a6f8c39e15'
+down_revision: Union[str, None] = '8c41e0d5b7a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - add approximate nearest-neighbour indexes for cosine distance."""
+    op.create_index(
+        'ix_listings_embedding_hnsw', 'listings', ['embedding'],
+        postgresql_using='hnsw',
+        postgresql_with={'m': 16, 'ef_construction': 64},
+        postgresql_ops={'embedding': 'vector_cosine_ops'}
+    )
+    op.create_index(
+        'ix_resumes_embedding_hnsw', 'resumes', ['embedding'],
+        postgresql_using='hnsw',
+        postgresql_with={'m': 16, 'ef_construction': 64},
+        postgresql_ops={'embedding': 'vector_cosine_ops'}
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_resumes_embedding_hnsw', table_name='resumes')
+    op.drop_index('ix_listings_embedding_hnsw', table_name='listings')
@@ -0,0 +1,29 @@
+"""Add listing content hash
+
+Revision ID: e4c8a1f7b260
+Revises: b7e2c5d9a813
+Create Date: 2026-10-18 16:04:42.107395
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4c8a1f7b260'
+down_revision: Union[str, None] = 'b7e2c5d9a813'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing rows keep a NULL hash and are processed once more on their next scrape
+    op.add_column('listings', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('listings', 'content_hash')
@@ -0,0 +1,43 @@
+"""Add LLM response cache table
+
+Revision ID: f1a7c3e95b42
+Revises: 6d3b8f1e2a95
+Create Date: 2026-10-18 19:41:08.275139
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a7c3e95b42'
+down_revision: Union[str, None] = '6d3b8f1e2a95'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('llm_response_cache',
+    sa.Column('key', sa.String(length=64), nullable=False),
+    sa.Column('model_name', sa.String(), nullable=False),
+    sa.Column('template_version', sa.String(), nullable=False),
+    sa.Column('temperature', sa.Float(), nullable=False),
+    sa.Column('prompt_hash', sa.String(length=64), nullable=False),
+    sa.Column('response', sa.Text(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.Column('last_used_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_llm_response_cache_expires_at'), 'llm_response_cache', ['expires_at'], unique=False)
+    op.create_index(op.f('ix_llm_response_cache_last_used_at'), 'llm_response_cache', ['last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_llm_response_cache_last_used_at'), table_name='llm_response_cache')
+    op.drop_index(op.f('ix_llm_response_cache_expires_at'), table_name='llm_response_cache')
+    op.drop_table('llm_response_cache')
@@ -5,3 +5,5 @@ DEFAULT_LISTING_KW_NUM_CANDIDATES = 20
 DEFAULT_RESUME_KW_TOP_N = 15
 DEFAULT_LISTING_KW_TOP_N = 8
 
+# Output dimension of the all-MiniLM-L6-v2 sentence embedding model
+EMBEDDING_DIMENSIONS = 384
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, String, LargeBinary, DateTime, func
+
+from src.db.base import Base
+
+class EmbeddingCacheEntry(Base):
+    __tablename__ = 'embedding_cache'
+
+    key = Column(String(64), primary_key=True)
+    model_name = Column(String, nullable=False)
+    embedding = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
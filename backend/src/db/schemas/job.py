@@ -0,0 +1,29 @@
+from sqlalchemy import Column, BigInteger, Integer, String, DateTime, Index, func, text
+from sqlalchemy.dialects.postgresql import JSONB
+
+from src.db.base import Base
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_DEAD = "dead"
+
+class Job(Base):
+    __tablename__ = 'jobs'
+
+    id = Column(BigInteger, primary_key=True, autoincrement=True)
+    queue = Column(String, nullable=False)
+    payload = Column(JSONB, nullable=False)
+    status = Column(String, nullable=False, server_default=JOB_PENDING)
+    priority = Column(Integer, nullable=False, server_default=text('0'))
+    attempts = Column(Integer, nullable=False, server_default=text('0'))
+    max_attempts = Column(Integer, nullable=False)
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    locked_by = Column(String, nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+
+    __table_args__ = (
+        Index('ix_jobs_claim', 'queue', 'status', priority.desc(), 'available_at'),
+        Index('ix_jobs_lease', 'queue', 'locked_until', postgresql_where=text("status = 'running'")),
+    )
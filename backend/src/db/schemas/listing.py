@@ -3,6 +3,7 @@ from sqlalchemy.orm import relationship
 from pgvector.sqlalchemy import Vector
 
 from src.db.base import Base
+from src.constants.processing_constants import EMBEDDING_DIMENSIONS
 
 class Listing(Base):
     __tablename__ = "listings"
@@ -21,8 +22,9 @@ class Listing(Base):
     location = Column(String)
     link = Column(String, unique=True, nullable=False)
     keywords = Column(String)
-    embedding = Column(String)
-    scraped_at = Column(DateTime(timezone=True), server_default=func.now())
+    content_hash = Column(String(64))
+    embedding = Column(Vector(EMBEDDING_DIMENSIONS))
+    scraped_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
 
     company = relationship("Company", back_populates="listings")
     matches = relationship("Match", back_populates="listing")
\ No newline at end of file
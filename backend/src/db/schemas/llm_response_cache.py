@@ -0,0 +1,16 @@
+from sqlalchemy import Column, String, Float, Text, DateTime, func
+
+from src.db.base import Base
+
+class LLMResponseCacheEntry(Base):
+    __tablename__ = 'llm_response_cache'
+
+    key = Column(String(64), primary_key=True)
+    model_name = Column(String, nullable=False)
+    template_version = Column(String, nullable=False)
+    temperature = Column(Float, nullable=False)
+    prompt_hash = Column(String(64), nullable=False)
+    response = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), index=True)
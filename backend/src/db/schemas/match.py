@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, Float, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, String, Float, DateTime, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from src.db.base import Base
@@ -15,4 +15,8 @@ class Match(Base):
     matched_at = Column(DateTime, nullable=False)
 
     listing = relationship("Listing", back_populates="matches")
-    resume = relationship("Resume", back_populates="matches")
\ No newline at end of file
+    resume = relationship("Resume", back_populates="matches")
+
+    __table_args__ = (
+        UniqueConstraint('resume_id', 'listing_id', name='uq_matches_resume_id_listing_id'),
+    )
\ No newline at end of file
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, ForeignKey, Float, DateTime, func
+
+from src.db.base import Base
+
+class MatchEvaluation(Base):
+    __tablename__ = 'match_evaluations'
+
+    resume_id = Column(Integer, ForeignKey('resumes.id', ondelete='CASCADE'), primary_key=True)
+    listing_id = Column(Integer, ForeignKey('listings.id', ondelete='CASCADE'), primary_key=True, index=True)
+    cosine_similarity = Column(Float, nullable=False)
+    evaluated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
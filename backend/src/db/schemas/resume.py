@@ -1,7 +1,9 @@
 from sqlalchemy import Column, Integer, String, ForeignKey, func, DateTime
 from sqlalchemy.orm import relationship
+from pgvector.sqlalchemy import Vector
 
 from src.db.base import Base
+from src.constants.processing_constants import EMBEDDING_DIMENSIONS
 
 class Resume(Base):
     __tablename__ = 'resumes'
@@ -12,7 +14,8 @@ class Resume(Base):
     file_path = Column(String, nullable=False)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now())
     keywords = Column(String, nullable=True)
-    embedding = Column(String, nullable=True)
+    embedding = Column(Vector(EMBEDDING_DIMENSIONS), nullable=True)
+    embedding_updated_at = Column(DateTime(timezone=True), nullable=True)
     last_evaluated_at = Column(DateTime(timezone=True), nullable=True)
     location = Column(String, nullable=True)
     radius = Column(Integer, nullable=True)
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, DateTime, func
+
+from src.db.base import Base
+
+class ScrapeWatermark(Base):
+    __tablename__ = 'scrape_watermarks'
+
+    key = Column(String(64), primary_key=True)
+    source = Column(String, nullable=False)
+    watermark = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
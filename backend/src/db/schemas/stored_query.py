@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Integer, String, Text, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from src.db.base import Base
@@ -7,7 +7,12 @@ class StoredQuery(Base):
     __tablename__ = 'stored_queries'
 
     id = Column(Integer, primary_key=True, autoincrement=True)
+    query_key = Column(String(64), nullable=False)
     keywords = Column(Text, nullable=False)
     location = Column(String, nullable=True)
     radius = Column(String, nullable=True)
-    salary = Column(Integer, nullable=True)
\ No newline at end of file
+    salary = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint('query_key', name='uq_stored_queries_query_key'),
+    )
@@ -0,0 +1,232 @@
+import asyncio
+import os
+import socket
+from datetime import timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from pydantic import BaseModel
+from sqlalchemy import select, update, delete, or_, and_, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.session import async_session_maker
+from src.db.schemas.job import Job, JOB_PENDING, JOB_RUNNING, JOB_DEAD
+from src.utils.logger import logger
+
+from config import settings
+
+PRIORITY_BACKGROUND = 0
+PRIORITY_INTERACTIVE = 10
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+MAX_RETRY_DELAY_SECONDS = 300
+
+
+class ClaimedJob(BaseModel):
+    id: int
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+class JobQueue:
+    """
+    Durable queue of JSON payloads stored in the jobs table and shared by every process that
+    runs a JobQueue with the same name.
+
+    Workers claim the highest priority available job with SELECT ... FOR UPDATE SKIP LOCKED
+    and hold a lease on it that is renewed while the handler runs. A job whose lease expires,
+    because its process died, becomes claimable again. Failed jobs are retried with exponential
+    backoff and moved to the dead status after max_attempts. Completed jobs are deleted.
+    """
+    _name: str
+    _handler: Callable[[Dict[str, Any]], Awaitable[None]]
+    _workers: int
+    _lease: timedelta
+    _max_attempts: int
+    _poll_interval: float
+
+    _worker_tasks: List[asyncio.Task]
+    _stop_event: asyncio.Event
+    _wakeup: asyncio.Event
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Dict[str, Any]], Awaitable[None]],
+        workers: int = 1,
+        lease_seconds: float = None,
+        max_attempts: int = None,
+        poll_interval: float = None
+    ):
+        self._name = name
+        self._handler = handler
+        self._workers = max(1, workers)
+        self._lease = timedelta(seconds=lease_seconds or settings.JOB_LEASE_SECONDS)
+        self._max_attempts = max_attempts or settings.JOB_MAX_ATTEMPTS
+        self._poll_interval = settings.JOB_POLL_INTERVAL if poll_interval is None else poll_interval
+        self._worker_tasks = []
+        self._stop_event = asyncio.Event()
+        self._wakeup = asyncio.Event()
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    async def start(self) -> None:
+        self._stop_event.clear()
+        self._worker_tasks = [asyncio.create_task(self._run_worker()) for _ in range(self._workers)]
+        logger.info(f"Job queue {self._name} started with {self._workers} workers")
+
+    async def stop(self) -> None:
+        self._stop_event.set()
+        self._wakeup.set()
+        if self._worker_tasks:
+            await asyncio.gather(*self._worker_tasks)
+            self._worker_tasks = []
+
+    async def enqueue(self, payload: Dict[str, Any], priority: int = PRIORITY_BACKGROUND) -> None:
+        await self.enqueue_many([payload], priority)
+
+    async def enqueue_many(
+        self,
+        payloads: Sequence[Dict[str, Any]],
+        priority: int = PRIORITY_BACKGROUND,
+        db_session: AsyncSession = None
+    ) -> None:
+        """
+        Inserts one job per payload. When a session is passed the jobs are added to its
+        transaction and the caller commits, so they are queued atomically with its own writes.
+        """
+        if not payloads:
+            return
+        statement = insert(Job).values([
+            {"queue": self._name, "payload": payload, "priority": priority, "max_attempts": self._max_attempts}
+            for payload in payloads
+        ])
+        if db_session is not None:
+            await db_session.execute(statement)
+        else:
+            async with async_session_maker() as own_session:
+                await own_session.execute(statement)
+                await own_session.commit()
+        self._wakeup.set()
+
+    async def requeue_dead(self) -> int:
+        """Moves dead-lettered jobs back to pending with a fresh attempt count."""
+        async with async_session_maker() as db_session:
+            result = await db_session.execute(
+                update(Job)
+                .where(Job.queue == self._name, Job.status == JOB_DEAD)
+                .values(status=JOB_PENDING, attempts=0, available_at=func.now(), last_error=None)
+            )
+            await db_session.commit()
+        self._wakeup.set()
+        return result.rowcount
+
+    def _claim_statement(self):
+        now = func.now()
+        claimable = (
+            select(Job.id)
+            .where(
+                Job.queue == self._name,
+                or_(
+                    and_(Job.status == JOB_PENDING, Job.available_at <= now),
+                    and_(Job.status == JOB_RUNNING, Job.locked_until < now)
+                )
+            )
+            .order_by(Job.priority.desc(), Job.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        return (
+            update(Job)
+            .where(Job.id == claimable.scalar_subquery())
+            .values(
+                status=JOB_RUNNING,
+                attempts=Job.attempts + 1,
+                locked_by=WORKER_ID,
+                locked_until=now + self._lease
+            )
+            .returning(Job.id, Job.payload, Job.attempts, Job.max_attempts)
+        )
+
+    async def _claim(self) -> Optional[ClaimedJob]:
+        async with async_session_maker() as db_session:
+            result = await db_session.execute(self._claim_statement())
+            row = result.first()
+            await db_session.commit()
+        if row is None:
+            return None
+        return ClaimedJob(id=row.id, payload=row.payload, attempts=row.attempts, max_attempts=row.max_attempts)
+
+    async def _complete(self, job: ClaimedJob) -> None:
+        async with async_session_maker() as db_session:
+            await db_session.execute(delete(Job).where(Job.id == job.id, Job.locked_by == WORKER_ID))
+            await db_session.commit()
+
+    async def _fail(self, job: ClaimedJob, error: str) -> None:
+        if job.attempts >= job.max_attempts:
+            values = {"status": JOB_DEAD, "locked_by": None, "locked_until": None, "last_error": error}
+            logger.error(f"Job {job.id} on {self._name} dead-lettered after {job.attempts} attempts: {error}")
+        else:
+            delay = timedelta(seconds=min(2 ** job.attempts, MAX_RETRY_DELAY_SECONDS))
+            values = {
+                "status": JOB_PENDING,
+                "locked_by": None,
+                "locked_until": None,
+                "available_at": func.now() + delay,
+                "last_error": error
+            }
+            logger.warning(f"Job {job.id} on {self._name} failed (attempt {job.attempts}), retrying in {delay.seconds}s: {error}")
+        async with async_session_maker() as db_session:
+            await db_session.execute(
+                update(Job).where(Job.id == job.id, Job.locked_by == WORKER_ID).values(**values)
+            )
+            await db_session.commit()
+
+    async def _renew_lease(self, job: ClaimedJob) -> None:
+        interval = self._lease.total_seconds() / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with async_session_maker() as db_session:
+                    await db_session.execute(
+                        update(Job)
+                        .where(Job.id == job.id, Job.locked_by == WORKER_ID)
+                        .values(locked_until=func.now() + self._lease)
+                    )
+                    await db_session.commit()
+            except Exception as e:
+                logger.warning(f"Failed to renew lease on job {job.id}: {str(e)}")
+
+    async def _execute(self, job: ClaimedJob) -> None:
+        if job.attempts > job.max_attempts:
+            await self._fail(job, "lease expired on final attempt")
+            return
+        renewal = asyncio.create_task(self._renew_lease(job))
+        try:
+            await self._handler(job.payload)
+        except Exception as e:
+            await self._fail(job, str(e))
+        else:
+            await self._complete(job)
+        finally:
+            renewal.cancel()
+
+    async def _run_worker(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                job = await self._claim()
+                if job is None:
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout=self._poll_interval)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                await self._execute(job)
+            except Exception as e:
+                logger.error(f"Error in job queue {self._name} worker: {str(e)}")
+                await asyncio.sleep(self._poll_interval)
@@ -0,0 +1,64 @@
+from typing import Any, List, Sequence, Tuple
+
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.schemas.company import Company as CompanySchema
+from src.db.schemas.listing import Listing as ListingSchema
+from src.db.schemas.resume import Resume as ResumeSchema
+
+from config import settings
+
+# Candidate retrieval asks pgvector for the nearest neighbours of an embedding through the
+# HNSW cosine indexes on listings.embedding and resumes.embedding. The threshold is applied
+# to the top-K result rather than in the WHERE clause so that Postgres keeps the index scan.
+
+
+async def _set_ef_search(db_session: AsyncSession, top_k: int) -> None:
+    ef_search = max(settings.MATCHING_HNSW_EF_SEARCH, top_k)
+    await db_session.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+
+
+async def find_listing_candidates(
+    db_session: AsyncSession,
+    embedding: Sequence[float],
+    top_k: int = None,
+    threshold: float = None,
+    filters: Sequence[Any] = ()
+) -> List[Tuple[ListingSchema, CompanySchema, float]]:
+    """Returns up to top_k (listing, company, similarity) rows with similarity >= threshold."""
+    top_k = top_k or settings.MATCHING_CANDIDATES_TOP_K
+    threshold = settings.MATCHING_COSINE_THRESHOLD if threshold is None else threshold
+    distance = ListingSchema.embedding.cosine_distance(list(embedding)).label("distance")
+    await _set_ef_search(db_session, top_k)
+    result = await db_session.execute(
+        select(ListingSchema, CompanySchema, distance)
+        .join(CompanySchema, ListingSchema.company_id == CompanySchema.id)
+        .filter(ListingSchema.embedding.isnot(None), *filters)
+        .order_by(distance)
+        .limit(top_k)
+    )
+    candidates = [(listing, company, 1.0 - float(dist)) for listing, company, dist in result.all()]
+    return [candidate for candidate in candidates if candidate[2] >= threshold]
+
+
+async def find_resume_candidates(
+    db_session: AsyncSession,
+    embedding: Sequence[float],
+    top_k: int = None,
+    threshold: float = None,
+    filters: Sequence[Any] = ()
+) -> List[Tuple[ResumeSchema, float]]:
+    """Returns up to top_k (resume, similarity) rows with similarity >= threshold."""
+    top_k = top_k or settings.MATCHING_CANDIDATES_TOP_K
+    threshold = settings.MATCHING_COSINE_THRESHOLD if threshold is None else threshold
+    distance = ResumeSchema.embedding.cosine_distance(list(embedding)).label("distance")
+    await _set_ef_search(db_session, top_k)
+    result = await db_session.execute(
+        select(ResumeSchema, distance)
+        .filter(ResumeSchema.embedding.isnot(None), *filters)
+        .order_by(distance)
+        .limit(top_k)
+    )
+    candidates = [(resume, 1.0 - float(dist)) for resume, dist in result.all()]
+    return [candidate for candidate in candidates if candidate[1] >= threshold]
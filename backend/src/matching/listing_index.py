@@ -0,0 +1,260 @@
+import asyncio
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from src.constants.processing_constants import EMBEDDING_DIMENSIONS
+from src.utils.logger import logger
+from src.utils.processing_utils import normalize_rows
+
+from config import settings
+
+# scraped_at comes from now() at transaction start, so a listing committed late can carry a
+# timestamp slightly older than one already synced; sync re-reads this window
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class ListingIndex:
+    """
+    In-process index of listing embeddings for exact top-K cosine search.
+
+    Embeddings are stored L2-normalized in one contiguous float32 matrix with a parallel id
+    array. Updating or removing a listing marks its old row in a tombstone bitmap instead of
+    moving memory; compact() rewrites the matrix without the tombstoned rows. The matrix
+    grows by doubling so appends are amortized O(1).
+
+    load() builds the new matrix aside and swaps it in; changes made while it reads the
+    database are journaled and replayed onto the new matrix, so none are lost. sync() picks up
+    listings inserted or re-embedded by other processes through their scraped_at timestamps.
+    """
+    _dimensions: int
+    _matrix: np.ndarray
+    _ids: np.ndarray
+    _tombstones: np.ndarray
+    _size: int
+    _rows: Dict[int, int]
+    _loaded: bool
+    _versions: Dict[int, datetime]
+    _synced_at: Optional[datetime]
+    _journal: Optional[List[Tuple[int, Optional[np.ndarray]]]]
+    _lock: threading.Lock
+
+    def __init__(self, dimensions: int = EMBEDDING_DIMENSIONS, initial_capacity: int = 1024):
+        self._dimensions = dimensions
+        self._matrix = np.zeros((initial_capacity, dimensions), dtype=np.float32)
+        self._ids = np.zeros(initial_capacity, dtype=np.int64)
+        self._tombstones = np.zeros(initial_capacity, dtype=bool)
+        self._size = 0
+        self._rows = {}
+        self._loaded = False
+        self._versions = {}
+        self._synced_at = None
+        self._journal = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def active(self) -> bool:
+        """True once loading has started; an index that is never loaded needs no updates."""
+        return self._loaded or self._journal is not None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @property
+    def tombstone_ratio(self) -> float:
+        return (self._size - len(self._rows)) / self._size if self._size else 0.0
+
+    def add(self, listing_id: int, embedding: Sequence[float]) -> None:
+        self.add_many([listing_id], [embedding])
+
+    def add_many(self, listing_ids: Sequence[int], embeddings: Iterable[Sequence[float]]) -> None:
+        vectors = np.asarray(list(embeddings), dtype=np.float32).reshape(-1, self._dimensions)
+        vectors = normalize_rows(vectors)
+        with self._lock:
+            self._append(listing_ids, vectors)
+            if self._journal is not None:
+                self._journal.extend(zip(listing_ids, vectors))
+
+    def remove(self, listing_id: int) -> None:
+        with self._lock:
+            row = self._rows.pop(listing_id, None)
+            if row is not None:
+                self._tombstones[row] = True
+            if self._journal is not None:
+                self._journal.append((listing_id, None))
+
+    def _append(self, listing_ids: Sequence[int], vectors: np.ndarray) -> None:
+        self._reserve(self._size + len(listing_ids))
+        for listing_id, vector in zip(listing_ids, vectors):
+            previous = self._rows.get(listing_id)
+            if previous is not None:
+                self._tombstones[previous] = True
+            row = self._size
+            self._matrix[row] = vector
+            self._ids[row] = listing_id
+            self._tombstones[row] = False
+            self._rows[listing_id] = row
+            self._size += 1
+
+    def search(
+        self,
+        embedding: Sequence[float],
+        top_k: int,
+        threshold: float = -1.0,
+        exclude: Optional[Set[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """Returns up to top_k (listing_id, similarity) pairs with similarity >= threshold, best first."""
+        query = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm == 0 or query.shape != (self._dimensions,):
+            return []
+        query = query / norm
+        with self._lock:
+            if self._size == 0:
+                return []
+            similarities = self._matrix[:self._size] @ query
+            similarities[self._tombstones[:self._size]] = -np.inf
+            if exclude:
+                excluded_rows = [self._rows[i] for i in exclude if i in self._rows]
+                similarities[excluded_rows] = -np.inf
+            ids = self._ids[:self._size].copy()
+        k = min(top_k, len(similarities))
+        candidates = np.argpartition(-similarities, k - 1)[:k]
+        candidates = candidates[np.argsort(-similarities[candidates], kind="stable")]
+        return [
+            (int(ids[row]), float(similarities[row]))
+            for row in candidates
+            if similarities[row] >= threshold
+        ]
+
+    def compact(self) -> None:
+        with self._lock:
+            live = np.nonzero(~self._tombstones[:self._size])[0]
+            capacity = max(1024, len(live) * 2)
+            matrix = np.zeros((capacity, self._dimensions), dtype=np.float32)
+            ids = np.zeros(capacity, dtype=np.int64)
+            matrix[:len(live)] = self._matrix[live]
+            ids[:len(live)] = self._ids[live]
+            removed = self._size - len(live)
+            self._matrix = matrix
+            self._ids = ids
+            self._tombstones = np.zeros(capacity, dtype=bool)
+            self._size = len(live)
+            self._rows = {int(listing_id): row for row, listing_id in enumerate(ids[:self._size])}
+        logger.info(f"Compacted listing index: {removed} tombstoned rows removed, {self._size} live")
+
+    def _reserve(self, required: int) -> None:
+        capacity = self._matrix.shape[0]
+        if required <= capacity:
+            return
+        while capacity < required:
+            capacity *= 2
+        self._matrix = np.resize(self._matrix, (capacity, self._dimensions))
+        self._ids = np.resize(self._ids, capacity)
+        tombstones = np.zeros(capacity, dtype=bool)
+        tombstones[:self._size] = self._tombstones[:self._size]
+        self._tombstones = tombstones
+
+    async def _fetch(self, since: Optional[datetime] = None) -> list:
+        from sqlalchemy import select
+        from src.db.session import async_session_maker
+        from src.db.schemas.listing import Listing as ListingSchema
+
+        statement = select(ListingSchema.id, ListingSchema.embedding, ListingSchema.scraped_at).filter(
+            ListingSchema.embedding.isnot(None)
+        )
+        if since is not None:
+            statement = statement.filter(ListingSchema.scraped_at >= since)
+        async with async_session_maker() as db_session:
+            result = await db_session.execute(statement)
+            return result.all()
+
+    def _record_versions(self, rows: list) -> None:
+        for row in rows:
+            if row.scraped_at is None:
+                continue
+            self._versions[row.id] = row.scraped_at
+            if self._synced_at is None or row.scraped_at > self._synced_at:
+                self._synced_at = row.scraped_at
+
+    async def sync(self) -> None:
+        """
+        Adds listings inserted or changed since the last sync, e.g. by a scrape worker running
+        in another process. Changed listings replace their old vectors.
+        """
+        since = self._synced_at - SYNC_OVERLAP if self._synced_at is not None else None
+        rows = await self._fetch(since)
+        rows = [row for row in rows if row.scraped_at is None or self._versions.get(row.id) != row.scraped_at]
+        if rows:
+            self.add_many([row.id for row in rows], [row.embedding for row in rows])
+            self._record_versions(rows)
+            logger.debug(f"Listing index synced {len(rows)} new or changed listings")
+
+    async def load(self) -> None:
+        """Loads every listing embedding from the database, replacing the index contents."""
+        with self._lock:
+            self._journal = []
+        try:
+            rows = await self._fetch()
+            fresh = ListingIndex(self._dimensions, initial_capacity=max(1024, len(rows)))
+            if rows:
+                fresh.add_many([row.id for row in rows], [row.embedding for row in rows])
+            with self._lock:
+                for listing_id, vector in self._journal:
+                    if vector is None:
+                        fresh.remove(listing_id)
+                    else:
+                        fresh._append([listing_id], vector.reshape(1, -1))
+                self._matrix = fresh._matrix
+                self._ids = fresh._ids
+                self._tombstones = fresh._tombstones
+                self._size = fresh._size
+                self._rows = fresh._rows
+                self._versions = {}
+                self._record_versions(rows)
+        finally:
+            with self._lock:
+                self._journal = None
+        self._loaded = True
+        logger.info(f"Listing index loaded with {len(rows)} listings")
+
+
+_listing_index = None
+_mutex = threading.Lock()
+
+def get_listing_index() -> ListingIndex:
+    global _listing_index
+    with _mutex:
+        if _listing_index is None:
+            _listing_index = ListingIndex()
+        return _listing_index
+
+
+async def load_listing_index() -> None:
+    try:
+        await get_listing_index().load()
+    except Exception as e:
+        logger.error(f"Failed to load listing index, falling back to database search: {str(e)}")
+
+
+def compact_listing_index() -> None:
+    index = get_listing_index()
+    if index.tombstone_ratio >= settings.LISTING_INDEX_COMPACT_RATIO:
+        index.compact()
+
+
+async def maintain_listing_index() -> None:
+    """Loads the index and then compacts it periodically in the process that serves it."""
+    await load_listing_index()
+    while True:
+        await asyncio.sleep(settings.LISTING_INDEX_COMPACT_INTERVAL_SECONDS)
+        try:
+            compact_listing_index()
+        except Exception as e:
+            logger.error(f"Failed to compact listing index: {str(e)}")
@@ -0,0 +1,80 @@
+from typing import Sequence, Set, Tuple
+
+from sqlalchemy import select, delete, exists, update, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.schemas.match_evaluation import MatchEvaluation
+from src.db.schemas.resume import Resume as ResumeSchema
+
+# Every (resume, listing) pair that reaches the scoring stage is recorded in match_evaluations
+# together with its cosine similarity, whether or not it clears the threshold, so it is never
+# scored again. Rows for a resume are dropped when its embedding changes. Resume.last_evaluated_at
+# is the resume's watermark: once it is at or after embedding_updated_at, the resume has been
+# swept against the listing corpus and only new listings need to be scored against it, which
+# the listing pipeline does as they arrive.
+
+
+def resume_needs_sweep(resume: ResumeSchema) -> bool:
+    if resume.last_evaluated_at is None:
+        return True
+    if resume.embedding_updated_at is None:
+        return False
+    return resume.last_evaluated_at < resume.embedding_updated_at
+
+
+def resume_not_evaluated_with(listing_id: int):
+    """Filter clause on resumes excluding those already evaluated against the listing."""
+    return ~exists().where(
+        MatchEvaluation.resume_id == ResumeSchema.id,
+        MatchEvaluation.listing_id == listing_id
+    )
+
+
+def listing_not_evaluated_with(resume_id: int):
+    """Filter clause on listings excluding those already evaluated against the resume."""
+    from src.db.schemas.listing import Listing as ListingSchema
+    return ~exists().where(
+        MatchEvaluation.resume_id == resume_id,
+        MatchEvaluation.listing_id == ListingSchema.id
+    )
+
+
+async def get_evaluated_listing_ids(db_session: AsyncSession, resume_id: int) -> Set[int]:
+    result = await db_session.execute(
+        select(MatchEvaluation.listing_id).filter(MatchEvaluation.resume_id == resume_id)
+    )
+    return set(result.scalars().all())
+
+
+async def record_evaluations(
+    db_session: AsyncSession,
+    evaluations: Sequence[Tuple[int, int, float]]
+) -> None:
+    """Upserts (resume_id, listing_id, similarity) rows. The caller commits."""
+    if not evaluations:
+        return
+    statement = insert(MatchEvaluation).values([
+        {"resume_id": resume_id, "listing_id": listing_id, "cosine_similarity": float(similarity)}
+        for resume_id, listing_id, similarity in evaluations
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=[MatchEvaluation.resume_id, MatchEvaluation.listing_id],
+        set_={
+            "cosine_similarity": statement.excluded.cosine_similarity,
+            "evaluated_at": func.now()
+        }
+    )
+    await db_session.execute(statement)
+
+
+async def invalidate_resume_evaluations(db_session: AsyncSession, resume_id: int) -> None:
+    await db_session.execute(delete(MatchEvaluation).where(MatchEvaluation.resume_id == resume_id))
+
+
+async def mark_resume_evaluated(db_session: AsyncSession, resume_id: int) -> None:
+    await db_session.execute(
+        update(ResumeSchema)
+        .where(ResumeSchema.id == resume_id)
+        .values(last_evaluated_at=func.now())
+    )
@@ -0,0 +1,162 @@
+import asyncio
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import IntegrityError
+
+from src.db.session import async_session_maker
+from src.db.schemas.match import Match as MatchSchema
+from src.db.schemas.resume import Resume as ResumeSchema
+from src.db.schemas.listing import Listing as ListingSchema
+from src.models.match import Match
+from src.utils.logger import logger
+
+from config import settings
+
+
+class MatchWriter:
+    """
+    Writes matches from concurrent match workers, one INSERT ... ON CONFLICT (resume_id,
+    listing_id) DO UPDATE per batch.
+
+    While no batch is being written, a match is flushed on the next event loop iteration
+    together with any match written in the same iteration. Matches that arrive while a batch
+    is being written wait for it and go out together as the next batch, or at once when
+    max_batch_size are pending. Each match worker waits for its own match, so a batch holds
+    at most one match per match worker in the process. write() returns when the match's
+    batch is committed and raises if it failed, so a match job is not completed before its
+    match is stored. Foreign keys reject matches whose resume or listing was deleted
+    meanwhile; only then is the batch filtered against the existing rows and retried.
+    """
+    _max_batch_size: int
+    _pending: List[Tuple[Dict[str, Any], asyncio.Future]]
+    _flush_handle: asyncio.Handle | None
+    _running: set
+
+    def __init__(self, max_batch_size: int = 64):
+        self._max_batch_size = max(1, max_batch_size)
+        self._pending = []
+        self._flush_handle = None
+        self._running = set()
+
+    async def write(self, match: Match) -> None:
+        row = self._to_row(match)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, future))
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif not self._running and self._flush_handle is None:
+            self._flush_handle = loop.call_soon(self._flush)
+        await future
+
+    async def close(self) -> None:
+        self._flush()
+        while self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    @staticmethod
+    def _to_row(match: Match) -> Dict[str, Any]:
+        if not match.resume_id or not match.listing_id:
+            raise ValueError("Invalid match data: missing resume_id or listing_id")
+        return {
+            "resume_id": int(match.resume_id),
+            "listing_id": int(match.listing_id),
+            "missing_keywords": ",".join(match.missing_keywords) if match.missing_keywords else "",
+            "cosine_similarity": match.cosine_similarity or 0.0,
+            "summary": match.summary or "",
+            "matched_at": datetime.utcnow()
+        }
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch = self._pending[:self._max_batch_size]
+            self._pending = self._pending[self._max_batch_size:]
+            task = asyncio.create_task(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._batch_done)
+
+    def _batch_done(self, task: asyncio.Task) -> None:
+        self._running.discard(task)
+        if self._pending and not self._running:
+            self._flush()
+
+    async def _run_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]) -> None:
+        # ON CONFLICT cannot touch the same row twice in one statement; keep the latest row
+        rows = list({(row["resume_id"], row["listing_id"]): row for row, _ in batch}.values())
+        try:
+            written = await self._upsert(rows)
+        except Exception as e:
+            logger.error(f"Failed to write batch of {len(rows)} matches: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        logger.info(f"Committed {written} of {len(rows)} matches to database")
+        for _, future in batch:
+            if not future.done():
+                future.set_result(None)
+
+    async def _upsert(self, rows: List[Dict[str, Any]]) -> int:
+        async with async_session_maker() as db_session:
+            try:
+                await db_session.execute(self._upsert_statement(rows))
+                await db_session.commit()
+                return len(rows)
+            except IntegrityError:
+                await db_session.rollback()
+            rows = await self._existing_only(db_session, rows)
+            if rows:
+                await db_session.execute(self._upsert_statement(rows))
+                await db_session.commit()
+            return len(rows)
+
+    @staticmethod
+    def _upsert_statement(rows: List[Dict[str, Any]]):
+        statement = insert(MatchSchema).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=[MatchSchema.resume_id, MatchSchema.listing_id],
+            set_={
+                "missing_keywords": statement.excluded.missing_keywords,
+                "cosine_similarity": statement.excluded.cosine_similarity,
+                "summary": statement.excluded.summary,
+                "matched_at": statement.excluded.matched_at
+            }
+        )
+
+    @staticmethod
+    async def _existing_only(db_session, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        resume_ids = {row["resume_id"] for row in rows}
+        listing_ids = {row["listing_id"] for row in rows}
+        resume_result = await db_session.execute(
+            select(ResumeSchema.id).filter(ResumeSchema.id.in_(resume_ids))
+        )
+        listing_result = await db_session.execute(
+            select(ListingSchema.id).filter(ListingSchema.id.in_(listing_ids))
+        )
+        existing_resumes = set(resume_result.scalars().all())
+        existing_listings = set(listing_result.scalars().all())
+        kept = [
+            row for row in rows
+            if row["resume_id"] in existing_resumes and row["listing_id"] in existing_listings
+        ]
+        if len(kept) < len(rows):
+            logger.warning(f"Dropped {len(rows) - len(kept)} matches whose resume or listing no longer exists")
+        return kept
+
+
+_match_writer = None
+_mutex = threading.Lock()
+
+def get_match_writer() -> MatchWriter:
+    global _match_writer
+    with _mutex:
+        if _match_writer is None:
+            _match_writer = MatchWriter(max_batch_size=settings.MATCH_WRITER_BATCH_SIZE)
+        return _match_writer
@@ -1,5 +1,5 @@
-from datetime import datetime
 from src.models.match import Match
+from src.matching.match_writer import get_match_writer
 from src.utils.logger import logger
 
 def log_match(match: Match) -> None:
@@ -7,55 +7,7 @@ def log_match(match: Match) -> None:
 
 async def commit_match_to_db(match: Match) -> None:
     try:
-        from src.db.session import async_session_maker
-        from src.db.schemas.match import Match as MatchSchema
-        from src.db.schemas.resume import Resume as ResumeSchema
-        from src.db.schemas.listing import Listing as ListingSchema
-        from sqlalchemy import select
-        
-        async with async_session_maker() as db_session:
-            missing_keywords_str = ",".join(match.missing_keywords) if match.missing_keywords else ""
-            match_data = {
-                "resume_id": int(match.resume_id) if match.resume_id else None,
-                "listing_id": int(match.listing_id) if match.listing_id else None,
-                "missing_keywords": missing_keywords_str,
-                "cosine_similarity": match.cosine_similarity or 0.0,
-                "summary": match.summary or "",
-                "matched_at": datetime.utcnow()
-            }
-            if not match_data["resume_id"] or not match_data["listing_id"]:
-                logger.error(f"Invalid match data: missing resume_id or listing_id")
-                return
-            resume_result = await db_session.execute(
-                select(ResumeSchema).filter(ResumeSchema.id == match_data["resume_id"])
-            )
-            resume = resume_result.scalars().first()
-            if not resume:
-                logger.warning(f"Cannot create match: resume {match_data['resume_id']} no longer exists")
-                return
-            listing_result = await db_session.execute(
-                select(ListingSchema).filter(ListingSchema.id == match_data["listing_id"])
-            )
-            listing = listing_result.scalars().first()
-            if not listing:
-                logger.warning(f"Cannot create match: listing {match_data['listing_id']} no longer exists")
-                return
-            existing_match_result = await db_session.execute(
-                select(MatchSchema).filter(
-                    MatchSchema.resume_id == match_data["resume_id"],
-                    MatchSchema.listing_id == match_data["listing_id"]
-                )
-            )
-            existing_match = existing_match_result.scalars().first()
-            if existing_match:
-                logger.debug(f"Match already exists between resume {match_data['resume_id']} and listing {match_data['listing_id']}")
-                return
-            
-            row = MatchSchema(**match_data)
-            db_session.add(row)
-            await db_session.commit()
-            await db_session.refresh(row)
-            logger.info(f"Successfully committed match {row.id} to database")
-                
+        await get_match_writer().write(match)
     except Exception as e:
-        logger.error(f"Failed to commit match to database: {str(e)}")
\ No newline at end of file
+        logger.error(f"Failed to commit match to database: {str(e)}")
+        raise
@@ -1,7 +1,9 @@
 import threading
-import asyncio
-from typing import Tuple, List, Callable
+from typing import Any, Dict, Tuple, List, Callable, Optional, Sequence
 
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.jobs.job_queue import JobQueue, PRIORITY_BACKGROUND
 from src.models.resume.resume_keyword_data import ResumeKeywordData
 from src.models.listing.listing_keyword_data import ListingKeywordData
 from src.models.match import Match
@@ -9,56 +11,86 @@ from src.processing.matching_processor import MatchingProcessor
 
 from src.utils.logger import logger
 
+from config import settings
+
+MATCH_QUEUE = "match"
+
 class MatchingQueue:
-    _matching_queue: asyncio.Queue[Tuple[ResumeKeywordData, ListingKeywordData]]
+    """
+    Durable queue of (resume, listing, similarity) pairs drained by a pool of job workers.
+
+    Queued pairs are stripped of the resume content and listing description, which matching
+    does not use, and of both embeddings when the similarity is already known.
+    """
+    _jobs: JobQueue
     _matching_processor: MatchingProcessor
     _on_match_callbacks: List[Callable[[Match], None]]
 
-    _processing_task: asyncio.Task | None
-    _stop_event: asyncio.Event
-
-    def __init__(self, matching_processor: MatchingProcessor):
-        self._matching_queue = asyncio.Queue()
+    def __init__(self, matching_processor: MatchingProcessor, workers: int = None):
+        self._jobs = JobQueue(MATCH_QUEUE, self._process_job, workers=workers or settings.MATCHING_WORKERS)
         self._matching_processor = matching_processor
         self._on_match_callbacks = []
-        self._processing_task = None
-        self._stop_event = asyncio.Event()
 
     async def start(self) -> None:
-        self._stop_event.clear()
-        self._processing_task = asyncio.create_task(self._process_matches())
+        await self._jobs.start()
 
     async def stop(self) -> None:
-        self._stop_event.set()
-        if self._processing_task:
-            await self._processing_task
-            self._processing_task = None
+        await self._jobs.stop()
 
-    def enqueue(self, resume: ResumeKeywordData, listing: ListingKeywordData) -> None:
-        self._matching_queue.put_nowait((resume, listing))
+    async def enqueue(
+        self,
+        resume: ResumeKeywordData,
+        listing: ListingKeywordData,
+        similarity: Optional[float] = None,
+        priority: int = PRIORITY_BACKGROUND
+    ) -> None:
+        await self.enqueue_many([(resume, listing, similarity)], priority)
+
+    async def enqueue_many(
+        self,
+        pairs: Sequence[Tuple[ResumeKeywordData, ListingKeywordData, Optional[float]]],
+        priority: int = PRIORITY_BACKGROUND,
+        db_session: AsyncSession = None
+    ) -> None:
+        await self._jobs.enqueue_many([self._to_payload(*pair) for pair in pairs], priority, db_session)
+
+    @staticmethod
+    def _to_payload(
+        resume: ResumeKeywordData,
+        listing: ListingKeywordData,
+        similarity: Optional[float]
+    ) -> Dict[str, Any]:
+        keep_embeddings = similarity is None
+        return {
+            "resume": resume.model_copy(update={
+                "content": "",
+                "embedding": resume.embedding if keep_embeddings else []
+            }).model_dump(mode="json"),
+            "listing": listing.model_copy(update={
+                "description": None,
+                "embedding": listing.embedding if keep_embeddings else []
+            }).model_dump(mode="json"),
+            "similarity": similarity
+        }
 
     def register_on_match_callback(self, callback: Callable[[Match], None]) -> None:
         self._on_match_callbacks.append(callback)
 
-    async def _process_matches(self) -> None:
-        while not self._stop_event.is_set():
-            try:
-                resume, listing = await asyncio.wait_for(self._matching_queue.get(), timeout=60)
-                match = await self._matching_processor.match(resume, listing)
-                if match is not None:
-                    await self._notify_on_match(match)
-            except asyncio.TimeoutError:
-                continue
-            except Exception as e:
-                logger.error(f"Error processing match: {str(e)}")
-                continue
+    async def _process_job(self, payload: Dict[str, Any]) -> None:
+        resume = ResumeKeywordData(**payload["resume"])
+        listing = ListingKeywordData(**payload["listing"])
+        match = await self._matching_processor.match(resume, listing, payload.get("similarity"))
+        if match is not None:
+            await self._notify_on_match(match)
 
     async def _notify_on_match(self, match: Match) -> None:
+        """Runs the callbacks in order; a failing callback, e.g. storing the match, fails the job so it is retried."""
         for callback in self._on_match_callbacks:
             try:
                 await callback(match)
             except Exception as e:
                 logger.error(f"Error in match callback {callback.__name__}: {str(e)}")
+                raise
 
 _matching_queue = None
 _mutex = threading.Lock()
@@ -0,0 +1,73 @@
+import asyncio
+from typing import Any, Callable, List, Sequence, Set, Tuple
+
+from src.processing.inference_executor import run_inference
+from src.utils.logger import logger
+
+
+class EmbeddingBatcher:
+    """
+    Collects embedding requests from concurrent callers and encodes them together.
+
+    Requests are buffered until either max_batch_size texts are pending or max_wait_ms has
+    passed since the first pending request, then encoded with a single call on the inference
+    executor. Each caller receives the vector for its own text.
+    """
+    _encode: Callable[[List[str]], Sequence[Any]]
+    _max_batch_size: int
+    _max_wait: float
+    _pending: List[Tuple[str, asyncio.Future]]
+    _flush_handle: asyncio.TimerHandle | None
+    _running: Set[asyncio.Task]
+
+    def __init__(
+        self,
+        encode: Callable[[List[str]], Sequence[Any]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0
+    ):
+        self._encode = encode
+        self._max_batch_size = max(1, max_batch_size)
+        self._max_wait = max_wait_ms / 1000.0
+        self._pending = []
+        self._flush_handle = None
+        self._running = set()
+
+    async def embed(self, text: str) -> Any:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        if len(self._pending) >= self._max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self._max_wait, self._flush)
+        return await future
+
+    async def embed_many(self, texts: List[str]) -> List[Any]:
+        return list(await asyncio.gather(*(self.embed(text) for text in texts)))
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._pending:
+            batch = self._pending[:self._max_batch_size]
+            self._pending = self._pending[self._max_batch_size:]
+            task = asyncio.create_task(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        texts = [text for text, _ in batch]
+        try:
+            vectors = await run_inference(self._encode, texts)
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(texts)} texts failed: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        logger.debug(f"Encoded embedding batch of {len(texts)} texts")
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
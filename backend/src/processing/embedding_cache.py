@@ -0,0 +1,164 @@
+import hashlib
+import threading
+from typing import List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import select, update, func
+from sqlalchemy.dialects.postgresql import insert
+
+from src.utils.cache_stats import CacheStats, trim_least_recently_used
+from src.utils.logger import logger
+from src.utils.lru_cache import LRUCache
+
+from config import settings
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalizes comma separated keyword text so that formatting differences (case, whitespace,
+    line breaks, trailing commas) map to the same cache entry.
+    """
+    parts = (" ".join(part.split()) for part in text.lower().split(","))
+    return ", ".join(part for part in parts if part)
+
+
+def cache_key(model_name: str, normalized_text: str) -> str:
+    return hashlib.sha256(f"{model_name}\0{normalized_text}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache keyed by a hash of the model name and normalized text.
+
+    Lookups go to an in-process LRU first and then to the embedding_cache table. The table is
+    trimmed to max_persistent_rows by least recent use every trim_interval writes. Failures of
+    the persistent tier are logged and treated as misses.
+    """
+    _memory: LRUCache[np.ndarray]
+    _persistent: bool
+    _max_persistent_rows: int
+    _trim_interval: int
+    _writes_since_trim: int
+    _memory_hits: int
+    _persistent_hits: int
+    _misses: int
+    _stats_lock: threading.Lock
+
+    def __init__(
+        self,
+        memory_entries: int,
+        persistent: bool = True,
+        max_persistent_rows: int = 500_000,
+        trim_interval: int = 1_000
+    ):
+        self._memory = LRUCache(memory_entries)
+        self._persistent = persistent
+        self._max_persistent_rows = max_persistent_rows
+        self._trim_interval = trim_interval
+        self._writes_since_trim = 0
+        self._memory_hits = 0
+        self._persistent_hits = 0
+        self._misses = 0
+        self._stats_lock = threading.Lock()
+
+    async def get_many(self, model_name: str, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        keys = [cache_key(model_name, text) for text in texts]
+        results: List[Optional[np.ndarray]] = [self._memory.get(key) for key in keys]
+        memory_hits = sum(1 for vector in results if vector is not None)
+
+        missing_keys = list({key for key, vector in zip(keys, results) if vector is None})
+        found = await self._get_persistent(model_name, missing_keys) if missing_keys else {}
+        for i, key in enumerate(keys):
+            if results[i] is None and key in found:
+                results[i] = found[key]
+                self._memory.put(key, found[key])
+
+        with self._stats_lock:
+            self._memory_hits += memory_hits
+            self._persistent_hits += sum(1 for key in keys if key in found)
+            self._misses += sum(1 for vector in results if vector is None)
+        return results
+
+    async def put_many(self, model_name: str, texts: Sequence[str], vectors: Sequence[Sequence[float]]) -> None:
+        rows = {}
+        for text, vector in zip(texts, vectors):
+            key = cache_key(model_name, text)
+            array = np.asarray(vector, dtype=np.float32)
+            self._memory.put(key, array)
+            rows[key] = array
+        if rows:
+            await self._put_persistent(model_name, rows)
+
+    def stats(self) -> CacheStats:
+        with self._stats_lock:
+            return CacheStats(
+                memory_hits=self._memory_hits,
+                persistent_hits=self._persistent_hits,
+                misses=self._misses,
+                memory_entries=len(self._memory)
+            )
+
+    async def _get_persistent(self, model_name: str, keys: List[str]) -> dict:
+        if not self._persistent:
+            return {}
+        from src.db.session import async_session_maker
+        from src.db.schemas.embedding_cache import EmbeddingCacheEntry
+        try:
+            async with async_session_maker() as db_session:
+                result = await db_session.execute(
+                    select(EmbeddingCacheEntry.key, EmbeddingCacheEntry.embedding).filter(
+                        EmbeddingCacheEntry.key.in_(keys),
+                        EmbeddingCacheEntry.model_name == model_name
+                    )
+                )
+                found = {key: np.frombuffer(blob, dtype=np.float32) for key, blob in result.all()}
+                if found:
+                    await db_session.execute(
+                        update(EmbeddingCacheEntry)
+                        .where(EmbeddingCacheEntry.key.in_(list(found)))
+                        .values(last_used_at=func.now())
+                    )
+                    await db_session.commit()
+                return found
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup failed, treating as miss: {str(e)}")
+            return {}
+
+    async def _put_persistent(self, model_name: str, rows: dict) -> None:
+        if not self._persistent:
+            return
+        from src.db.session import async_session_maker
+        from src.db.schemas.embedding_cache import EmbeddingCacheEntry
+        try:
+            async with async_session_maker() as db_session:
+                statement = insert(EmbeddingCacheEntry).values([
+                    {"key": key, "model_name": model_name, "embedding": array.tobytes()}
+                    for key, array in rows.items()
+                ])
+                statement = statement.on_conflict_do_update(
+                    index_elements=[EmbeddingCacheEntry.key],
+                    set_={"last_used_at": func.now()}
+                )
+                await db_session.execute(statement)
+                self._writes_since_trim += len(rows)
+                if self._writes_since_trim >= self._trim_interval:
+                    self._writes_since_trim = 0
+                    await trim_least_recently_used(db_session, EmbeddingCacheEntry, self._max_persistent_rows)
+                await db_session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to persist {len(rows)} embeddings to cache: {str(e)}")
+
+
+_embedding_cache = None
+_mutex = threading.Lock()
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _embedding_cache
+    with _mutex:
+        if _embedding_cache is None:
+            _embedding_cache = EmbeddingCache(
+                memory_entries=settings.EMBEDDING_CACHE_MEMORY_ENTRIES,
+                persistent=settings.EMBEDDING_CACHE_PERSISTENT,
+                max_persistent_rows=settings.EMBEDDING_CACHE_MAX_ROWS
+            )
+        return _embedding_cache
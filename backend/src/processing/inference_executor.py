@@ -0,0 +1,41 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+from config import settings
+
+T = TypeVar("T")
+
+# CPU-bound model inference (KeyBERT extraction, SentenceTransformer encoding) runs on this
+# dedicated pool rather than on the event loop or the default executor, so a scrape cannot
+# starve request handling or other asyncio.to_thread users. Threads are used rather than
+# processes: the models release the GIL during inference and are shared through the model
+# registry, where a process pool would hold a copy of every model per worker.
+
+_inference_executor = None
+_mutex = threading.Lock()
+
+def get_inference_executor() -> ThreadPoolExecutor:
+    global _inference_executor
+    with _mutex:
+        if _inference_executor is None:
+            _inference_executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.INFERENCE_WORKERS),
+                thread_name_prefix="inference_"
+            )
+        return _inference_executor
+
+
+async def run_inference(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_inference_executor(), functools.partial(func, *args, **kwargs))
+
+
+def shutdown_inference_executor() -> None:
+    global _inference_executor
+    with _mutex:
+        if _inference_executor is not None:
+            _inference_executor.shutdown(wait=False, cancel_futures=True)
+            _inference_executor = None
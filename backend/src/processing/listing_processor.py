@@ -1,12 +1,72 @@
-from typing import List
+import asyncio
+import json
+import re
+from typing import Dict, List, Tuple
 
 from src.models.listing.listing import Listing
 from src.models.listing.listing_keyword_data import ListingKeywordData
 from src.processing.processor import Processor
-from src.prompts.llama3.listing_keywords import PROMPT as PROMPT_LISTING_KEYWORDS
+from src.prompts.llama3.listing_keywords import PROMPT as PROMPT_LISTING_KEYWORDS, VERSION as PROMPT_LISTING_KEYWORDS_VERSION
+from src.prompts.llama3.listing_keywords_batch import (
+    PROMPT as PROMPT_LISTING_KEYWORDS_BATCH,
+    VERSION as PROMPT_LISTING_KEYWORDS_BATCH_VERSION,
+    MAX_KEYWORDS as BATCH_MAX_KEYWORDS
+)
 from src.utils.processing_utils import ollama_api_call_async, kw_text_to_list
 from src.utils.logger import logger
 
+from config import settings
+
+# Rough prompt size estimate; Llama tokenizers average about four characters per token in English
+CHARS_PER_TOKEN = 4
+
+# Output budget of one listing in a batched answer: a quoted keyword of one or two words with
+# its separator takes up to about six tokens, plus the listing number and brackets
+OUTPUT_TOKENS_PER_ITEM = BATCH_MAX_KEYWORDS * 6 + 10
+
+# A complete "number": [keywords] or "number": "keywords" entry of a JSON object
+BATCH_ENTRY = re.compile(r'"(\d+)"\s*:\s*(\[[^\]]*\]|"(?:[^"\\]|\\.)*")')
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def parse_batch_keywords(response: str, count: int) -> Dict[int, List[str]]:
+    """
+    Parses a batched keyword response, a JSON object mapping listing numbers (1-based) to
+    keyword lists, into {index: keywords}. When the object is invalid, e.g. cut off at the
+    token limit, its complete entries are still used. Listings that are missing or have no
+    usable keywords are left out, so the caller can retry them one by one.
+    """
+    start, end = response.find("{"), response.rfind("}")
+    data = None
+    if 0 <= start < end:
+        try:
+            data = json.loads(response[start:end + 1])
+        except ValueError:
+            data = None
+    if not isinstance(data, dict):
+        data = {}
+        for number, value in BATCH_ENTRY.findall(response[max(start, 0):]):
+            try:
+                data[number] = json.loads(value)
+            except ValueError:
+                continue
+    parsed = {}
+    for number, keywords in data.items():
+        index = int(number) - 1 if str(number).strip().isdigit() else -1
+        if not 0 <= index < count:
+            continue
+        if isinstance(keywords, str):
+            keywords = re.split(r"[\n,]", keywords)
+        if not isinstance(keywords, list):
+            continue
+        cleaned = kw_text_to_list("\n".join(str(keyword).lower() for keyword in keywords))
+        if cleaned:
+            parsed[index] = list(dict.fromkeys(cleaned))
+    return parsed
+
 
 class ListingProcessor(Processor):
 
@@ -14,26 +74,113 @@ class ListingProcessor(Processor):
         super().__init__(**kwargs)
 
     def process_listings(self, listings: List[Listing]) -> List[ListingKeywordData]:
-        processed_listings = []
+        keyword_lists = [self.extract_keywords(listing.description, top_n=8) for listing in listings]
+        embeddings = self.embed_texts([", ".join(keywords) for keywords in keyword_lists])
+        return [
+            self._to_keyword_data(listing, keywords, embedding.tolist())
+            for listing, keywords, embedding in zip(listings, keyword_lists, embeddings)
+        ]
+
+    async def extract_listing_keywords_async(self, listings: List[Listing]) -> List[List[str]]:
+        if settings.LISTING_LLM_KEYWORDS and settings.OLLAMA_ENABLED:
+            batches = self._llm_batches(listings)
+            results = await asyncio.gather(*(self._extract_batch_keywords_llm(batch) for batch in batches))
+            return [keywords for batch_keywords in results for keywords in batch_keywords]
+        return list(await asyncio.gather(
+            *(self.extract_keywords_async(listing.description, top_n=8) for listing in listings)
+        ))
+
+    def _llm_batches(self, listings: List[Listing]) -> List[List[Listing]]:
+        """
+        Splits listings, in order, into batches whose prompt and expected output fit in
+        OLLAMA_CONTEXT_SIZE tokens, with at most LISTING_LLM_BATCH_MAX_ITEMS listings each.
+        """
+        budget = settings.OLLAMA_CONTEXT_SIZE - estimate_tokens(PROMPT_LISTING_KEYWORDS_BATCH)
+        batches = []
+        batch = []
+        used = 0
         for listing in listings:
-            processed_listing = self._process_single_listing(listing)
-            processed_listings.append(processed_listing)
+            cost = estimate_tokens(listing.description or "") + OUTPUT_TOKENS_PER_ITEM
+            if batch and (used + cost > budget or len(batch) >= settings.LISTING_LLM_BATCH_MAX_ITEMS):
+                batches.append(batch)
+                batch = []
+                used = 0
+            batch.append(listing)
+            used += cost
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def _extract_batch_keywords_llm(self, listings: List[Listing]) -> List[List[str]]:
+        """
+        Extracts keywords for several listings with one prompt. Listings the response has no
+        keywords for are retried with the single-listing prompt; if the batched call fails
+        outright, all of them fall back to local keyword extraction.
+        """
+        if len(listings) == 1:
+            return [await self._extract_listing_keywords_llm(listings[0])]
+        items = "\n\n".join(
+            f"[{number}] {' '.join((listing.description or '').split())}"
+            for number, listing in enumerate(listings, start=1)
+        )
+        try:
+            response = await ollama_api_call_async(
+                PROMPT_LISTING_KEYWORDS_BATCH.format(items),
+                model=self.llm_model_name,
+                template_version=PROMPT_LISTING_KEYWORDS_BATCH_VERSION,
+                response_format="json",
+                max_tokens=OUTPUT_TOKENS_PER_ITEM * len(listings)
+            )
+        except Exception as e:
+            logger.warning(f"Batched keyword extraction failed for {len(listings)} listings ({str(e)}), using fallback keyword extraction")
+            return list(await asyncio.gather(
+                *(self.extract_keywords_async(listing.description, top_n=8) for listing in listings)
+            ))
+        parsed = parse_batch_keywords(response or "", len(listings))
+        if len(parsed) < len(listings):
+            logger.debug(f"Batched keyword response covered {len(parsed)} of {len(listings)} listings, retrying the rest one by one")
+        retried = await asyncio.gather(*(
+            self._extract_listing_keywords_llm(listing)
+            for index, listing in enumerate(listings) if index not in parsed
+        ))
+        retried = iter(retried)
+        return [parsed[index] if index in parsed else next(retried) for index in range(len(listings))]
+
+    async def _extract_listing_keywords_llm(self, listing: Listing) -> List[str]:
+        keywords, _ = await self._listing_keywords_with_fallback(listing)
+        return keywords
 
-        return processed_listings
+    async def embed_listings_async(
+        self,
+        listings: List[Listing],
+        keyword_lists: List[List[str]]
+    ) -> List[ListingKeywordData]:
+        embeddings = await self.embed_texts_async([", ".join(keywords) for keywords in keyword_lists])
+        return [
+            self._to_keyword_data(listing, keywords, embedding.tolist())
+            for listing, keywords, embedding in zip(listings, keyword_lists, embeddings)
+        ]
 
     async def _process_single_listing_async(self, listing: Listing) -> ListingKeywordData:
         """Async version of listing processing with fallback"""
+        kw_list, listing_vec_text = await self._listing_keywords_with_fallback(listing)
+        listing_vec = await self.embed_text_async(listing_vec_text)
+        return self._to_keyword_data(listing, kw_list, listing_vec.tolist())
+
+    async def _listing_keywords_with_fallback(self, listing: Listing) -> Tuple[List[str], str]:
+        """Returns the listing's LLM keywords and the text to embed, or local keywords if the LLM is unavailable."""
         prompt = PROMPT_LISTING_KEYWORDS.format(listing.description)
 
         try:
             listing_kw = await ollama_api_call_async(
                 prompt,
-                model=self.llm_model_name
+                model=self.llm_model_name,
+                template_version=PROMPT_LISTING_KEYWORDS_VERSION
             )
 
             if listing_kw is None:
                 logger.info(f"Ollama is disabled, using fallback keyword extraction for listing {listing.id}")
-                fallback_keywords = self.extract_keywords(listing.description, top_n=8)
+                fallback_keywords = await self.extract_keywords_async(listing.description, top_n=8)
                 kw_list = fallback_keywords
                 listing_vec_text = ", ".join(fallback_keywords)
             else:
@@ -43,36 +190,22 @@ class ListingProcessor(Processor):
 
         except Exception as e:
             logger.warning(f"Ollama failed for listing {listing.id} ({str(e)}), using fallback keyword extraction")
-            fallback_keywords = self.extract_keywords(listing.description, top_n=8)
+            fallback_keywords = await self.extract_keywords_async(listing.description, top_n=8)
             kw_list = fallback_keywords
             listing_vec_text = ", ".join(fallback_keywords)
 
-        listing_vec = self.embed_text(listing_vec_text)
-        listing_vec_converted = listing_vec.tolist()
-
-        return ListingKeywordData(id=listing.id,
-                                  keywords=kw_list,
-                                  embedding=listing_vec_converted,
-                                  title=listing.title,
-                                  company=listing.company,
-                                  description=listing.description,
-                                  remote=listing.remote,
-                                  created_at=listing.created_at,
-                                  updated_at=listing.updated_at,
-                                  salary_min=listing.salary_min,
-                                  salary_max=listing.salary_max,
-                                  currency=listing.currency,
-                                  location=listing.location,
-                                  link=listing.link)
+        return kw_list, listing_vec_text
 
     def _process_single_listing(self, listing: Listing) -> ListingKeywordData:
         fallback_keywords = self.extract_keywords(listing.description, top_n=8)
         listing_vec_text = ", ".join(fallback_keywords)
         listing_vec = self.embed_text(listing_vec_text)
-        listing_vec_converted = listing_vec.tolist()
+        return self._to_keyword_data(listing, fallback_keywords, listing_vec.tolist())
+
+    def _to_keyword_data(self, listing: Listing, keywords: List[str], embedding: List[float]) -> ListingKeywordData:
         return ListingKeywordData(id=listing.id,
-                                  keywords=fallback_keywords,
-                                  embedding=listing_vec_converted,
+                                  keywords=keywords,
+                                  embedding=embedding,
                                   title=listing.title,
                                   company=listing.company,
                                   description=listing.description,
@@ -0,0 +1,180 @@
+import hashlib
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+
+from sqlalchemy import select, update, delete, func
+from sqlalchemy.dialects.postgresql import insert
+
+from src.utils.cache_stats import CacheStats, trim_least_recently_used
+from src.utils.logger import logger
+from src.utils.lru_cache import LRUCache
+
+from config import settings
+
+
+def prompt_hash(prompt: str) -> str:
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def llm_cache_key(model_name: str, template_version: str, temperature: float, prompt: str) -> str:
+    return hashlib.sha256(
+        f"{model_name}\0{template_version}\0{temperature:g}\0{prompt_hash(prompt)}".encode("utf-8")
+    ).hexdigest()
+
+
+class LLMCache:
+    """
+    Cache of LLM responses keyed by model, prompt template version, temperature and a hash of
+    the prompt, so changing a template (and its VERSION) or the model never serves stale answers.
+
+    Lookups go to an in-process LRU first and then to the llm_response_cache table. Entries
+    expire ttl_seconds after being written. Every trim_interval writes, expired rows are
+    deleted and the table is trimmed to max_persistent_rows by least recent use. Failures of
+    the persistent tier are logged and treated as misses.
+    """
+    _memory: LRUCache[Tuple[str, datetime]]
+    _persistent: bool
+    _ttl: timedelta
+    _max_persistent_rows: int
+    _trim_interval: int
+    _writes_since_trim: int
+    _memory_hits: int
+    _persistent_hits: int
+    _misses: int
+    _stats_lock: threading.Lock
+
+    def __init__(
+        self,
+        memory_entries: int,
+        ttl_seconds: float,
+        persistent: bool = True,
+        max_persistent_rows: int = 200_000,
+        trim_interval: int = 1_000
+    ):
+        self._memory = LRUCache(memory_entries)
+        self._persistent = persistent
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._max_persistent_rows = max_persistent_rows
+        self._trim_interval = trim_interval
+        self._writes_since_trim = 0
+        self._memory_hits = 0
+        self._persistent_hits = 0
+        self._misses = 0
+        self._stats_lock = threading.Lock()
+
+    async def get(self, model_name: str, template_version: str, temperature: float, prompt: str) -> Optional[str]:
+        key = llm_cache_key(model_name, template_version, temperature, prompt)
+        now = datetime.now(timezone.utc)
+        entry = self._memory.get(key)
+        if entry is not None and entry[1] > now:
+            self._count(memory_hits=1)
+            return entry[0]
+
+        found = await self._get_persistent(key)
+        if found is not None:
+            self._memory.put(key, found)
+            self._count(persistent_hits=1)
+            return found[0]
+        self._count(misses=1)
+        return None
+
+    async def put(self, model_name: str, template_version: str, temperature: float, prompt: str, response: str) -> None:
+        key = llm_cache_key(model_name, template_version, temperature, prompt)
+        expires_at = datetime.now(timezone.utc) + self._ttl
+        self._memory.put(key, (response, expires_at))
+        await self._put_persistent({
+            "key": key,
+            "model_name": model_name,
+            "template_version": template_version,
+            "temperature": temperature,
+            "prompt_hash": prompt_hash(prompt),
+            "response": response,
+            "expires_at": expires_at,
+        })
+
+    def stats(self) -> CacheStats:
+        with self._stats_lock:
+            return CacheStats(
+                memory_hits=self._memory_hits,
+                persistent_hits=self._persistent_hits,
+                misses=self._misses,
+                memory_entries=len(self._memory)
+            )
+
+    def _count(self, memory_hits: int = 0, persistent_hits: int = 0, misses: int = 0) -> None:
+        with self._stats_lock:
+            self._memory_hits += memory_hits
+            self._persistent_hits += persistent_hits
+            self._misses += misses
+
+    async def _get_persistent(self, key: str) -> Optional[Tuple[str, datetime]]:
+        if not self._persistent:
+            return None
+        from src.db.session import async_session_maker
+        from src.db.schemas.llm_response_cache import LLMResponseCacheEntry
+        try:
+            async with async_session_maker() as db_session:
+                result = await db_session.execute(
+                    select(LLMResponseCacheEntry.response, LLMResponseCacheEntry.expires_at).filter(
+                        LLMResponseCacheEntry.key == key,
+                        LLMResponseCacheEntry.expires_at > func.now()
+                    )
+                )
+                row = result.first()
+                if row is None:
+                    return None
+                await db_session.execute(
+                    update(LLMResponseCacheEntry)
+                    .where(LLMResponseCacheEntry.key == key)
+                    .values(last_used_at=func.now())
+                )
+                await db_session.commit()
+                return row.response, row.expires_at
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed, treating as miss: {str(e)}")
+            return None
+
+    async def _put_persistent(self, row: dict) -> None:
+        if not self._persistent:
+            return
+        from src.db.session import async_session_maker
+        from src.db.schemas.llm_response_cache import LLMResponseCacheEntry
+        try:
+            async with async_session_maker() as db_session:
+                statement = insert(LLMResponseCacheEntry).values(row)
+                statement = statement.on_conflict_do_update(
+                    index_elements=[LLMResponseCacheEntry.key],
+                    set_={
+                        "response": statement.excluded.response,
+                        "expires_at": statement.excluded.expires_at,
+                        "last_used_at": func.now()
+                    }
+                )
+                await db_session.execute(statement)
+                self._writes_since_trim += 1
+                if self._writes_since_trim >= self._trim_interval:
+                    self._writes_since_trim = 0
+                    await db_session.execute(
+                        delete(LLMResponseCacheEntry).where(LLMResponseCacheEntry.expires_at <= func.now())
+                    )
+                    await trim_least_recently_used(db_session, LLMResponseCacheEntry, self._max_persistent_rows)
+                await db_session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to persist LLM response to cache: {str(e)}")
+
+
+_llm_cache = None
+_mutex = threading.Lock()
+
+def get_llm_cache() -> LLMCache:
+    global _llm_cache
+    with _mutex:
+        if _llm_cache is None:
+            _llm_cache = LLMCache(
+                memory_entries=settings.LLM_CACHE_MEMORY_ENTRIES,
+                ttl_seconds=settings.LLM_CACHE_TTL_SECONDS,
+                persistent=settings.LLM_CACHE_PERSISTENT,
+                max_persistent_rows=settings.LLM_CACHE_MAX_ROWS
+            )
+        return _llm_cache
@@ -1,25 +1,38 @@
+import asyncio
 from typing import List, Optional
 from datetime import datetime
 
-import torch
+import numpy as np
 
 from src.models.listing.listing_keyword_data import ListingKeywordData
 from src.models.resume.resume_keyword_data import ResumeKeywordData
 from src.models.match import Match
 from src.processing.processor import Processor
-from src.prompts.llama3.matching_keywords import PROMPT as KEYWORD_MATCHING_PROMPT
-from src.prompts.llama3.matching_summary import PROMPT as SUMMARY_MATCHING_PROMPT
+from src.prompts.llama3.matching_keywords import PROMPT as KEYWORD_MATCHING_PROMPT, VERSION as KEYWORD_MATCHING_PROMPT_VERSION
+from src.prompts.llama3.matching_summary import PROMPT as SUMMARY_MATCHING_PROMPT, VERSION as SUMMARY_MATCHING_PROMPT_VERSION
 from src.utils.logger import logger
-from src.utils.processing_utils import ollama_api_call_async, format_keywords, kw_text_to_list
+from src.utils.processing_utils import ollama_api_call_async, format_keywords, kw_text_to_list, is_transient_error
 
 from config import settings
 
 class MatchingProcessor(Processor):
+    _llm_semaphore: asyncio.Semaphore
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self._llm_semaphore = asyncio.Semaphore(max(1, settings.MATCHING_LLM_CONCURRENCY))
 
-    async def match(self, resume: ResumeKeywordData, listing: ListingKeywordData) -> Optional[Match]:
-        """Process a match between resume and listing"""
+    async def match(
+        self,
+        resume: ResumeKeywordData,
+        listing: ListingKeywordData,
+        similarity: Optional[float] = None
+    ) -> Optional[Match]:
+        """
+        Process a match between resume and listing. When the pair was already scored by
+        candidate retrieval, the similarity is passed in and not recomputed.
+        Transient LLM and database failures are raised so the match job is retried.
+        """
         try:
             if not resume:
                 logger.warning("Resume object is None, skipping match")
@@ -33,15 +46,19 @@ class MatchingProcessor(Processor):
             if not listing.keywords:
                 logger.warning(f"Listing {listing.id} has no keywords, skipping match")
                 return None
-            if not resume.embedding or not listing.embedding:
-                logger.warning(f"Missing embeddings for resume {resume.id} or listing {listing.id}")
-                return None
-            similarity = self._calculate_cosine_similarity(resume.embedding, listing.embedding)
+            if similarity is None:
+                if not resume.embedding or not listing.embedding:
+                    logger.warning(f"Missing embeddings for resume {resume.id} or listing {listing.id}")
+                    return None
+                similarity = self._calculate_cosine_similarity(resume.embedding, listing.embedding)
             if similarity < settings.MATCHING_COSINE_THRESHOLD:
                 logger.debug(f"Match between resume {resume.id} and listing {listing.id} below threshold: {similarity}")
                 return None
-            missing_keywords = await self._find_missing_keywords_async(resume.keywords, listing.keywords)
-            summary = await self._generate_summary_async(resume.keywords, listing.keywords)
+            async with self._llm_semaphore:
+                missing_keywords, summary = await asyncio.gather(
+                    self._find_missing_keywords_async(resume.keywords, listing.keywords),
+                    self._generate_summary_async(resume.keywords, listing.keywords)
+                )
             match = Match(
                 resume_id=str(resume.id),
                 listing_id=str(listing.id),
@@ -53,6 +70,8 @@ class MatchingProcessor(Processor):
             return match
             
         except Exception as e:
+            if is_transient_error(e):
+                raise
             logger.error(f"Error matching resume {resume.id} with listing {listing.id}: {str(e)}")
             return None
 
@@ -60,13 +79,13 @@ class MatchingProcessor(Processor):
         try:
             if not resume_embedding or not listing_embedding:
                 return 0.0
-            vec1 = torch.tensor(resume_embedding, dtype=torch.float32)
-            vec2 = torch.tensor(listing_embedding, dtype=torch.float32)
+            vec1 = np.asarray(resume_embedding, dtype=np.float32)
+            vec2 = np.asarray(listing_embedding, dtype=np.float32)
             if vec1.shape != vec2.shape:
                 logger.warning(f"Embedding dimension mismatch: {vec1.shape} vs {vec2.shape}")
                 return 0.0
-            cos_sim = torch.nn.functional.cosine_similarity(vec1.unsqueeze(0), vec2.unsqueeze(0))
-            return float(cos_sim.item())
+            norms = float(np.linalg.norm(vec1) * np.linalg.norm(vec2))
+            return float(np.dot(vec1, vec2)) / norms if norms > 0 else 0.0
         except Exception as e:
             logger.error(f"Error calculating cosine similarity: {str(e)}")
             return 0.0
@@ -89,7 +108,8 @@ class MatchingProcessor(Processor):
                 missing_kw = await ollama_api_call_async(
                     prompt, 
                     model=self.llm_model_name, 
-                    temperature=0.1
+                    temperature=0.1,
+                    template_version=KEYWORD_MATCHING_PROMPT_VERSION
                 )
                 
                 if missing_kw is None:
@@ -105,10 +125,14 @@ class MatchingProcessor(Processor):
                     return missing_simple
                 
             except Exception as llm_error:
+                if is_transient_error(llm_error):
+                    raise
                 logger.debug(f"LLM keyword matching failed: {str(llm_error)}, using simple approach")
                 return missing_simple
                 
         except Exception as e:
+            if is_transient_error(e):
+                raise
             logger.error(f"Error finding missing keywords: {str(e)}")
             return []
 
@@ -126,7 +150,8 @@ class MatchingProcessor(Processor):
                 summary = await ollama_api_call_async(
                     prompt, 
                     model=self.llm_model_name, 
-                    temperature=0.3
+                    temperature=0.3,
+                    template_version=SUMMARY_MATCHING_PROMPT_VERSION
                 )
                 
                 if summary is None:
@@ -135,12 +160,16 @@ class MatchingProcessor(Processor):
                     return summary.strip()
                     
             except Exception as llm_error:
+                if is_transient_error(llm_error):
+                    raise
                 logger.debug(f"LLM summary generation failed: {str(llm_error)}, using fallback")
             
             overlap = set(kw.lower() for kw in resume_keywords) & set(kw.lower() for kw in listing_keywords)
             return f"The candidate's resume shows {len(overlap)} matching skills out of {len(listing_keywords)} required. Key overlapping areas include: {', '.join(list(overlap)[:5])}."
             
         except Exception as e:
+            if is_transient_error(e):
+                raise
             logger.error(f"Error generating summary: {str(e)}")
             return "Summary generation failed"
 
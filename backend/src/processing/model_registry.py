@@ -0,0 +1,157 @@
+import gc
+import os
+import resource
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from pydantic import BaseModel
+
+from src.utils.logger import logger
+
+SPACY = "spacy"
+SENTENCE_TRANSFORMER = "sentence_transformer"
+KEYBERT = "keybert"
+
+
+class ModelStats(BaseModel):
+    kind: str
+    name: str
+    ref_count: int
+    rss_bytes: int
+    load_seconds: float
+
+
+class _ModelEntry:
+    model: Any
+    ref_count: int
+    rss_bytes: int
+    load_seconds: float
+
+    def __init__(self, model: Any, rss_bytes: int, load_seconds: float):
+        self.model = model
+        self.ref_count = 0
+        self.rss_bytes = rss_bytes
+        self.load_seconds = load_seconds
+
+
+def _current_rss_bytes() -> int:
+    """
+    Returns the resident set size of the current process. Reads /proc on Linux and falls back
+    to the peak RSS reported by getrusage elsewhere.
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return max_rss if sys.platform == "darwin" else max_rss * 1024
+
+
+class ModelRegistry:
+    """
+    Process-wide registry of the NLP models used by the processors.
+
+    Every model is loaded once per (kind, name) and reference counted, so all processors in
+    a process share the same spaCy pipeline and SentenceTransformer. KeyBERT is built on top
+    of the registry's SentenceTransformer instead of loading its own copy of the encoder.
+    A model is unloaded when the last reference to it is released.
+    """
+    _entries: Dict[Tuple[str, str], _ModelEntry]
+    _loaders: Dict[str, Callable[[str], Any]]
+    _lock: threading.RLock
+
+    def __init__(self):
+        self._entries = {}
+        self._loaders = {
+            SPACY: self._load_spacy,
+            SENTENCE_TRANSFORMER: self._load_sentence_transformer,
+            KEYBERT: self._load_keybert,
+        }
+        self._lock = threading.RLock()
+
+    def acquire(self, kind: str, name: str) -> Any:
+        if kind not in self._loaders:
+            raise ValueError(f"Unknown model kind: {kind}")
+        with self._lock:
+            entry = self._entries.get((kind, name))
+            if entry is None:
+                if kind == KEYBERT:
+                    # KeyBERT wraps the shared encoder and holds a reference to it while loaded.
+                    self.acquire(SENTENCE_TRANSFORMER, name)
+                try:
+                    entry = self._load(kind, name)
+                except Exception:
+                    if kind == KEYBERT:
+                        self.release(SENTENCE_TRANSFORMER, name)
+                    raise
+                self._entries[(kind, name)] = entry
+            entry.ref_count += 1
+            return entry.model
+
+    def release(self, kind: str, name: str) -> None:
+        with self._lock:
+            entry = self._entries.get((kind, name))
+            if entry is None:
+                logger.warning(f"Released model {kind}:{name} which is not loaded")
+                return
+            entry.ref_count -= 1
+            if entry.ref_count > 0:
+                return
+            del self._entries[(kind, name)]
+            if kind == KEYBERT:
+                self.release(SENTENCE_TRANSFORMER, name)
+            logger.info(f"Unloaded model {kind}:{name}")
+        gc.collect()
+
+    def is_loaded(self, kind: str, name: str) -> bool:
+        with self._lock:
+            return (kind, name) in self._entries
+
+    def memory_report(self) -> Dict[str, ModelStats]:
+        with self._lock:
+            return {
+                f"{kind}:{name}": ModelStats(
+                    kind=kind,
+                    name=name,
+                    ref_count=entry.ref_count,
+                    rss_bytes=entry.rss_bytes,
+                    load_seconds=entry.load_seconds
+                )
+                for (kind, name), entry in self._entries.items()
+            }
+
+    def _load(self, kind: str, name: str) -> _ModelEntry:
+        rss_before = _current_rss_bytes()
+        started = time.perf_counter()
+        model = self._loaders[kind](name)
+        load_seconds = time.perf_counter() - started
+        rss_bytes = max(0, _current_rss_bytes() - rss_before)
+        logger.info(f"Loaded model {kind}:{name} in {load_seconds:.2f}s (+{rss_bytes / 2**20:.1f} MiB RSS)")
+        return _ModelEntry(model, rss_bytes, load_seconds)
+
+    def _load_spacy(self, name: str) -> Any:
+        import spacy
+        return spacy.load(name)
+
+    def _load_sentence_transformer(self, name: str) -> Any:
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(name)
+
+    def _load_keybert(self, name: str) -> Any:
+        from keybert import KeyBERT
+        encoder = self._entries[(SENTENCE_TRANSFORMER, name)].model
+        return KeyBERT(model=encoder)
+
+
+_model_registry = None
+_mutex = threading.Lock()
+
+def get_model_registry() -> ModelRegistry:
+    global _model_registry
+    with _mutex:
+        if _model_registry is None:
+            _model_registry = ModelRegistry()
+        return _model_registry
@@ -0,0 +1,52 @@
+import asyncio
+from typing import List, Optional
+
+from src.processing.processor import Processor
+from src.utils.logger import logger
+
+WARMUP_NOT_STARTED = "not_started"
+WARMUP_RUNNING = "running"
+WARMUP_DONE = "done"
+WARMUP_FAILED = "failed"
+
+_warmup_task: Optional[asyncio.Task] = None
+_warmup_state: str = WARMUP_NOT_STARTED
+
+
+async def _warm_up(processors: List[Processor]) -> None:
+    global _warmup_state
+    _warmup_state = WARMUP_RUNNING
+    try:
+        for processor in processors:
+            await asyncio.to_thread(processor.warm_up)
+        _warmup_state = WARMUP_DONE
+        logger.info("Model warm-up complete.")
+    except Exception as e:
+        _warmup_state = WARMUP_FAILED
+        logger.error(f"Model warm-up failed: {str(e)}")
+
+
+def start_model_warmup(processors: List[Processor]) -> asyncio.Task:
+    """
+    Loads the processors' models in a background thread so that the API can serve requests
+    while inference is still warming up.
+    """
+    global _warmup_task
+    if _warmup_task is None or _warmup_task.done():
+        _warmup_task = asyncio.create_task(_warm_up(processors))
+    return _warmup_task
+
+
+async def stop_model_warmup() -> None:
+    global _warmup_task
+    if _warmup_task and not _warmup_task.done():
+        _warmup_task.cancel()
+        try:
+            await _warmup_task
+        except asyncio.CancelledError:
+            pass
+    _warmup_task = None
+
+
+def get_warmup_state() -> str:
+    return _warmup_state
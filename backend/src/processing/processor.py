@@ -1,22 +1,67 @@
+import threading
 from abc import ABC
 from typing import List
 
-import spacy
-from keybert import KeyBERT
-from sentence_transformers import SentenceTransformer
 from torch import Tensor
 
+from src.processing.embedding_batcher import EmbeddingBatcher
+from src.processing.embedding_cache import get_embedding_cache, normalize_text
+from src.processing.inference_executor import run_inference
+from src.processing.model_registry import get_model_registry, SPACY, KEYBERT, SENTENCE_TRANSFORMER
+
+from config import settings
+
 
 class Processor(ABC):
+    """
+    Base class for the NLP processors. Models are acquired from the shared registry lazily, on
+    first use, so constructing a processor is cheap and never blocks application startup.
+    """
+
     def __init__(self,
                  llm_model_name="llama3",
                  nlp_model_name="en_core_web_sm",
                  kw_model_name="all-MiniLM-L6-v2",
                  embed_model_name="all-MiniLM-L6-v2"):
         self.llm_model_name = llm_model_name
-        self.nlp_spacy = spacy.load(nlp_model_name)
-        self.kw_model = KeyBERT(model=kw_model_name)
-        self.embed_model = SentenceTransformer(embed_model_name)
+        self.nlp_model_name = nlp_model_name
+        self.kw_model_name = kw_model_name
+        self.embed_model_name = embed_model_name
+        self._models = {}
+        self._models_lock = threading.Lock()
+        self._embedding_batcher = None
+
+    @property
+    def nlp_spacy(self):
+        return self._get_model(SPACY, self.nlp_model_name)
+
+    @property
+    def kw_model(self):
+        return self._get_model(KEYBERT, self.kw_model_name)
+
+    @property
+    def embed_model(self):
+        return self._get_model(SENTENCE_TRANSFORMER, self.embed_model_name)
+
+    def _get_model(self, kind: str, name: str):
+        with self._models_lock:
+            if (kind, name) not in self._models:
+                self._models[(kind, name)] = get_model_registry().acquire(kind, name)
+            return self._models[(kind, name)]
+
+    def warm_up(self) -> None:
+        """Loads every model used by this processor ahead of the first request."""
+        self._get_model(SPACY, self.nlp_model_name)
+        self._get_model(KEYBERT, self.kw_model_name)
+        self._get_model(SENTENCE_TRANSFORMER, self.embed_model_name)
+
+    def close(self) -> None:
+        """Releases this processor's references to the shared models."""
+        registry = get_model_registry()
+        with self._models_lock:
+            for kind, name in self._models:
+                registry.release(kind, name)
+            self._models = {}
 
     def preprocess(self, text: str) -> str:
         doc = self.nlp_spacy(text)
@@ -40,9 +85,47 @@ class Processor(ABC):
         keywords = [kw for kw, score in keyword_tuples]
         return keywords
 
+    async def extract_keywords_async(self, text: str, **kwargs) -> list[str]:
+        """Runs extract_keywords on the inference executor, off the event loop."""
+        return await run_inference(self.extract_keywords, text, **kwargs)
+
     def embed_text(self, text: str) -> Tensor:
         return self.embed_model.encode(text)
 
+    def embed_texts(self, texts: List[str]) -> List[Tensor]:
+        if not texts:
+            return []
+        return list(self.embed_model.encode(texts, batch_size=settings.EMBEDDING_BATCH_SIZE))
+
+    async def embed_text_async(self, text: str) -> Tensor:
+        """Embeds a single text, batched together with concurrent callers."""
+        return (await self.embed_texts_async([text]))[0]
+
+    async def embed_texts_async(self, texts: List[str]) -> List[Tensor]:
+        """
+        Embeds normalized texts, serving repeats from the embedding cache and encoding only
+        the misses through the micro-batcher.
+        """
+        cache = get_embedding_cache()
+        normalized = [normalize_text(text) for text in texts]
+        vectors = await cache.get_many(self.embed_model_name, normalized)
+        missing = list(dict.fromkeys(text for text, vector in zip(normalized, vectors) if vector is None))
+        if missing:
+            encoded = await self._get_embedding_batcher().embed_many(missing)
+            await cache.put_many(self.embed_model_name, missing, encoded)
+            by_text = dict(zip(missing, encoded))
+            vectors = [by_text[text] if vector is None else vector for text, vector in zip(normalized, vectors)]
+        return vectors
+
+    def _get_embedding_batcher(self) -> EmbeddingBatcher:
+        if self._embedding_batcher is None:
+            self._embedding_batcher = EmbeddingBatcher(
+                self.embed_texts,
+                max_batch_size=settings.EMBEDDING_BATCH_SIZE,
+                max_wait_ms=settings.EMBEDDING_BATCH_WAIT_MS
+            )
+        return self._embedding_batcher
+
     def tokenize_sentences(self, text: str) -> List[str]:
         doc = self.nlp_spacy(text)
         return [sent.text.strip() for sent in doc.sents]
@@ -1,51 +1,45 @@
 import threading
-import asyncio
-from typing import List, Callable
+from typing import Any, Dict, List, Callable
 
+from src.jobs.job_queue import JobQueue, PRIORITY_INTERACTIVE
 from src.models.resume.resume import Resume
 from src.models.resume.resume_keyword_data import ResumeKeywordData
 from src.processing.resume_processor import ResumeProcessor
 
+from config import settings
+
+RESUME_QUEUE = "resume"
+
 class ResumeProcessingQueue:
-    _resume_queue: asyncio.Queue[Resume]
+    _jobs: JobQueue
     _resume_processor: ResumeProcessor
     _on_processed_callbacks: List[Callable[[ResumeKeywordData], None]]
 
-    _processing_task: asyncio.Task | None
-    _stop_event: asyncio.Event
-
     def __init__(self, resume_processor: ResumeProcessor):
-        self._resume_queue = asyncio.Queue()
+        self._jobs = JobQueue(RESUME_QUEUE, self._process_job, workers=settings.RESUME_WORKERS)
         self._resume_processor = resume_processor
         self._on_processed_callbacks = []
-        self._processing_task = None
-        self._stop_event = asyncio.Event()
 
     async def start(self) -> None:
-        self._stop_event.clear()
-        self._processing_task = asyncio.create_task(self._process_resumes())
+        await self._jobs.start()
 
     async def stop(self) -> None:
-        self._stop_event.set()
-        if self._processing_task:
-            await self._processing_task
-            self._processing_task = None
+        await self._jobs.stop()
 
-    def enqueue(self, resume: Resume) -> None:
-        self._resume_queue.put_nowait(resume)
+    @property
+    def resume_processor(self) -> ResumeProcessor:
+        return self._resume_processor
+
+    async def enqueue(self, resume: Resume, priority: int = PRIORITY_INTERACTIVE) -> None:
+        await self._jobs.enqueue(resume.model_dump(mode="json"), priority)
 
     def register_on_processed_callback(self, callback: Callable[[ResumeKeywordData], None]) -> None:
         self._on_processed_callbacks.append(callback)
 
-    async def _process_resumes(self) -> None:
-        while not self._stop_event.is_set():
-            try:
-                resume = await asyncio.wait_for(self._resume_queue.get(), timeout=60)
-            except asyncio.TimeoutError:
-                continue
-
-            processed = await self._resume_processor.process_resume(resume)
-            await self._notify_on_processed(processed)
+    async def _process_job(self, payload: Dict[str, Any]) -> None:
+        resume = Resume(**payload)
+        processed = await self._resume_processor.process_resume(resume)
+        await self._notify_on_processed(processed)
 
     async def _notify_on_processed(self, processed_resume: ResumeKeywordData) -> None:
         for callback in self._on_processed_callbacks:
@@ -3,7 +3,7 @@ from typing import List, Optional
 from src.models.resume.resume import Resume
 from src.models.resume.resume_keyword_data import ResumeKeywordData
 from src.processing.processor import Processor
-from src.prompts.llama3.resume_keywords import PROMPT as PROMPT_RESUME_KEYWORDS
+from src.prompts.llama3.resume_keywords import PROMPT as PROMPT_RESUME_KEYWORDS, VERSION as PROMPT_RESUME_KEYWORDS_VERSION
 from src.utils.logger import logger
 from src.utils.processing_utils import ollama_api_call_async, format_keywords, kw_text_to_list
 
@@ -12,25 +12,19 @@ class ResumeProcessor(Processor):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
-    async def process_resumes(self, resumes: List[Resume]) -> List[ResumeKeywordData]:
-        processed_resumes = []
-        for resume in resumes:
-            processed_resume = await self.process_resume(resume)
-            processed_resumes.append(processed_resume)
-        return processed_resumes
-
     async def process_resume(self, resume: Resume) -> ResumeKeywordData:
         prompt = PROMPT_RESUME_KEYWORDS.format(resume.content)
         
         try:
             resume_content_llm_processed = await ollama_api_call_async(
                 prompt, 
-                model=self.llm_model_name
+                model=self.llm_model_name,
+                template_version=PROMPT_RESUME_KEYWORDS_VERSION
             )
             
             if resume_content_llm_processed is None:
                 logger.info(f"Ollama is disabled, using fallback keyword extraction for resume {resume.id}")
-                fallback_keywords = self.extract_keywords(resume.content, top_n=10)
+                fallback_keywords = await self.extract_keywords_async(resume.content, top_n=10)
                 resume_kw = ", ".join(fallback_keywords)
                 kw_list = fallback_keywords
             else:
@@ -40,11 +34,11 @@ class ResumeProcessor(Processor):
                 
         except Exception as e:
             logger.warning(f"Ollama failed for resume {resume.id} ({str(e)}), using fallback keyword extraction")
-            fallback_keywords = self.extract_keywords(resume.content, top_n=10)
+            fallback_keywords = await self.extract_keywords_async(resume.content, top_n=10)
             resume_kw = ", ".join(fallback_keywords)
             kw_list = fallback_keywords
 
-        resume_vec = self.embed_text(resume_kw if isinstance(resume_kw, str) else ", ".join(kw_list))
+        resume_vec = await self.embed_text_async(resume_kw if isinstance(resume_kw, str) else ", ".join(kw_list))
         resume_vec_converted = resume_vec.tolist()
 
         return ResumeKeywordData(id=resume.id,
@@ -69,7 +63,7 @@ class ResumeProcessor(Processor):
             chunk_kw_set = set(chunk_kw_list)
             all_processed_chunks.update(chunk_kw_set)
         resume_full = ", ".join(all_processed_chunks)
-        resume_vec = self.embed_text(resume_full)
+        resume_vec = await self.embed_text_async(resume_full)
         resume_vec_converted = resume_vec.tolist()
         logger.debug(f"Final keywords for resume {resume.id}: {all_processed_chunks}.")
         return ResumeKeywordData(id=resume.id,
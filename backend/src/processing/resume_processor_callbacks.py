@@ -1,13 +1,18 @@
+from typing import Tuple
+
 from src.db.session import async_session_maker
 from src.db.schemas.resume import Resume as ResumeSchema
 
 from src.models.resume.resume_keyword_data import ResumeKeywordData
 from src.models.query import Query
-from src.scraping.scraper_registry import get_query_manager
+from src.scraping.scraper_registry import get_query_manager, save_query_manager
 
 from src.utils.logger import logger
+from src.utils.processing_utils import vector_to_list
+
+from sqlalchemy import select, func
 
-from sqlalchemy import select
+from config import settings
 
 async def update_resume_keywords(resume: ResumeKeywordData) -> None:
     try:
@@ -18,7 +23,11 @@ async def update_resume_keywords(resume: ResumeKeywordData) -> None:
             existing_resume = result.scalars().first()
             if existing_resume is not None:
                 existing_resume.keywords = ",".join(resume.keywords) if resume.keywords else ""
-                existing_resume.embedding = ",".join(map(str, resume.embedding)) if resume.embedding else ""
+                if vector_to_list(existing_resume.embedding) != resume.embedding:
+                    from src.matching.match_evaluations import invalidate_resume_evaluations
+                    existing_resume.embedding = resume.embedding or None
+                    existing_resume.embedding_updated_at = func.now()
+                    await invalidate_resume_evaluations(db_session, resume.id)
                 await db_session.commit()
                 await db_session.refresh(existing_resume)
                 logger.info(f"Updated keywords for resume ID {resume.id}: {len(resume.keywords)} keywords")
@@ -54,6 +63,7 @@ async def generate_query(resume: ResumeKeywordData) -> None:
         logger.info(f"Generated query for resume {resume.id}: keywords={query.keywords}, location={query.location}, radius={query.radius}")
         query_manager = get_query_manager()
         query_manager.add_query(query)
+        await save_query_manager()
         active_queries = list(query_manager.get_queries())
         logger.info(f"Total active queries after adding: {len(active_queries)}")
         for i, q in enumerate(active_queries):
@@ -62,36 +72,76 @@ async def generate_query(resume: ResumeKeywordData) -> None:
     except Exception as e:
         logger.error(f"Error generating query for resume {resume.id}: {str(e)}")
 
+async def _find_listing_candidates(db_session, resume: ResumeKeywordData) -> Tuple[list, list]:
+    """
+    Returns the (listing_id, similarity) pairs scored for a resume that has not been evaluated
+    against them yet, and the (listing, company, similarity) rows among them that clear the
+    threshold. Uses the in-memory listing index once it is loaded, so only the candidate rows
+    are read from the database, and falls back to the pgvector index otherwise.
+    """
+    from src.matching.candidate_retrieval import find_listing_candidates
+    from src.matching.listing_index import get_listing_index
+    from src.matching.match_evaluations import get_evaluated_listing_ids, listing_not_evaluated_with
+    from src.db.schemas.listing import Listing as ListingSchema
+    from src.db.schemas.company import Company as CompanySchema
+
+    threshold = settings.MATCHING_COSINE_THRESHOLD
+    index = get_listing_index()
+    if not settings.LISTING_INDEX_ENABLED or not index.loaded:
+        rows = await find_listing_candidates(
+            db_session,
+            resume.embedding,
+            threshold=-1.0,
+            filters=[listing_not_evaluated_with(resume.id)]
+        )
+        scored = [(listing.id, similarity) for listing, _, similarity in rows]
+        return scored, [row for row in rows if row[2] >= threshold]
+    await index.sync()
+    scored = index.search(
+        resume.embedding,
+        top_k=settings.MATCHING_CANDIDATES_TOP_K,
+        exclude=await get_evaluated_listing_ids(db_session, resume.id)
+    )
+    similarities = {listing_id: similarity for listing_id, similarity in scored if similarity >= threshold}
+    if not similarities:
+        return scored, []
+    result = await db_session.execute(
+        select(ListingSchema, CompanySchema)
+        .join(CompanySchema, ListingSchema.company_id == CompanySchema.id)
+        .filter(ListingSchema.id.in_(list(similarities)))
+    )
+    rows = [(listing, company, similarities[listing.id]) for listing, company in result.all()]
+    return scored, sorted(rows, key=lambda row: row[2], reverse=True)
+
 async def enqueue_matches(resume: ResumeKeywordData) -> None:
     try:
         if not resume.keywords or not resume.embedding:
             logger.warning(f"Resume {resume.id} missing keywords or embedding, skipping match enqueuing")
             return
         from src.matching.matching_queue import get_matching_queue
+        from src.jobs.job_queue import PRIORITY_INTERACTIVE
+        from src.matching.match_evaluations import resume_needs_sweep, record_evaluations, mark_resume_evaluated
         from src.models.listing.listing_keyword_data import ListingKeywordData
-        from src.db.schemas.listing import Listing as ListingSchema
-        from src.db.schemas.company import Company as CompanySchema
-        from src.db.session import async_session_maker
         processed_count = 0
         error_count = 0
         async with async_session_maker() as db_session:
             result = await db_session.execute(
-                select(ListingSchema, CompanySchema)
-                .join(CompanySchema, ListingSchema.company_id == CompanySchema.id)
-                .filter(
-                    ListingSchema.keywords.isnot(None),
-                    ListingSchema.embedding.isnot(None)
-                )
+                select(ResumeSchema).filter(ResumeSchema.id == resume.id)
             )
-            listing_data = result.all()
-            for listing_row, company_row in listing_data:
+            resume_db = result.scalars().first()
+            if resume_db is None:
+                logger.error(f"Resume {resume.id} not found in database for matching")
+                return
+            if not resume_needs_sweep(resume_db):
+                logger.info(f"Resume {resume.id} unchanged since it was last evaluated, skipping match enqueuing")
+                return
+            scored, candidates = await _find_listing_candidates(db_session, resume)
+            await record_evaluations(db_session, [(resume.id, listing_id, similarity) for listing_id, similarity in scored])
+            pairs = []
+            for listing_row, company_row, similarity in candidates:
                 try:
-                    if not listing_row or not company_row:
-                        logger.warning(f"Invalid listing or company data, skipping")
-                        error_count += 1
-                        continue
-                    if not listing_row.keywords or not listing_row.embedding:
-                        logger.warning(f"Listing {listing_row.id} missing keywords or embedding")
+                    if not listing_row.keywords:
+                        logger.warning(f"Listing {listing_row.id} missing keywords")
                         error_count += 1
                         continue
                     listing_kw_data = ListingKeywordData(
@@ -107,19 +157,18 @@ async def enqueue_matches(resume: ResumeKeywordData) -> None:
                         currency=listing_row.currency,
                         location=listing_row.location,
                         link=listing_row.link,
-                        keywords=listing_row.keywords.split(",") if listing_row.keywords else [],
-                        embedding=[float(x) for x in listing_row.embedding.split(",")] if listing_row.embedding else []
+                        keywords=listing_row.keywords.split(","),
+                        embedding=vector_to_list(listing_row.embedding)
                     )
-                    if not listing_kw_data or not listing_kw_data.keywords or not listing_kw_data.embedding:
-                        logger.warning(f"Created listing object {listing_row.id} is invalid, skipping")
-                        error_count += 1
-                        continue
-                    get_matching_queue().enqueue(resume, listing_kw_data)
+                    pairs.append((resume, listing_kw_data, similarity))
                     processed_count += 1
                 except Exception as listing_error:
                     logger.error(f"Error processing listing {listing_row.id if listing_row else 'Unknown'}: {str(listing_error)}")
                     error_count += 1
                     continue
-            logger.info(f"Enqueued matches for resume {resume.id}: {processed_count} successful, {error_count} errors")
+            await get_matching_queue().enqueue_many(pairs, PRIORITY_INTERACTIVE, db_session)
+            await mark_resume_evaluated(db_session, resume.id)
+            await db_session.commit()
+            logger.info(f"Enqueued matches for resume {resume.id}: {len(scored)} pairs evaluated, {processed_count} candidates, {error_count} errors")
     except Exception as e:
-        logger.error(f"Error enqueuing matches for resume {resume.id}: {str(e)}")
\ No newline at end of file
+        logger.error(f"Error enqueuing matches for resume {resume.id}: {str(e)}")
@@ -1,3 +1,5 @@
+VERSION = "1"
+
 PROMPT = """
 <|begin_of_text|><|start_header_id|>system<|end_header_id|>
 
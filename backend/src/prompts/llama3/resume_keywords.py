@@ -1,6 +1,8 @@
 """
 Prompt for extracting relevant keywords from resumes
 """
+VERSION = "1"
+
 PROMPT = """
 <|begin_of_text|><|start_header_id|>system<|end_header_id|>
 
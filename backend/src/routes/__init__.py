@@ -1,3 +1,3 @@
-from . import auth, resumes, matches
+from . import auth, resumes, matches, health
 
-__all__ = ["auth", "resumes", "matches"]
\ No newline at end of file
+__all__ = ["auth", "resumes", "matches", "health"]
\ No newline at end of file
@@ -0,0 +1,48 @@
+from fastapi import APIRouter
+
+from src.processing.model_registry import get_model_registry
+from src.processing.model_warmup import get_warmup_state, WARMUP_DONE
+from src.processing.embedding_cache import get_embedding_cache
+from src.processing.llm_cache import get_llm_cache
+from src.utils.resilient_http import get_http_metrics
+
+router = APIRouter()
+
+
+@router.get("/live")
+async def live() -> dict:
+    return {"status": "ok"}
+
+
+@router.get("/ready")
+async def ready() -> dict:
+    warmup_state = get_warmup_state()
+    models = get_model_registry().memory_report()
+    return {
+        "status": "ok",
+        "inference_ready": warmup_state == WARMUP_DONE,
+        "warmup": warmup_state,
+        "models": {
+            key: {
+                "kind": stats.kind,
+                "name": stats.name,
+                "ref_count": stats.ref_count,
+                "rss_bytes": stats.rss_bytes,
+                "load_seconds": round(stats.load_seconds, 3)
+            }
+            for key, stats in models.items()
+        }
+    }
+
+
+@router.get("/http")
+async def http() -> dict:
+    return {"hosts": get_http_metrics().snapshot()}
+
+
+@router.get("/caches")
+async def caches() -> dict:
+    return {
+        name: {**stats.model_dump(), "hit_rate": round(stats.hit_rate, 4)}
+        for name, stats in (("embedding", get_embedding_cache().stats()), ("llm", get_llm_cache().stats()))
+    }
@@ -108,7 +108,7 @@ async def upload_resume(
             file_path=str(file_path),
             content=content
         )
-        resume_processing_queue.enqueue(resume)
+        await resume_processing_queue.enqueue(resume)
         logger.info(f"Resume {resume.id} queued for processing with location: {location}, radius: {radius}")
         return {
             "success": True, 
@@ -1,17 +1,15 @@
 from typing import List
 
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import IntegrityError
-from sqlalchemy import select
-
 from src.db.session import async_session_maker
-from src.db.schemas.company import Company as CompanySchema
-from src.db.schemas.listing import Listing as ListingSchema
 
 from src.models.listing.listing_keyword_data import ListingKeywordData
+from src.matching.listing_index import get_listing_index
+from src.scraping.listing_ingestion import get_listing_ingestor
 
 from src.utils.logger import logger
-from src.utils.pdf import extract_text_from_pdf
+from src.utils.processing_utils import vector_to_list
+
+from config import settings
 
 async def log_listing_keywords(
     listing: ListingKeywordData,
@@ -19,61 +17,30 @@ async def log_listing_keywords(
     from src.utils.logger import logger
     logger.info(f"Listing keywords: {listing.keywords}")
 
-async def process_and_commit_listing(listing: ListingKeywordData) -> ListingKeywordData:
-    async def _row_from_listing_keyword_data(
-        data: ListingKeywordData,
-        db_session: AsyncSession
-    ) -> ListingSchema:
-        result = await db_session.execute(
-            select(CompanySchema).filter_by(name=data.company)
-        )
-        company = result.scalars().first()
-        if not company:
-            company = CompanySchema(name=data.company)
-            db_session.add(company)
-            await db_session.commit()
-            await db_session.refresh(company)
-        dumped = data.model_dump(exclude={"company", "keywords", "embedding"}, exclude_unset=True)
-        dumped["company_id"] = company.id
-        dumped["keywords"] = ",".join(data.keywords) if data.keywords else None
-        dumped["embedding"] = ",".join(map(str, data.embedding)) if data.embedding else None
-        return ListingSchema(**dumped)
-    
-    async with async_session_maker() as db_session:
-        try:
-            listing_schema = await _row_from_listing_keyword_data(listing, db_session)
-            db_session.add(listing_schema)
-            await db_session.commit()
-            await db_session.refresh(listing_schema)
-            updated_listing = ListingKeywordData(
-                id=listing_schema.id,
-                keywords=listing.keywords,
-                embedding=listing.embedding,
-                title=listing.title,
-                company=listing.company,
-                description=listing.description,
-                remote=listing.remote,
-                created_at=listing.created_at,
-                updated_at=listing.updated_at,
-                salary_min=listing.salary_min,
-                salary_max=listing.salary_max,
-                currency=listing.currency,
-                location=listing.location,
-                link=listing.link
+async def commit_listings(listings: List[ListingKeywordData]) -> List[ListingKeywordData]:
+    """
+    Batch callback storing scraped listings. Returns the new and changed listings with their
+    database ids; unchanged duplicates are dropped.
+    """
+    committed = await get_listing_ingestor().ingest(listings)
+    index = get_listing_index()
+    # Only processes that search the index load it; elsewhere it would just grow unused
+    if settings.LISTING_INDEX_ENABLED and index.active:
+        indexed = [listing for listing in committed if listing.embedding]
+        if indexed:
+            index.add_many(
+                [listing.id for listing in indexed],
+                [listing.embedding for listing in indexed]
             )
-            logger.info(f"Listing saved to database with ID: {updated_listing.id}")
-            return updated_listing
-        except IntegrityError as e:
-            await db_session.rollback()
-            logger.error(f"Failed to save listing: {str(e)}")
-            return listing
+    return committed
 
 async def enqueue_matches(listing: ListingKeywordData) -> ListingKeywordData:
     from src.matching.matching_queue import get_matching_queue
+    from src.jobs.job_queue import PRIORITY_BACKGROUND
+    from src.matching.candidate_retrieval import find_resume_candidates
+    from src.matching.match_evaluations import record_evaluations, resume_not_evaluated_with
     from src.models.resume.resume_keyword_data import ResumeKeywordData
-    from src.db.schemas.resume import Resume as ResumeSchema
-    from src.db.session import async_session_maker
-    
+
     if listing.id is None:
         logger.warning(f"Skipping match enqueuing for listing with None ID: {listing.title}")
         return listing
@@ -81,37 +48,40 @@ async def enqueue_matches(listing: ListingKeywordData) -> ListingKeywordData:
         logger.warning(f"Skipping match enqueuing for listing {listing.id} - missing keywords or embedding")
         return listing
     try:
-        resumes = []
         async with async_session_maker() as db_session:
-            result = await db_session.execute(
-                select(ResumeSchema).filter(
-                    ResumeSchema.keywords.isnot(None),
-                    ResumeSchema.embedding.isnot(None)
-                )
+            scored = await find_resume_candidates(
+                db_session,
+                listing.embedding,
+                threshold=-1.0,
+                filters=[resume_not_evaluated_with(listing.id)]
             )
-            resumes = result.scalars().all()
-        if not resumes:
-            logger.debug(f"No resumes with keywords/embeddings found for matching with listing {listing.id}")
-            return listing
-        logger.info(f"Enqueuing matches for listing {listing.id} with {len(resumes)} resumes")
-        for resume in resumes:
-            try:
-                kw_data = ResumeKeywordData(
-                    id=resume.id,
-                    user_id=resume.user_id,
-                    file_name=resume.file_name,
-                    file_path=resume.file_path,
-                    content=extract_text_from_pdf(resume.file_path) if resume.file_path else "",
-                    keywords=resume.keywords.split(",") if resume.keywords else [],
-                    embedding=list(map(float, resume.embedding.split(","))) if resume.embedding else []
-                )
-                if kw_data.keywords and kw_data.embedding:
-                    get_matching_queue().enqueue(kw_data, listing)
-                else:
-                    logger.debug(f"Skipping resume {resume.id} - missing keywords or embedding")
-            except Exception as resume_error:
-                logger.error(f"Error processing resume {resume.id} for matching: {str(resume_error)}")
-                continue
+            await record_evaluations(db_session, [(resume.id, listing.id, similarity) for resume, similarity in scored])
+            candidates = [(resume, similarity) for resume, similarity in scored if similarity >= settings.MATCHING_COSINE_THRESHOLD]
+            pairs = []
+            for resume, similarity in candidates:
+                try:
+                    kw_data = ResumeKeywordData(
+                        id=resume.id,
+                        user_id=resume.user_id,
+                        file_name=resume.file_name,
+                        file_path=resume.file_path,
+                        content="",
+                        keywords=resume.keywords.split(",") if resume.keywords else [],
+                        embedding=vector_to_list(resume.embedding)
+                    )
+                    if kw_data.keywords and kw_data.embedding:
+                        pairs.append((kw_data, listing, similarity))
+                    else:
+                        logger.debug(f"Skipping resume {resume.id} - missing keywords or embedding")
+                except Exception as resume_error:
+                    logger.error(f"Error processing resume {resume.id} for matching: {str(resume_error)}")
+                    continue
+            await get_matching_queue().enqueue_many(pairs, PRIORITY_BACKGROUND, db_session)
+            await db_session.commit()
+        if pairs:
+            logger.info(f"Enqueued matches for listing {listing.id} with {len(pairs)} candidate resumes")
+        else:
+            logger.debug(f"No resume candidates above threshold for listing {listing.id} ({len(scored)} pairs evaluated)")
     except Exception as e:
         logger.error(f"Error enqueuing matches for listing {listing.id}: {str(e)}")
-    return listing
\ No newline at end of file
+    return listing
@@ -0,0 +1,45 @@
+import hashlib
+from typing import List, Optional
+
+from sqlalchemy import select
+
+from src.db.session import async_session_maker
+from src.db.schemas.listing import Listing as ListingSchema
+from src.models.listing.listing import Listing
+from src.utils.logger import logger
+
+
+def listing_content_hash(title: Optional[str], company: Optional[str], description: Optional[str]) -> str:
+    """Hash of the listing fields that keyword extraction and matching depend on."""
+    parts = (" ".join((part or "").split()) for part in (title, company, description))
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+async def filter_unseen_listings(listings: List[Listing]) -> List[Listing]:
+    """
+    Drops scraped listings whose link is already stored with the same content hash, and
+    repeated links within the scrape, so only new or changed listings reach keyword
+    extraction and embedding. One query per call, on the unique link index.
+    """
+    by_link = {}
+    for listing in listings:
+        if listing.link:
+            by_link[listing.link] = listing
+    if not by_link:
+        return []
+    try:
+        async with async_session_maker() as db_session:
+            result = await db_session.execute(
+                select(ListingSchema.link, ListingSchema.content_hash)
+                .filter(ListingSchema.link.in_(list(by_link)))
+            )
+            known = dict(result.all())
+    except Exception as e:
+        logger.error(f"Failed to check scraped listings against the database, processing all: {str(e)}")
+        return list(by_link.values())
+    unseen = [
+        listing for link, listing in by_link.items()
+        if known.get(link) != listing_content_hash(listing.title, listing.company, listing.description)
+    ]
+    logger.info(f"{len(unseen)} of {len(listings)} scraped listings are new or changed")
+    return unseen
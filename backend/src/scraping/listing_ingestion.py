@@ -0,0 +1,159 @@
+import threading
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Dict, Iterable, List
+
+from sqlalchemy import select, delete, or_, literal_column, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.db.session import async_session_maker
+from src.db.schemas.company import Company as CompanySchema
+from src.db.schemas.listing import Listing as ListingSchema
+from src.db.schemas.match_evaluation import MatchEvaluation
+from src.models.listing.listing_keyword_data import ListingKeywordData
+from src.scraping.listing_dedup import listing_content_hash
+from src.utils.logger import logger
+from src.utils.lru_cache import LRUCache
+
+from config import settings
+
+# Columns refreshed when a scraped listing's link already exists. A row is only rewritten,
+# and only returned, when one of them changed.
+UPDATABLE_COLUMNS = (
+    "title", "company_id", "description", "remote", "salary_min", "salary_max",
+    "currency", "location", "keywords", "embedding", "content_hash"
+)
+
+
+class ListingIngestor:
+    """
+    Writes scraped listings in batches: one company upsert, one listing upsert and one commit
+    per batch instead of several transactions per listing.
+
+    Company ids are kept in a name -> id LRU so known companies cost no query. Listings are
+    upserted on their link. New and changed listings come back with their ids; unchanged
+    duplicates are dropped so they are not matched again. Changed listings lose their
+    match evaluations so they are scored again.
+    """
+    _company_ids: LRUCache[int]
+    _batch_size: int
+
+    def __init__(self, company_cache_entries: int = 10_000, batch_size: int = 500):
+        self._company_ids = LRUCache(company_cache_entries)
+        self._batch_size = max(1, batch_size)
+
+    async def ingest(self, listings: List[ListingKeywordData]) -> List[ListingKeywordData]:
+        committed = []
+        iterator = iter(listings)
+        while batch := list(islice(iterator, self._batch_size)):
+            committed.extend(await self._ingest_batch(batch))
+        return committed
+
+    async def _ingest_batch(self, listings: List[ListingKeywordData]) -> List[ListingKeywordData]:
+        # ON CONFLICT cannot touch the same row twice in one statement; keep the last scrape of a link
+        by_link = {
+            listing.link: listing for listing in listings
+            if listing.link and listing.company and listing.title and listing.description is not None
+        }
+        if not by_link:
+            return []
+        async with async_session_maker() as db_session:
+            company_ids = await self._company_ids_for(db_session, {listing.company for listing in by_link.values()})
+            rows = [self._to_row(listing, company_ids[listing.company]) for listing in by_link.values()]
+            result = await db_session.execute(self._upsert_statement(rows))
+            written = result.all()
+            changed_ids = [row.id for row in written if not row.inserted]
+            if changed_ids:
+                await db_session.execute(delete(MatchEvaluation).where(MatchEvaluation.listing_id.in_(changed_ids)))
+            await db_session.commit()
+
+        committed = [by_link[row.link].model_copy(update={"id": row.id}) for row in written]
+        logger.info(
+            f"Ingested {len(listings)} listings: {len(written) - len(changed_ids)} new, "
+            f"{len(changed_ids)} changed, {len(by_link) - len(written)} unchanged, "
+            f"{len(listings) - len(by_link)} skipped"
+        )
+        return committed
+
+    async def _company_ids_for(self, db_session: AsyncSession, names: Iterable[str]) -> Dict[str, int]:
+        ids = {}
+        missing = []
+        for name in names:
+            company_id = self._company_ids.get(name)
+            if company_id is None:
+                missing.append(name)
+            else:
+                ids[name] = company_id
+        if missing:
+            result = await db_session.execute(
+                insert(CompanySchema)
+                .values([{"name": name} for name in missing])
+                .on_conflict_do_nothing(index_elements=[CompanySchema.name])
+                .returning(CompanySchema.id, CompanySchema.name)
+            )
+            found = {name: company_id for company_id, name in result.all()}
+            existing = [name for name in missing if name not in found]
+            if existing:
+                result = await db_session.execute(
+                    select(CompanySchema.id, CompanySchema.name).filter(CompanySchema.name.in_(existing))
+                )
+                found.update({name: company_id for company_id, name in result.all()})
+            for name, company_id in found.items():
+                self._company_ids.put(name, company_id)
+            ids.update(found)
+        return ids
+
+    @staticmethod
+    def _to_row(listing: ListingKeywordData, company_id: int) -> dict:
+        now = datetime.now(timezone.utc)
+        return {
+            "title": listing.title,
+            "company_id": company_id,
+            "description": listing.description,
+            "remote": listing.remote,
+            "created_at": listing.created_at or now,
+            "updated_at": listing.updated_at or now,
+            "salary_min": listing.salary_min,
+            "salary_max": listing.salary_max,
+            "currency": listing.currency,
+            "location": listing.location,
+            "link": listing.link,
+            "keywords": ",".join(listing.keywords) if listing.keywords else None,
+            "embedding": listing.embedding or None,
+            "content_hash": listing_content_hash(listing.title, listing.company, listing.description)
+        }
+
+    @staticmethod
+    def _upsert_statement(rows: List[dict]):
+        statement = insert(ListingSchema).values(rows)
+        return statement.on_conflict_do_update(
+            index_elements=[ListingSchema.link],
+            set_={
+                **{column: statement.excluded[column] for column in UPDATABLE_COLUMNS},
+                "updated_at": statement.excluded.updated_at,
+                "scraped_at": func.now()
+            },
+            where=or_(*(
+                ListingSchema.__table__.c[column].is_distinct_from(statement.excluded[column])
+                for column in UPDATABLE_COLUMNS
+            ))
+        ).returning(
+            ListingSchema.id,
+            ListingSchema.link,
+            literal_column("xmax = 0").label("inserted")
+        )
+
+
+_listing_ingestor = None
+_mutex = threading.Lock()
+
+def get_listing_ingestor() -> ListingIngestor:
+    global _listing_ingestor
+    with _mutex:
+        if _listing_ingestor is None:
+            _listing_ingestor = ListingIngestor(
+                company_cache_entries=settings.COMPANY_CACHE_ENTRIES,
+                batch_size=settings.LISTING_INGEST_BATCH_SIZE
+            )
+        return _listing_ingestor
@@ -0,0 +1,72 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from src.utils.logger import logger
+
+_DONE = object()
+
+
+class PipelineStage(NamedTuple):
+    name: str
+    func: Callable[[Any], Awaitable[Optional[Any]]]
+    concurrency: int = 1
+
+
+async def run_pipeline(
+    items: Iterable[Any],
+    stages: List[PipelineStage],
+    channel_size: int = 4
+) -> Dict[str, int]:
+    """
+    Streams items through the stages, each run by its own number of worker tasks and
+    connected to the next by a bounded channel, so an item reaches the last stage while
+    later items are still in the first one and at most channel_size items wait between two
+    stages. A stage returning None or an empty result drops the item; a stage raising is
+    logged and drops the item. If iterating the items fails, every stage is cancelled and
+    the error raised. Returns the number of items each stage emitted.
+    """
+    channels = [asyncio.Queue(maxsize=max(1, channel_size)) for _ in stages]
+    emitted = {stage.name: 0 for stage in stages}
+
+    async def feed() -> None:
+        for item in items:
+            await channels[0].put(item)
+        await channels[0].put(_DONE)
+
+    async def work(index: int, stage: PipelineStage) -> None:
+        inbox = channels[index]
+        outbox = channels[index + 1] if index + 1 < len(channels) else None
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                await inbox.put(_DONE)  # let the stage's other workers see the end
+                return
+            try:
+                result = await stage.func(item)
+            except Exception as e:
+                logger.error(f"Error in pipeline stage {stage.name}: {str(e)}")
+                continue
+            if result is None or (isinstance(result, list) and not result):
+                continue
+            emitted[stage.name] += 1
+            if outbox is not None:
+                await outbox.put(result)
+
+    async def run_stage(index: int, stage: PipelineStage) -> None:
+        await asyncio.gather(*(work(index, stage) for _ in range(max(1, stage.concurrency))))
+        if index + 1 < len(channels):
+            await channels[index + 1].put(_DONE)
+
+    tasks = [
+        asyncio.create_task(feed()),
+        *(asyncio.create_task(run_stage(index, stage)) for index, stage in enumerate(stages))
+    ]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # Feeding failed or the pipeline was cancelled; stop every stage rather than orphan it
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    return emitted
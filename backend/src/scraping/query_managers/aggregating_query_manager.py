@@ -1,5 +1,6 @@
 from typing import Generator, Set
 import asyncio
+import hashlib
 
 from src.models.query import Query
 from src.scraping.query_managers.query_manager import QueryManager
@@ -24,62 +25,97 @@ def _check_similarity(existing_query: Query, query: Query) -> bool:
     return jaccard_similarity(existing_query.keywords, query.keywords) > SIMILARITY_THRESHOLD
 
 
+def stored_query_key(query: Query) -> str:
+    """Unique key of a stored query; keyword order does not matter."""
+    parts = (
+        ",".join(sorted(query.keywords)),
+        query.location or "",
+        query.radius or "",
+        "" if query.salary is None else str(query.salary)
+    )
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
 class AggregatingQueryManager(QueryManager):
+    """
+    Merges similar queries and persists them to stored_queries. Several processes may share
+    the table, so saving only writes this process's own changes since the last save: added
+    or merged queries are upserted by their key and replaced or removed ones are deleted.
+    """
     _queries: Set[Query]
+    _added: Set[Query]
+    _removed: Set[Query]
     _loaded: bool
 
     def __init__(self):
         self._queries = set()
+        self._added = set()
+        self._removed = set()
         self._loaded = False
 
+    async def _fetch_queries_from_db(self) -> Set[Query]:
+        from src.db.session import async_session_maker
+        from src.db.schemas.stored_query import StoredQuery
+        from sqlalchemy import select
+
+        async with async_session_maker() as db_session:
+            result = await db_session.execute(select(StoredQuery))
+            stored_queries = result.scalars().all()
+
+        queries = set()
+        for stored_query in stored_queries:
+            keywords = tuple(stored_query.keywords.split(",")) if stored_query.keywords else tuple()
+            queries.add(Query(
+                keywords=keywords,
+                location=stored_query.location,
+                radius=stored_query.radius,
+                salary=stored_query.salary
+            ))
+        logger.info(f"Loaded {len(stored_queries)} queries from database")
+        return queries
+
     async def _load_queries_from_db(self) -> None:
         try:
-            from src.db.session import async_session_maker
-            from src.db.schemas.stored_query import StoredQuery
-            from sqlalchemy import select
-
-            async with async_session_maker() as db_session:
-                result = await db_session.execute(select(StoredQuery))
-                stored_queries = result.scalars().all()
-                
-                for stored_query in stored_queries:
-                    keywords = tuple(stored_query.keywords.split(",")) if stored_query.keywords else tuple()
-                    query = Query(
-                        keywords=keywords,
-                        location=stored_query.location,
-                        radius=stored_query.radius,
-                        salary=stored_query.salary
-                    )
-                    self._queries.add(query)
-                
-                logger.info(f"Loaded {len(stored_queries)} queries from database")
-                self._loaded = True
-                
+            self._queries.update(await self._fetch_queries_from_db())
         except Exception as e:
             logger.error(f"Failed to load queries from database: {str(e)}")
-            self._loaded = True
+        self._loaded = True
 
     async def _save_queries_to_db(self) -> None:
+        added, removed = self._added, self._removed
+        if not added and not removed:
+            return
+        self._added, self._removed = set(), set()
         try:
             from src.db.session import async_session_maker
             from src.db.schemas.stored_query import StoredQuery
-            from sqlalchemy import select, delete
+            from sqlalchemy import delete
+            from sqlalchemy.dialects.postgresql import insert
 
             async with async_session_maker() as db_session:
-                await db_session.execute(delete(StoredQuery))
-                for query in self._queries:
-                    keywords_str = ",".join(query.keywords) if query.keywords else ""
-                    stored_query = StoredQuery(
-                        keywords=keywords_str,
-                        location=query.location,
-                        radius=query.radius,
-                        salary=query.salary
+                if removed:
+                    await db_session.execute(
+                        delete(StoredQuery).where(StoredQuery.query_key.in_([stored_query_key(q) for q in removed]))
+                    )
+                if added:
+                    await db_session.execute(
+                        insert(StoredQuery).values([
+                            {
+                                "query_key": stored_query_key(query),
+                                "keywords": ",".join(query.keywords) if query.keywords else "",
+                                "location": query.location,
+                                "radius": query.radius,
+                                "salary": query.salary
+                            }
+                            for query in added
+                        ]).on_conflict_do_nothing(index_elements=[StoredQuery.query_key])
                     )
-                    db_session.add(stored_query)
                 await db_session.commit()
-                logger.info(f"Saved {len(self._queries)} queries to database")
+                logger.info(f"Saved {len(added)} and removed {len(removed)} queries in database")
         except Exception as e:
             logger.error(f"Failed to save queries to database: {str(e)}")
+            self._added.update(added - self._removed)
+            self._removed.update(removed - self._added)
 
     async def _ensure_loaded(self) -> None:
         if not self._loaded:
@@ -107,12 +143,24 @@ class AggregatingQueryManager(QueryManager):
                 )
                 self._queries.remove(q)
                 self._queries.add(new_query)
+                self._mark_removed(q)
+                self._mark_added(new_query)
                 return
         self._queries.add(query)
+        self._mark_added(query)
 
     def remove_query(self, query: Query) -> None:
         if query in self._queries:
             self._queries.remove(query)
+            self._mark_removed(query)
+
+    def _mark_added(self, query: Query) -> None:
+        self._removed.discard(query)
+        self._added.add(query)
+
+    def _mark_removed(self, query: Query) -> None:
+        self._added.discard(query)
+        self._removed.add(query)
 
     def get_queries(self) -> Generator[Query, None, None]:
         if not self._loaded:
@@ -131,5 +179,21 @@ class AggregatingQueryManager(QueryManager):
     async def shutdown(self) -> None:
         await self._save_queries_to_db()
 
+    async def save(self) -> None:
+        await self._save_queries_to_db()
+
+    async def reload(self) -> None:
+        """
+        Replaces the queries with the stored ones, keeping changes not saved yet. If loading
+        fails, the current queries are kept.
+        """
+        try:
+            queries = await self._fetch_queries_from_db()
+        except Exception as e:
+            logger.error(f"Failed to reload queries from database, keeping current ones: {str(e)}")
+            return
+        self._queries = (queries - self._removed) | self._added
+        self._loaded = True
+
     async def initialize(self) -> None:
         await self._load_queries_from_db()
@@ -5,6 +5,8 @@ from src.utils.logger import logger
 
 from src.scraping.scraper_registry import get_scraper_registry
 
+from config import settings
+
 _scraping_scheduler = None
 
 def start_scraping_scheduler():
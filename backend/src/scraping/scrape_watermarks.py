@@ -0,0 +1,54 @@
+import hashlib
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import select, func
+from sqlalchemy.dialects.postgresql import insert
+
+from src.db.session import async_session_maker
+from src.db.schemas.scrape_watermark import ScrapeWatermark
+from src.models.query import Query
+from src.utils.logger import logger
+
+
+def query_watermark_key(source: str, query: Query) -> str:
+    """
+    Stable key for a query of one scraping source. Stored queries are replaced when similar
+    ones are merged, so watermarks are keyed by the query fields rather than a row id;
+    keyword order does not matter.
+    """
+    parts = (source, ",".join(sorted(query.keywords)), query.location or "", query.radius or "", str(query.salary or ""))
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def as_utc(value: datetime) -> datetime:
+    """Treats naive timestamps, as returned by some job boards, as UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+async def get_watermark(key: str) -> Optional[datetime]:
+    try:
+        async with async_session_maker() as db_session:
+            result = await db_session.execute(
+                select(ScrapeWatermark.watermark).filter(ScrapeWatermark.key == key)
+            )
+            return result.scalar_one_or_none()
+    except Exception as e:
+        logger.error(f"Failed to load scrape watermark, fetching all pages: {str(e)}")
+        return None
+
+
+async def set_watermark(key: str, source: str, watermark: datetime) -> None:
+    """Stores the watermark, never moving an existing one backwards."""
+    statement = insert(ScrapeWatermark).values(key=key, source=source, watermark=as_utc(watermark))
+    statement = statement.on_conflict_do_update(
+        index_elements=[ScrapeWatermark.key],
+        set_={"watermark": statement.excluded.watermark, "updated_at": func.now()},
+        where=ScrapeWatermark.watermark < statement.excluded.watermark
+    )
+    try:
+        async with async_session_maker() as db_session:
+            await db_session.execute(statement)
+            await db_session.commit()
+    except Exception as e:
+        logger.error(f"Failed to store scrape watermark: {str(e)}")
@@ -6,28 +6,72 @@ from src.processing.listing_processor import ListingProcessor
 from src.scraping.query_managers.query_manager import QueryManager
 from src.scraping.query_managers.simple_query_manager import SimpleQueryManager
 from src.scraping.scrapers.jooble_scraper import JoobleScraper
+from src.scraping.scrapers.listing_scraper import ListingScraper
+from src.scraping.scrapers.replay_scraper import ReplayScraper
+from src.scraping.scrapers.synthetic_scraper import SyntheticScraper, SyntheticListingGenerator
 from src.scraping.scraping_manager import ScrapingManager
 from src.utils.logger import logger
+from src.utils.rate_limiter import TokenBucket
+
+SOURCE_JOOBLE = "jooble"
+SOURCE_REPLAY = "replay"
+SOURCE_SYNTHETIC = "synthetic"
+SOURCES = (SOURCE_JOOBLE, SOURCE_REPLAY, SOURCE_SYNTHETIC)
 
 _scraper_registry: Dict[str, ScrapingManager] = None
 _query_manager: QueryManager = None
 
+def create_scraper(source: str, rate_limiter: TokenBucket = None) -> ListingScraper:
+    """
+    Creates the scraper for a listing source: the live Jooble API, recorded Jooble responses
+    replayed from disk, or generated listings for offline benchmarking.
+    """
+    if source == SOURCE_JOOBLE:
+        return JoobleScraper(
+            settings.JOOBLE_API_KEY,
+            settings.JOOBLE_HOST,
+            rate_limiter=rate_limiter,
+            use_watermarks=settings.JOOBLE_USE_WATERMARKS,
+            record_dir=settings.JOOBLE_RECORD_DIR
+        )
+    if source == SOURCE_REPLAY:
+        return ReplayScraper(
+            settings.REPLAY_DIR,
+            pages_per_query=settings.REPLAY_PAGES_PER_QUERY,
+            latency_ms=settings.REPLAY_LATENCY_MS,
+            jitter_ms=settings.REPLAY_JITTER_MS,
+            error_rate=settings.REPLAY_ERROR_RATE,
+            seed=settings.SYNTHETIC_SEED
+        )
+    if source == SOURCE_SYNTHETIC:
+        return SyntheticScraper(
+            settings.SYNTHETIC_LISTINGS_PER_QUERY,
+            settings.SYNTHETIC_TOTAL_LISTINGS,
+            SyntheticListingGenerator(
+                seed=settings.SYNTHETIC_SEED,
+                vocabulary_size=settings.SYNTHETIC_VOCABULARY_SIZE
+            )
+        )
+    raise ValueError(f"Unknown scraper source '{source}', expected one of: {', '.join(SOURCES)}")
+
+
 def init_scraper_registry(query_manager: QueryManager = None):
     if query_manager is None:
         query_manager = SimpleQueryManager()
 
     global _scraper_registry
-    jooble = JoobleScraper(
-        settings.JOOBLE_API_KEY,
-        settings.JOOBLE_HOST
-    )
+    rate_limiter = None
+    if settings.SCRAPER_SOURCE == SOURCE_JOOBLE:
+        rate_limiter = TokenBucket(settings.JOOBLE_REQUESTS_PER_SECOND, settings.JOOBLE_BURST)
+    scraper = create_scraper(settings.SCRAPER_SOURCE, rate_limiter)
     listing_processor = ListingProcessor()
 
     _scraper_registry = {}
-    _scraper_registry["jooble"] = ScrapingManager(
-        scraper=jooble,
+    _scraper_registry[settings.SCRAPER_SOURCE] = ScrapingManager(
+        scraper=scraper,
         query_manager=query_manager,
-        listing_processor=listing_processor
+        listing_processor=listing_processor,
+        rate_limiter=rate_limiter
     )
 
 
@@ -82,3 +126,12 @@ async def shutdown_query_manager():
             logger.info("Query manager shutdown successfully")
         except Exception as e:
             logger.error(f"Failed to shutdown query manager: {str(e)}")
+
+
+async def save_query_manager():
+    global _query_manager
+    if _query_manager and hasattr(_query_manager, 'save'):
+        try:
+            await _query_manager.save()
+        except Exception as e:
+            logger.error(f"Failed to save queries: {str(e)}")
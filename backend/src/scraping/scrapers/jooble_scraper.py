@@ -1,5 +1,11 @@
+import asyncio
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
 import httpx
-from typing import List
 
 from src.scraping.scrapers.listing_scraper import ListingScraper
 from src.models.listing.listing import Listing
@@ -7,17 +13,89 @@ from src.models.query import Query
 from src.utils.logger import logger
 from src.utils.salary import parse_salary_range
 from src.utils.processing_utils import clean_html_text
+from src.utils.resilient_http import ResilientHttpClient
+from src.utils.rate_limiter import TokenBucket
+from src.scraping.scrape_watermarks import query_watermark_key, get_watermark, set_watermark, as_utc
 from dateutil import parser
 
 from config import settings
 
+
+def parse_jooble_response(data: dict) -> List[Listing]:
+    """Parses a Jooble search response into listings; also used to replay recorded responses."""
+    listings = []
+    for job in data.get("jobs", []):
+        salary_min, salary_max, currency = parse_salary_range(job.get("salary"))
+        
+        # Handle date parsing safely
+        updated_date = job.get("updated", "")
+        try:
+            created_at = parser.isoparse(updated_date) if updated_date else None
+            updated_at = parser.isoparse(updated_date) if updated_date else None
+        except (ValueError, TypeError):
+            created_at = None
+            updated_at = None
+        
+        listings.append(Listing(
+            id=None, # ID will be set by the database
+            internal_id=str(job.get("id")),
+            title=job.get("title", ""),
+            company=job.get("company", ""),
+            location=job.get("location", ""),
+            description=clean_html_text(job.get("snippet", "")),
+            salary_min=salary_min,
+            salary_max=salary_max,
+            currency=currency,
+            remote="remote" in job.get("location", "").lower(),
+            created_at=created_at,
+            updated_at=updated_at,
+            link=job.get("link", "")
+        ))
+    return listings
+
+
 class JoobleScraper(ListingScraper):
+    """
+    Fetches up to max_results listings per query, page_size per request. The first page is
+    requested alone, since it tells whether more pages exist; the rest are requested
+    page_concurrency at a time. Paging stops at a short page, and, with watermarks enabled,
+    at a page whose listings are all no newer than the newest one seen by the last complete
+    run of the query. A query's watermark only advances in commit_query, once the scraping
+    manager has stored its listings.
+    """
     _api_key: str
     _target_host: str
+    _page_size: int
+    _max_results: int
+    _page_concurrency: int
+    _rate_limiter: Optional[TokenBucket]
+    _use_watermarks: bool
+    _http: ResilientHttpClient
+    _record_dir: Optional[Path]
+    _pending_watermarks: Dict[str, datetime]
 
-    def __init__(self, api_key: str, target_host: str):
+    def __init__(
+        self,
+        api_key: str,
+        target_host: str,
+        page_size: int = None,
+        max_results: int = None,
+        page_concurrency: int = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        use_watermarks: bool = False,
+        http: ResilientHttpClient = None,
+        record_dir: str = None
+    ):
         self._api_key = api_key
         self._target_host = target_host
+        self._page_size = max(1, page_size or settings.JOOBLE_PAGE_SIZE)
+        self._max_results = max(1, max_results or settings.JOOBLE_MAX_RESULTS)
+        self._page_concurrency = max(1, page_concurrency or settings.JOOBLE_PAGE_CONCURRENCY)
+        self._rate_limiter = rate_limiter
+        self._use_watermarks = use_watermarks
+        self._http = http or ResilientHttpClient()
+        self._record_dir = Path(record_dir) if record_dir else None
+        self._pending_watermarks = {}
 
     async def execute_query(self, query: Query) -> List[Listing]:
         url = f"{self._target_host}/api/{self._api_key}"
@@ -32,42 +110,90 @@ class JoobleScraper(ListingScraper):
         if query.salary is not None:
             payload["salary"] = query.salary
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(url, json=payload)
-                response.raise_for_status()
-                return self._parse_response(response.json())
-            except (httpx.HTTPError, ValueError) as e:
-                logger.warning(f"Request failed for query {query}: {str(e)}")
-                return []
+        watermark_key = query_watermark_key("jooble", query) if self._use_watermarks else None
+        if watermark_key:
+            # A watermark left by an earlier run that was never committed must not be
+            # committed after this run, which may fail or stop early
+            self._pending_watermarks.pop(watermark_key, None)
+        since = await get_watermark(watermark_key) if watermark_key else None
 
-    def _parse_response(self, data: dict) -> List[Listing]:
-        listings = []
-        for job in data.get("jobs", []):
-            salary_min, salary_max, currency = parse_salary_range(job.get("salary"))
-            
-            # Handle date parsing safely
-            updated_date = job.get("updated", "")
-            try:
-                created_at = parser.isoparse(updated_date) if updated_date else None
-                updated_at = parser.isoparse(updated_date) if updated_date else None
-            except (ValueError, TypeError):
-                created_at = None
-                updated_at = None
-            
-            listings.append(Listing(
-                id=None, # ID will be set by the database
-                internal_id=str(job.get("id")),
-                title=job.get("title", ""),
-                company=job.get("company", ""),
-                location=job.get("location", ""),
-                description=clean_html_text(job.get("snippet", "")),
-                salary_min=salary_min,
-                salary_max=salary_max,
-                currency=currency,
-                remote="remote" in job.get("location", "").lower(),
-                created_at=created_at,
-                updated_at=updated_at,
-                link=job.get("link", "")
-            ))
+        first_page = await self._fetch_page(url, payload, 1, query)
+        if first_page is None:
+            return []
+        total_count, listings = first_page
+        pages = [listings]
+        page_count = math.ceil(min(self._max_results, total_count) / self._page_size)
+        complete = True
+        next_page = 2
+        while not self._is_last_page(pages[-1], since) and next_page <= page_count:
+            window = range(next_page, min(page_count, next_page + self._page_concurrency - 1) + 1)
+            # The scraping manager paces the first request of each query; later pages are paced here
+            if self._rate_limiter is not None:
+                for _ in window:
+                    await self._rate_limiter.acquire()
+            results = await asyncio.gather(*(self._fetch_page(url, payload, page, query) for page in window))
+            for result in results:
+                if result is None:
+                    complete = False
+                    break
+                pages.append(result[1])
+                if self._is_last_page(result[1], since):
+                    break
+            if not complete:
+                break
+            next_page += len(window)
+
+        by_link = {}
+        for listing in (listing for page in pages for listing in page):
+            by_link.setdefault(listing.link or listing.internal_id, listing)
+        listings = list(by_link.values())[:self._max_results]
+
+        timestamps = [as_utc(listing.updated_at) for listing in listings if listing.updated_at is not None]
+        if watermark_key and complete and timestamps:
+            self._pending_watermarks[watermark_key] = max(timestamps)
+        logger.debug(f"Fetched {len(listings)} listings in {len(pages)} pages for query {query}")
         return listings
+
+    async def commit_query(self, query: Query) -> None:
+        if not self._use_watermarks:
+            return
+        watermark_key = query_watermark_key("jooble", query)
+        watermark = self._pending_watermarks.pop(watermark_key, None)
+        if watermark is not None:
+            await set_watermark(watermark_key, "jooble", watermark)
+
+    async def _fetch_page(self, url: str, payload: dict, page: int, query: Query) -> Optional[Tuple[int, List[Listing]]]:
+        """Returns the total result count and the page's listings, or None if the request failed."""
+        try:
+            response = await self._http.post(
+                url,
+                json={**payload, "page": str(page), "ResultOnPage": str(self._page_size)}
+            )
+            response.raise_for_status()
+            data = response.json()
+            if self._record_dir is not None:
+                self._record(data)
+            return int(data.get("totalCount") or 0), self._parse_response(data)
+        except (httpx.HTTPError, ValueError) as e:
+            logger.warning(f"Request for page {page} failed for query {query}: {str(e)}")
+            return None
+
+    def _record(self, data: dict) -> None:
+        """Saves a raw response so that ReplayScraper can serve it later."""
+        try:
+            self._record_dir.mkdir(parents=True, exist_ok=True)
+            path = self._record_dir / f"{datetime.now().strftime('%Y%m%d%H%M%S%f')}.json"
+            path.write_text(json.dumps(data), encoding="utf-8")
+        except OSError as e:
+            logger.warning(f"Failed to record response: {str(e)}")
+
+    def _is_last_page(self, listings: List[Listing], since: Optional[datetime]) -> bool:
+        if len(listings) < self._page_size:
+            return True
+        return since is not None and all(
+            listing.updated_at is not None and as_utc(listing.updated_at) <= since
+            for listing in listings
+        )
+
+    def _parse_response(self, data: dict) -> List[Listing]:
+        return parse_jooble_response(data)
@@ -8,3 +8,6 @@ class ListingScraper(ABC):
     @abstractmethod
     async def execute_query(self, query: Query) -> List[Listing]:
         raise NotImplementedError
+
+    async def commit_query(self, query: Query) -> None:
+        """Called once the listings returned for the query are stored, e.g. to advance a watermark."""
@@ -0,0 +1,74 @@
+import asyncio
+import json
+import random
+from pathlib import Path
+from typing import List, Optional
+
+from src.scraping.scrapers.listing_scraper import ListingScraper
+from src.scraping.scrapers.jooble_scraper import parse_jooble_response
+from src.models.listing.listing import Listing
+from src.models.query import Query
+from src.utils.logger import logger
+
+
+class ReplayScraper(ListingScraper):
+    """
+    Serves recorded Jooble search responses (*.json files, one response per file) from a
+    directory instead of calling the API. Each query is answered with the next
+    pages_per_query recordings in file name order, wrapping around at the end. Every page
+    waits latency_ms plus up to jitter_ms, and fails with probability error_rate, in which
+    case the query returns no listings as a failed Jooble request would.
+    """
+    _directory: Path
+    _pages_per_query: int
+    _latency: float
+    _jitter: float
+    _error_rate: float
+    _random: random.Random
+    _files: Optional[List[Path]]
+    _cursor: int
+
+    def __init__(
+        self,
+        directory: str,
+        pages_per_query: int = 1,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = None
+    ):
+        self._directory = Path(directory)
+        self._pages_per_query = max(1, pages_per_query)
+        self._latency = max(0.0, latency_ms) / 1000.0
+        self._jitter = max(0.0, jitter_ms) / 1000.0
+        self._error_rate = min(1.0, max(0.0, error_rate))
+        self._random = random.Random(seed)
+        self._files = None
+        self._cursor = 0
+
+    def _recordings(self) -> List[Path]:
+        if self._files is None:
+            self._files = sorted(self._directory.glob("*.json"))
+            logger.info(f"Replaying {len(self._files)} recorded responses from {self._directory}")
+        return self._files
+
+    async def execute_query(self, query: Query) -> List[Listing]:
+        files = self._recordings()
+        if not files:
+            logger.warning(f"No recorded responses in {self._directory}")
+            return []
+        listings = []
+        for _ in range(self._pages_per_query):
+            path = files[self._cursor % len(files)]
+            self._cursor += 1
+            await asyncio.sleep(self._latency + self._random.uniform(0, self._jitter))
+            if self._random.random() < self._error_rate:
+                logger.warning(f"Injected error replaying {path.name} for query {query}")
+                return []
+            try:
+                data = await asyncio.to_thread(lambda: json.loads(path.read_text(encoding="utf-8")))
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to read recorded response {path.name}: {str(e)}")
+                return []
+            listings.extend(parse_jooble_response(data))
+        return listings
@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import itertools
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Sequence
+
+from src.scraping.scrapers.listing_scraper import ListingScraper
+from src.scraping.scrapers.jooble_scraper import parse_jooble_response
+from src.models.listing.listing import Listing
+from src.models.query import Query
+
+SKILLS = (
+    "python", "java", "javascript", "typescript", "sql", "aws", "docker", "kubernetes", "react",
+    "django", "fastapi", "spring", "node.js", "postgresql", "linux", "git", "terraform", "go",
+    "c++", "c#", ".net", "azure", "gcp", "kafka", "spark", "airflow", "pandas", "pytorch",
+    "tensorflow", "machine learning", "data engineering", "microservices", "rest api", "graphql",
+    "redis", "mongodb", "elasticsearch", "ci/cd", "jenkins", "ansible", "rust", "scala", "kotlin",
+    "swift", "angular", "vue", "html", "css", "figma", "scrum", "jira", "tableau", "power bi",
+    "excel", "sap", "salesforce", "networking", "security", "penetration testing", "embedded",
+)
+ROLES = (
+    "Software Engineer", "Backend Developer", "Frontend Developer", "Full Stack Developer",
+    "Data Engineer", "Data Scientist", "DevOps Engineer", "Machine Learning Engineer",
+    "QA Engineer", "Mobile Developer", "Site Reliability Engineer", "Security Engineer",
+    "Product Manager", "Business Analyst", "Cloud Architect",
+)
+SENIORITIES = ("Junior", "Mid", "Senior", "Lead", "Principal")
+LOCATIONS = (
+    "Warsaw, Poland", "Krakow, Poland", "Wroclaw, Poland", "Berlin, Germany", "London, UK",
+    "Amsterdam, Netherlands", "New York, NY", "San Francisco, CA", "Remote",
+)
+COMPANY_PREFIXES = ("Tech", "Data", "Cloud", "Soft", "Net", "Quantum", "Blue", "Bright", "Nova", "Apex")
+COMPANY_SUFFIXES = ("Corp", "Labs", "Systems", "Solutions", "Works", "Group", "Software", "AI")
+SENTENCES = (
+    "We are looking for a {role} experienced with {skills}.",
+    "You will build and operate services using {skills}.",
+    "Strong knowledge of {skills} is required.",
+    "Experience with {skills} is a plus.",
+    "Our team works daily with {skills}.",
+)
+
+
+def zipf_cum_weights(size: int, exponent: float) -> List[float]:
+    """Cumulative Zipf weights for ranks 1..size, for use with random.choices."""
+    return list(itertools.accumulate(1.0 / rank ** exponent for rank in range(1, size + 1)))
+
+
+def keywords_slug(keywords: Sequence[str]) -> str:
+    return hashlib.sha256(",".join(keywords).encode("utf-8")).hexdigest()[:12]
+
+
+class SyntheticListingGenerator:
+    """
+    Deterministically generates realistic Jooble-style job postings. Skills, companies and
+    locations are drawn from Zipf distributions, so a few skills and companies dominate as in
+    real data; the vocabulary is padded with rare generated skills up to vocabulary_size.
+    Posting n depends only on the seed, reference_time and the keywords it is seeded with,
+    not on how postings are batched; postings seeded with different keywords get different
+    links. Update times fall within the 30 days before reference_time.
+    """
+    _seed: int
+    _skills: Sequence[str]
+    _skill_weights: List[float]
+    _companies: Sequence[str]
+    _company_weights: List[float]
+    _location_weights: List[float]
+    _now: datetime
+
+    def __init__(
+        self,
+        seed: int = 0,
+        vocabulary_size: int = 500,
+        company_count: int = 2_000,
+        zipf_exponent: float = 1.1,
+        reference_time: datetime = None
+    ):
+        self._seed = seed
+        self._skills = list(SKILLS) + [f"skill-{i}" for i in range(max(0, vocabulary_size - len(SKILLS)))]
+        self._skill_weights = zipf_cum_weights(len(self._skills), zipf_exponent)
+        self._companies = [
+            f"{prefix}{suffix} {i}" if i else f"{prefix}{suffix}"
+            for i, (prefix, suffix) in zip(
+                range(company_count),
+                itertools.cycle(itertools.product(COMPANY_PREFIXES, COMPANY_SUFFIXES))
+            )
+        ]
+        self._company_weights = zipf_cum_weights(len(self._companies), zipf_exponent)
+        self._location_weights = zipf_cum_weights(len(LOCATIONS), 0.8)
+        self._now = reference_time or datetime.now(timezone.utc).replace(microsecond=0)
+
+    def job(self, n: int, keywords: Sequence[str] = ()) -> dict:
+        rng = random.Random(f"{self._seed}:{n}")
+        role = f"{rng.choice(SENIORITIES)} {rng.choice(ROLES)}"
+        skills = list(dict.fromkeys(
+            list(keywords) + rng.choices(self._skills, cum_weights=self._skill_weights, k=rng.randint(4, 10))
+        ))
+        sentences = [
+            rng.choice(SENTENCES).format(role=role, skills=", ".join(skills[i:i + 3]))
+            for i in range(0, len(skills), 3)
+        ]
+        salary_min = rng.randrange(6_000, 30_000, 500)
+        salary = f"{salary_min:,} PLN - {salary_min + rng.randrange(1_000, 10_000, 500):,} PLN" if rng.random() < 0.6 else ""
+        updated = self._now - timedelta(minutes=rng.randrange(60 * 24 * 30))
+        path = f"{self._seed}/{n}"
+        if keywords:
+            path = f"{self._seed}/{keywords_slug(keywords)}/{n}"
+        return {
+            "id": f"synthetic-{path.replace('/', '-')}",
+            "title": role,
+            "company": rng.choices(self._companies, cum_weights=self._company_weights)[0],
+            "location": rng.choices(LOCATIONS, cum_weights=self._location_weights)[0],
+            "snippet": " ".join(sentences),
+            "salary": salary,
+            "updated": updated.isoformat(),
+            "link": f"https://synthetic.example.com/jobs/{path}",
+        }
+
+    def jobs(self, start: int, count: int, keywords: Sequence[str] = ()) -> Iterator[dict]:
+        for n in range(start, start + count):
+            yield self.job(n, keywords)
+
+
+class SyntheticScraper(ListingScraper):
+    """
+    Serves generated listings instead of calling a job board: each call returns the query's
+    next listings_per_query postings, seeded with its keywords. Every query walks its own
+    sequence, which starts over after total_listings postings, so later runs return the same
+    links with the same content and exercise deduplication of known listings.
+    """
+    _generator: SyntheticListingGenerator
+    _listings_per_query: int
+    _total_listings: int
+    _cursors: Dict[Query, int]
+
+    def __init__(
+        self,
+        listings_per_query: int,
+        total_listings: int,
+        generator: SyntheticListingGenerator = None
+    ):
+        self._generator = generator or SyntheticListingGenerator()
+        self._listings_per_query = max(1, listings_per_query)
+        self._total_listings = max(self._listings_per_query, total_listings)
+        self._cursors = {}
+
+    async def execute_query(self, query: Query) -> List[Listing]:
+        start = self._cursors.get(query, 0)
+        self._cursors[query] = (start + self._listings_per_query) % self._total_listings
+        jobs = [
+            self._generator.job(n % self._total_listings, query.keywords)
+            for n in range(start, start + self._listings_per_query)
+        ]
+        # Parsing dominates for large batches, so keep it off the event loop
+        return await asyncio.to_thread(parse_jooble_response, {"jobs": jobs})
@@ -1,44 +1,121 @@
-from itertools import chain
-from typing import List, Callable
+from typing import Awaitable, List, Callable, Optional, Tuple
 
+from src.models.listing.listing import Listing
 from src.models.listing.listing_keyword_data import ListingKeywordData
 from src.models.query import Query
+from src.scraping.pipeline import PipelineStage, run_pipeline
 from src.scraping.query_managers.query_manager import QueryManager
 from src.scraping.scrapers.listing_scraper import ListingScraper
 
 from src.processing.listing_processor import ListingProcessor
 
 from src.utils.logger import logger
+from src.utils.rate_limiter import TokenBucket
+
+from config import settings
 
 class ScrapingManager:
     _scraper: ListingScraper
     _query_manager: QueryManager
     _listing_processor: ListingProcessor
+    _rate_limiter: Optional[TokenBucket]
+    _query_concurrency: int
+    _listing_filters: List[Callable[[List[Listing]], Awaitable[List[Listing]]]]
+    _batch_callbacks: List[Callable[[List[ListingKeywordData]], List[ListingKeywordData]]]
     _listing_callbacks: List[Callable[[ListingKeywordData], ListingKeywordData]]
 
     def __init__(
         self,
         scraper: ListingScraper,
         query_manager: QueryManager,
-        listing_processor: ListingProcessor
+        listing_processor: ListingProcessor,
+        rate_limiter: Optional[TokenBucket] = None,
+        query_concurrency: int = None
     ):
         self._scraper = scraper
         self._query_manager = query_manager
         self._listing_processor = listing_processor
+        self._rate_limiter = rate_limiter
+        self._query_concurrency = max(1, query_concurrency or settings.SCRAPING_QUERY_CONCURRENCY)
+        self._listing_filters = []
+        self._batch_callbacks = []
         self._listing_callbacks = []
 
-    async def run_scraper(self) -> None:    
-        async def process_query(query: Query) -> List[ListingKeywordData]:
-            listings = await self._scraper.execute_query(query)
+    @property
+    def listing_processor(self) -> ListingProcessor:
+        return self._listing_processor
+
+    async def run_scraper(self) -> None:
+        """
+        Streams each query's listings through fetch, dedup, keyword extraction, embedding,
+        persistence and match enqueueing, so the first listings are matched while later
+        queries are still being scraped. A query is committed to its scraper only once its
+        listings are stored or all turned out to be duplicates.
+        """
+        if hasattr(self._query_manager, 'reload'):
+            # Queries may have been added by resume workers in other processes
+            await self._query_manager.reload()
+
+        stages = [
+            PipelineStage("fetch", self._fetch, self._query_concurrency),
+            PipelineStage("dedup", self._dedup, settings.PIPELINE_DEDUP_CONCURRENCY),
+            PipelineStage("keywords", self._extract_keywords, settings.PIPELINE_KEYWORD_CONCURRENCY),
+            PipelineStage("embed", self._embed, settings.PIPELINE_EMBED_CONCURRENCY),
+            PipelineStage("persist", self._persist, settings.PIPELINE_PERSIST_CONCURRENCY),
+            PipelineStage("match", self._match, settings.PIPELINE_MATCH_CONCURRENCY),
+        ]
+        # Snapshot the queries: resume processing may add some while the pipeline runs
+        emitted = await run_pipeline(
+            list(self._query_manager.get_queries()),
+            stages,
+            channel_size=settings.PIPELINE_CHANNEL_SIZE
+        )
+        logger.info(f"Scraping pipeline finished: {emitted}")
+
+    async def _fetch(self, query: Query) -> Tuple[Query, List[Listing]]:
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire()
+        return query, await self._scraper.execute_query(query)
+
+    async def _dedup(self, fetched: Tuple[Query, List[Listing]]) -> Optional[Tuple[Query, List[Listing]]]:
+        query, listings = fetched
+        for listing_filter in self._listing_filters:
             if not listings:
+                break
+            listings = await listing_filter(listings)
+        if not listings:
+            # Nothing new to store, so the query's listings are all stored already
+            await self._scraper.commit_query(query)
+            return None
+        return query, listings
+
+    async def _extract_keywords(
+        self,
+        deduped: Tuple[Query, List[Listing]]
+    ) -> Tuple[Query, List[Listing], List[List[str]]]:
+        query, listings = deduped
+        return query, listings, await self._listing_processor.extract_listing_keywords_async(listings)
+
+    async def _embed(
+        self,
+        extracted: Tuple[Query, List[Listing], List[List[str]]]
+    ) -> Tuple[Query, List[ListingKeywordData]]:
+        query, listings, keyword_lists = extracted
+        return query, await self._listing_processor.embed_listings_async(listings, keyword_lists)
+
+    async def _persist(self, embedded: Tuple[Query, List[ListingKeywordData]]) -> List[ListingKeywordData]:
+        query, listings = embedded
+        for callback in self._batch_callbacks:
+            try:
+                listings = await callback(listings)
+            except Exception as e:
+                logger.error(f"Error in batch callback {callback.__name__}: {str(e)}")
                 return []
-            return self._listing_processor.process_listings(listings)
+        await self._scraper.commit_query(query)
+        return listings
 
-        results = [await process_query(query) for query in self._query_manager.get_queries()]
-        flattened_results = list(chain.from_iterable(results))
-        if not flattened_results:
-            return
-        for listing in flattened_results:
+    async def _match(self, listings: List[ListingKeywordData]) -> List[ListingKeywordData]:
+        for listing in listings:
             current_listing = listing
             for callback in self._listing_callbacks:
                 try:
@@ -48,6 +125,18 @@ class ScrapingManager:
                 except Exception as e:
                     logger.error(f"Error in callback {callback.__name__}: {str(e)}")
                     continue
+        return listings
+
+    def register_listing_filter(self, listing_filter: Callable[[List[Listing]], Awaitable[List[Listing]]]) -> None:
+        """Registers a filter applied to scraped listings before keyword extraction and embedding."""
+        self._listing_filters.append(listing_filter)
+
+    def register_batch_callback(
+        self,
+        callback: Callable[[List[ListingKeywordData]], List[ListingKeywordData]]
+    ) -> None:
+        """Registers a callback run on each batch of processed listings before the per-listing callbacks."""
+        self._batch_callbacks.append(callback)
 
     def register_listing_callback(self, callback: Callable[[ListingKeywordData], ListingKeywordData]) -> None:
         self._listing_callbacks.append(callback)
@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from sqlalchemy import select, delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class CacheStats(BaseModel):
+    """Hit and miss counters of a cache with an in-process tier and a persistent tier."""
+    memory_hits: int
+    persistent_hits: int
+    misses: int
+    memory_entries: int
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.memory_hits + self.persistent_hits + self.misses
+        return (self.memory_hits + self.persistent_hits) / total if total else 0.0
+
+
+async def trim_least_recently_used(db_session: AsyncSession, entry, max_rows: int) -> None:
+    """
+    Deletes all but the max_rows most recently used rows of a cache table mapped by entry,
+    which must have key and last_used_at columns. The caller commits.
+    """
+    stale_keys = select(entry.key).order_by(entry.last_used_at.desc()).offset(max_rows)
+    await db_session.execute(delete(entry).where(entry.key.in_(stale_keys)))
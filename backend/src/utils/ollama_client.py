@@ -0,0 +1,102 @@
+import asyncio
+import threading
+from typing import Optional, Tuple
+
+import httpx
+
+from config import settings
+
+
+class OllamaClient:
+    """
+    Async client for the Ollama chat API over a pooled HTTP connection. At most max_in_flight
+    requests are sent at once, the rest wait for a slot; each request is cancelled after
+    timeout seconds, measured from when it gets its slot. Cancelling the calling task aborts
+    the request and frees its slot. The connection pool and limiter belong to the event loop
+    they were created on and are recreated for a different loop.
+    """
+    _host: str
+    _max_in_flight: int
+    _timeout: float
+    _client: Optional[httpx.AsyncClient]
+    _semaphore: Optional[asyncio.Semaphore]
+    _loop: Optional[asyncio.AbstractEventLoop]
+
+    def __init__(self, host: str, max_in_flight: int, timeout: float):
+        self._host = host.rstrip("/")
+        self._max_in_flight = max(1, max_in_flight)
+        self._timeout = timeout
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+
+    def _connection(self) -> Tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self._host,
+                timeout=self._timeout,
+                limits=httpx.Limits(
+                    max_connections=self._max_in_flight,
+                    max_keepalive_connections=self._max_in_flight
+                )
+            )
+            self._semaphore = asyncio.Semaphore(self._max_in_flight)
+            self._loop = loop
+        return self._client, self._semaphore
+
+    async def chat(
+        self,
+        prompt: str,
+        model: str,
+        temperature: float = 0.2,
+        response_format: str = None,
+        max_tokens: int = None
+    ) -> str:
+        client, semaphore = self._connection()
+        payload = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": False,
+            "options": {
+                "temperature": temperature,
+                "num_ctx": settings.OLLAMA_CONTEXT_SIZE,
+                "num_predict": max_tokens or settings.OLLAMA_MAX_TOKENS,
+            },
+        }
+        if response_format:
+            payload["format"] = response_format
+        async with semaphore:
+            response = await asyncio.wait_for(client.post("/api/chat", json=payload), timeout=self._timeout)
+        response.raise_for_status()
+        data = response.json()
+        if data.get("error"):
+            raise RuntimeError(f"Ollama error: {data['error']}")
+        return data["message"]["content"].strip()
+
+    async def close(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+        self._semaphore = None
+        self._loop = None
+
+
+_ollama_client = None
+_mutex = threading.Lock()
+
+def get_ollama_client() -> OllamaClient:
+    global _ollama_client
+    with _mutex:
+        if _ollama_client is None:
+            _ollama_client = OllamaClient(
+                host=settings.OLLAMA_HOST,
+                max_in_flight=settings.OLLAMA_MAX_IN_FLIGHT,
+                timeout=settings.OLLAMA_TIMEOUT
+            )
+        return _ollama_client
+
+
+async def close_ollama_client() -> None:
+    if _ollama_client is not None:
+        await _ollama_client.close()
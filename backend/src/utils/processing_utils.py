@@ -1,10 +1,15 @@
 import re
 from html import unescape
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
-import ollama
+import httpx
+import numpy as np
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from src.utils.logger import logger
+from src.utils.resilient_http import RETRYABLE_STATUS_CODES, CircuitOpenError
+from src.utils.ollama_client import get_ollama_client
 from config import settings
 
 
@@ -19,42 +24,76 @@ def clean_html_text(text: str) -> str:
     return text
 
 
-_ollama_executor = ThreadPoolExecutor(
-    max_workers=settings.OLLAMA_MAX_WORKERS, 
-    thread_name_prefix="ollama_"
-)
-
-def ollama_api_call(prompt: str, model: str = None, temperature: float = 0.2) -> str:
-    if not settings.OLLAMA_ENABLED:
-        raise RuntimeError("Ollama is disabled")
-        
-    response = ollama.chat(
-        model=model or settings.OLLAMA_MODEL,
-        messages=[
-            {'role': 'user', 'content': prompt}
-        ],
-        options={
-            'temperature': temperature,
-            'num_ctx': settings.OLLAMA_CONTEXT_SIZE,
-            'num_predict': settings.OLLAMA_MAX_TOKENS,
-        }
-    )
-    return response['message']['content'].strip()
-
-async def ollama_api_call_async(prompt: str, model: str = None, temperature: float = 0.2) -> Optional[str]:
+async def ollama_api_call_async(
+    prompt: str,
+    model: str = None,
+    temperature: float = 0.2,
+    template_version: str = None,
+    response_format: str = None,
+    max_tokens: int = None
+) -> Optional[str]:
+    """
+    Sends the prompt to Ollama. Responses to prompts built from a versioned template are
+    cached by model, template_version, temperature and prompt. response_format="json" makes
+    the model answer with valid JSON; max_tokens overrides OLLAMA_MAX_TOKENS.
+    """
     if not settings.OLLAMA_ENABLED:
         return None
+    model = model or settings.OLLAMA_MODEL
+    cache = None
+    if template_version is not None and settings.LLM_CACHE_ENABLED:
+        from src.processing.llm_cache import get_llm_cache
+        cache = get_llm_cache()
+        cached = await cache.get(model, template_version, temperature, prompt)
+        if cached is not None:
+            return cached
     try:
-        loop = asyncio.get_event_loop()
-        result = await loop.run_in_executor(
-            _ollama_executor,
-            lambda: ollama_api_call(prompt, model, temperature)
+        response = await get_ollama_client().chat(
+            prompt,
+            model,
+            temperature,
+            response_format=response_format,
+            max_tokens=max_tokens
         )
-        return result
+    except asyncio.CancelledError:
+        raise
     except Exception as e:
-        import logging
-        logging.error(f"Ollama API call failed: {str(e)}")
+        logger.error(f"Ollama API call failed: {str(e) or type(e).__name__}")
         raise e
+    if cache is not None and response:
+        await cache.put(model, template_version, temperature, prompt, response)
+    return response
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    True for failures worth retrying later: timeouts, lost connections and busy or failing
+    servers, whether reaching Ollama or the database.
+    """
+    if isinstance(error, httpx.HTTPStatusError):
+        return error.response.status_code in RETRYABLE_STATUS_CODES
+    if isinstance(error, (httpx.TransportError, CircuitOpenError)):
+        return True
+    if isinstance(error, (OperationalError, InterfaceError)):
+        return True
+    if isinstance(error, DBAPIError):
+        return error.connection_invalidated
+    return isinstance(error, (asyncio.TimeoutError, TimeoutError, ConnectionError))
+
+
+def vector_to_list(vector) -> list[float]:
+    """Converts a pgvector column value (a numpy array) to a list of floats."""
+    if vector is None:
+        return []
+    if hasattr(vector, "tolist"):
+        return vector.tolist()
+    return [float(x) for x in vector]
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalizes each row; zero rows stay zero."""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
 
 
 def kw_text_to_list(text: str) -> list[str]:
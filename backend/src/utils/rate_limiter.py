@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter for coroutines: allows bursts of up to capacity requests and a
+    sustained rate of rate requests per second. acquire() waits until a token is available.
+    """
+    _rate: float
+    _capacity: float
+    _tokens: float
+    _updated_at: float
+    _lock: asyncio.Lock
+
+    def __init__(self, rate: float, capacity: float = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self._rate = rate
+        self._capacity = max(1.0, capacity if capacity is not None else rate)
+        self._tokens = self._capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated_at) * self._rate)
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= 1
@@ -0,0 +1,257 @@
+import asyncio
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Sequence
+
+import httpx
+
+from src.utils.http_client import get_http_client
+from src.utils.logger import logger
+
+from config import settings
+
+RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class CircuitOpenError(httpx.HTTPError):
+    """Raised instead of sending a request while the host's circuit breaker is open."""
+
+
+class Histogram:
+    """Cumulative histogram with fixed upper bounds, in the style of Prometheus."""
+    _bounds: Sequence[float]
+    _counts: List[int]
+    _count: int
+    _sum: float
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self._bounds = tuple(sorted(bounds))
+        self._counts = [0] * len(self._bounds)
+        self._count = 0
+        self._sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self._bounds):
+            if value <= bound:
+                self._counts[i] += 1
+        self._count += 1
+        self._sum += value
+
+    def snapshot(self) -> dict:
+        buckets = {str(bound): count for bound, count in zip(self._bounds, self._counts)}
+        buckets["+Inf"] = self._count
+        return {"buckets": buckets, "count": self._count, "sum": round(self._sum, 6)}
+
+
+class HttpMetrics:
+    """Per-host request latency histograms, error counts by kind and retry counts."""
+    _latency: Dict[str, Histogram]
+    _errors: Dict[str, Dict[str, int]]
+    _retries: Dict[str, int]
+    _lock: threading.Lock
+
+    def __init__(self):
+        self._latency = {}
+        self._errors = {}
+        self._retries = {}
+        self._lock = threading.Lock()
+
+    def observe_latency(self, host: str, seconds: float) -> None:
+        with self._lock:
+            self._latency.setdefault(host, Histogram()).observe(seconds)
+
+    def count_error(self, host: str, kind: str) -> None:
+        with self._lock:
+            errors = self._errors.setdefault(host, {})
+            errors[kind] = errors.get(kind, 0) + 1
+
+    def count_retry(self, host: str) -> None:
+        with self._lock:
+            self._retries[host] = self._retries.get(host, 0) + 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            hosts = set(self._latency) | set(self._errors) | set(self._retries)
+            return {
+                host: {
+                    "latency_seconds": self._latency[host].snapshot() if host in self._latency else None,
+                    "errors": dict(self._errors.get(host, {})),
+                    "retries": self._retries.get(host, 0)
+                }
+                for host in sorted(hosts)
+            }
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures and rejects requests for
+    reset_seconds. After that a single trial request is let through: success closes the
+    circuit, failure opens it again.
+    """
+    _failure_threshold: int
+    _reset_seconds: float
+    _failures: int
+    _opened_at: Optional[float]
+    _trial_in_flight: bool
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self._failure_threshold = max(1, failure_threshold)
+        self._reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None and time.monotonic() - self._opened_at < self._reset_seconds
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self.is_open or self._trial_in_flight:
+            return False
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._opened_at is not None or self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+
+    def release_trial(self) -> None:
+        """Lets another trial through after one ended without a result, e.g. when cancelled."""
+        self._trial_in_flight = False
+
+
+def retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Parses a Retry-After header given either in seconds or as an HTTP date."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class ResilientHttpClient:
+    """
+    Sends requests over the pooled HTTP client with a per-request timeout, retrying transport
+    errors and 429/5xx responses with jittered exponential backoff (or the server's
+    Retry-After, if given), and a circuit breaker per host. Once retries are exhausted the
+    last response is returned, or the last transport error raised, so callers handle
+    failures as before.
+    """
+    _timeout: float
+    _max_retries: int
+    _base_delay: float
+    _max_delay: float
+    _failure_threshold: int
+    _reset_seconds: float
+    _breakers: Dict[str, CircuitBreaker]
+    _metrics: HttpMetrics
+
+    def __init__(
+        self,
+        timeout: float = None,
+        max_retries: int = None,
+        base_delay: float = None,
+        max_delay: float = None,
+        failure_threshold: int = None,
+        reset_seconds: float = None,
+        metrics: HttpMetrics = None
+    ):
+        self._timeout = timeout if timeout is not None else settings.HTTP_REQUEST_TIMEOUT
+        self._max_retries = max(0, max_retries if max_retries is not None else settings.HTTP_MAX_RETRIES)
+        self._base_delay = base_delay if base_delay is not None else settings.HTTP_RETRY_BASE_DELAY
+        self._max_delay = max_delay if max_delay is not None else settings.HTTP_RETRY_MAX_DELAY
+        self._failure_threshold = failure_threshold or settings.HTTP_BREAKER_FAILURES
+        self._reset_seconds = reset_seconds if reset_seconds is not None else settings.HTTP_BREAKER_RESET_SECONDS
+        self._breakers = {}
+        self._metrics = metrics or get_http_metrics()
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        host = httpx.URL(url).host
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(self._failure_threshold, self._reset_seconds)
+        return self._breakers[host]
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self._send("get", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self._send("post", url, **kwargs)
+
+    async def _send(self, method: str, url: str, **kwargs) -> httpx.Response:
+        host = httpx.URL(url).host
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            self._metrics.count_error(host, "circuit_open")
+            raise CircuitOpenError(f"Circuit open for {host}, skipping request")
+        kwargs.setdefault("timeout", self._timeout)
+
+        attempt = 0
+        try:
+            while True:
+                started = time.monotonic()
+                try:
+                    response = await getattr(get_http_client(), method)(url, **kwargs)
+                except httpx.TransportError as e:
+                    self._metrics.observe_latency(host, time.monotonic() - started)
+                    self._metrics.count_error(host, "timeout" if isinstance(e, httpx.TimeoutException) else "transport")
+                    if attempt >= self._max_retries:
+                        breaker.record_failure()
+                        raise
+                    delay = self._backoff(attempt)
+                except Exception:
+                    breaker.record_failure()
+                    raise
+                else:
+                    self._metrics.observe_latency(host, time.monotonic() - started)
+                    if response.status_code not in RETRYABLE_STATUS_CODES:
+                        breaker.record_success()
+                        return response
+                    self._metrics.count_error(host, f"status_{response.status_code}")
+                    if attempt >= self._max_retries:
+                        breaker.record_failure()
+                        return response
+                    retry_after = retry_after_seconds(response)
+                    delay = min(self._max_delay, retry_after) if retry_after is not None else self._backoff(attempt)
+
+                attempt += 1
+                self._metrics.count_retry(host)
+                logger.warning(f"Retrying {method.upper()} {host} in {delay:.2f}s (attempt {attempt} of {self._max_retries})")
+                await asyncio.sleep(delay)
+        except BaseException:
+            # A request cancelled during a half-open trial must not keep the circuit shut
+            breaker.release_trial()
+            raise
+
+    def _backoff(self, attempt: int) -> float:
+        """Full jitter: a random delay up to the exponential backoff for this attempt."""
+        return random.uniform(0, min(self._max_delay, self._base_delay * 2 ** attempt))
+
+
+_http_metrics = None
+_mutex = threading.Lock()
+
+def get_http_metrics() -> HttpMetrics:
+    global _http_metrics
+    with _mutex:
+        if _http_metrics is None:
+            _http_metrics = HttpMetrics()
+        return _http_metrics
@@ -0,0 +1,242 @@
+"""
+Runs the processing pipelines outside the web process.
+
+    python -m src.worker --role resume --role match
+    python -m src.worker --role all
+
+Roles:
+    resume  drain the resume processing job queue and enqueue matches for processed resumes
+    match   drain the matching job queue
+    scrape  run the scraping scheduler and ingest listings
+
+The API process runs the roles in API_WORKER_ROLES itself; set it to an empty string to
+leave all processing to worker processes.
+"""
+import argparse
+import asyncio
+import signal
+from typing import Iterable, Set
+
+from src.utils.logger import logger
+
+from config import settings
+
+ROLE_RESUME = "resume"
+ROLE_MATCH = "match"
+ROLE_SCRAPE = "scrape"
+ROLE_ALL = "all"
+ROLES = (ROLE_RESUME, ROLE_MATCH, ROLE_SCRAPE)
+
+
+def parse_roles(values: Iterable[str]) -> Set[str]:
+    """Parses role names, which may be comma separated; 'all' expands to every role."""
+    roles = set()
+    for value in values:
+        for role in value.split(","):
+            role = role.strip().lower()
+            if not role:
+                continue
+            if role == ROLE_ALL:
+                roles.update(ROLES)
+            elif role in ROLES:
+                roles.add(role)
+            else:
+                raise ValueError(f"Unknown worker role '{role}', expected one of {', '.join(ROLES + (ROLE_ALL,))}")
+    return roles
+
+
+async def setup_query_manager() -> None:
+    from src.scraping.scraper_registry import set_query_manager, initialize_query_manager
+    from src.scraping.query_managers.aggregating_query_manager import AggregatingQueryManager
+
+    set_query_manager(AggregatingQueryManager())
+    await initialize_query_manager()
+
+
+async def setup_matching_queue() -> None:
+    from src.matching.matching_queue import get_matching_queue
+    from src.matching.matching_callbacks import log_match, commit_match_to_db
+    from src.processing.matching_processor import MatchingProcessor
+
+    on_match_callbacks = [
+        log_match,
+        commit_match_to_db
+    ]
+    matching_processor = MatchingProcessor()
+    queue = get_matching_queue(matching_processor)
+    for callback in on_match_callbacks:
+        logger.info(f"Registering callback {callback.__name__} for matching queue")
+        queue.register_on_match_callback(callback)
+    await queue.start()
+    logger.info("Matching queue setup complete with callbacks registered and started.")
+
+
+async def setup_resume_processing_queue() -> None:
+    from src.processing.resume_processing_queue import get_resume_processing_queue
+    from src.processing.resume_processor_callbacks import (
+        update_resume_keywords,
+        generate_query,
+        enqueue_matches
+    )
+
+    resume_callbacks = [
+        update_resume_keywords,
+        generate_query,
+        enqueue_matches
+    ]
+    queue = get_resume_processing_queue()
+    for callback in resume_callbacks:
+        logger.info(f"Registering callback {callback.__name__} for resume processing queue")
+        queue.register_on_processed_callback(callback)
+    await queue.start()
+    logger.info("Resume processing queue setup complete with callbacks registered.")
+
+
+def setup_scrapers() -> None:
+    from src.scraping.scraper_registry import get_scraper_registry
+    from src.scraping.listing_callbacks import (
+        commit_listings,
+        enqueue_matches
+    )
+    from src.scraping.listing_dedup import filter_unseen_listings
+
+    batch_callbacks = [
+        commit_listings
+    ]
+    listing_callbacks = [
+        enqueue_matches
+    ]
+    for name, manager in get_scraper_registry().items():
+        manager.register_listing_filter(filter_unseen_listings)
+        for callback in batch_callbacks:
+            logger.info(f"Registering batch callback {callback.__name__} for scraper {name}")
+            manager.register_batch_callback(callback)
+        for callback in listing_callbacks:
+            logger.info(f"Registering callback {callback.__name__} for scraper {name}")
+            manager.register_listing_callback(callback)
+    logger.info("Scrapers setup complete with listing callbacks registered.")
+
+
+def start_warmup(roles: Set[str]) -> None:
+    from src.processing.model_warmup import start_model_warmup
+    from src.processing.resume_processing_queue import get_resume_processing_queue
+    from src.scraping.scraper_registry import get_scraper_registry
+
+    processors = []
+    if ROLE_RESUME in roles:
+        processors.append(get_resume_processing_queue().resume_processor)
+    if ROLE_SCRAPE in roles:
+        processors.extend(manager.listing_processor for manager in get_scraper_registry().values())
+    if processors:
+        start_model_warmup(processors)
+        logger.info("Model warm-up started in the background.")
+
+
+_listing_index_task = None
+
+def start_listing_index() -> None:
+    from src.matching.listing_index import maintain_listing_index
+
+    global _listing_index_task
+    _listing_index_task = asyncio.create_task(maintain_listing_index())
+    logger.info("Listing index loading started in the background.")
+
+
+async def stop_listing_index() -> None:
+    global _listing_index_task
+    if _listing_index_task is None:
+        return
+    _listing_index_task.cancel()
+    try:
+        await _listing_index_task
+    except asyncio.CancelledError:
+        pass
+    _listing_index_task = None
+
+
+async def start_workers(roles: Set[str]) -> None:
+    if not roles:
+        logger.info("No worker roles to start in this process.")
+        return
+    from src.scraping.scheduler import start_scraping_scheduler
+
+    if ROLE_RESUME in roles or ROLE_SCRAPE in roles:
+        await setup_query_manager()
+    if ROLE_SCRAPE in roles:
+        setup_scrapers()
+    if ROLE_RESUME in roles:
+        await setup_resume_processing_queue()
+    if ROLE_MATCH in roles:
+        await setup_matching_queue()
+    if ROLE_SCRAPE in roles:
+        start_scraping_scheduler()
+    if settings.LISTING_INDEX_ENABLED and ROLE_RESUME in roles:
+        start_listing_index()
+    if settings.MODEL_WARMUP_ENABLED:
+        start_warmup(roles)
+    logger.info(f"Started worker roles: {', '.join(sorted(roles))}")
+
+
+async def stop_workers(roles: Set[str]) -> None:
+    if not roles:
+        return
+    from src.scraping.scheduler import shutdown_scraping_scheduler
+    from src.scraping.scraper_registry import shutdown_query_manager
+    from src.processing.model_warmup import stop_model_warmup
+
+    if ROLE_SCRAPE in roles:
+        from src.utils.http_client import close_http_client
+        shutdown_scraping_scheduler()
+        await close_http_client()
+    await stop_model_warmup()
+    await stop_listing_index()
+    if ROLE_RESUME in roles:
+        from src.processing.resume_processing_queue import get_resume_processing_queue
+        await get_resume_processing_queue().stop()
+    if ROLE_MATCH in roles:
+        from src.matching.matching_queue import get_matching_queue
+        from src.matching.match_writer import get_match_writer
+        await get_matching_queue().stop()
+        await get_match_writer().close()
+    if ROLE_RESUME in roles or ROLE_SCRAPE in roles:
+        from src.processing.inference_executor import shutdown_inference_executor
+        await shutdown_query_manager()
+        shutdown_inference_executor()
+    if roles & {ROLE_RESUME, ROLE_SCRAPE, ROLE_MATCH}:
+        from src.utils.ollama_client import close_ollama_client
+        await close_ollama_client()
+    logger.info(f"Stopped worker roles: {', '.join(sorted(roles))}")
+
+
+async def run(roles: Set[str]) -> None:
+    stop_event = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_event.set)
+    await start_workers(roles)
+    try:
+        await stop_event.wait()
+    finally:
+        await stop_workers(roles)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Run JobScout processing workers.")
+    parser.add_argument(
+        "--role",
+        action="append",
+        default=[],
+        help=f"worker role to run ({', '.join(ROLES)} or {ROLE_ALL}); repeatable or comma separated"
+    )
+    args = parser.parse_args(argv)
+    try:
+        roles = parse_roles(args.role or [ROLE_ALL])
+    except ValueError as e:
+        parser.error(str(e))
+    if not roles:
+        parser.error("no worker roles given")
+    asyncio.run(run(roles))
+
+
+if __name__ == "__main__":
+    main()
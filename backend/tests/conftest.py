@@ -140,4 +140,5 @@ def mock_embedding_model():
     mock = MagicMock()
     # Return numpy array so .tolist() works
     mock.embed_text.return_value = np.array([0.1, 0.2, 0.3, 0.4, 0.5])
+    mock.embed_text_async = AsyncMock(return_value=np.array([0.1, 0.2, 0.3, 0.4, 0.5]))
     return mock
\ No newline at end of file
@@ -0,0 +1,271 @@
+"""
+Unit tests for batched embedding
+"""
+import asyncio
+import pytest
+from unittest.mock import patch, MagicMock, AsyncMock
+import numpy as np
+
+from src.processing.embedding_batcher import EmbeddingBatcher
+from src.processing.listing_processor import ListingProcessor, parse_batch_keywords, OUTPUT_TOKENS_PER_ITEM
+from src.models.listing.listing import Listing
+
+class TestEmbeddingBatcher:
+    """Test micro-batching of concurrent embedding requests."""
+
+    @pytest.fixture
+    def encode(self):
+        """Encoder returning one vector per text, recording batch sizes."""
+        return MagicMock(side_effect=lambda texts: [np.array([float(len(text))]) for text in texts])
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_batch(self, encode):
+        """Test that concurrent callers are encoded with a single call."""
+        batcher = EmbeddingBatcher(encode, max_batch_size=10, max_wait_ms=20)
+
+        results = await asyncio.gather(batcher.embed("a"), batcher.embed("bb"), batcher.embed("ccc"))
+
+        encode.assert_called_once_with(["a", "bb", "ccc"])
+        assert [float(r[0]) for r in results] == [1.0, 2.0, 3.0]
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_immediately(self, encode):
+        """Test that batches are split at max_batch_size."""
+        batcher = EmbeddingBatcher(encode, max_batch_size=2, max_wait_ms=1000)
+
+        results = await asyncio.wait_for(batcher.embed_many(["a", "b", "c", "d"]), timeout=0.5)
+
+        assert len(results) == 4
+        assert encode.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_encode_failure_propagates(self):
+        """Test that every caller in a failed batch receives the error."""
+        batcher = EmbeddingBatcher(MagicMock(side_effect=RuntimeError("boom")), max_wait_ms=1)
+
+        with pytest.raises(RuntimeError, match="boom"):
+            await batcher.embed("a")
+
+class TestListingProcessorBatching:
+    """Test that listing processing embeds a whole batch at once."""
+
+    def test_process_listings_single_encode(self):
+        """Test that process_listings encodes all listings in one call."""
+        with patch('src.processing.listing_processor.Processor.__init__'):
+            processor = ListingProcessor()
+            processor.extract_keywords = MagicMock(return_value=["python", "django"])
+            processor.embed_texts = MagicMock(side_effect=lambda texts: [np.array([0.1, 0.2]) for _ in texts])
+
+            listings = [
+                Listing(title="Dev", company="A", description="Python job", link="https://a"),
+                Listing(title="Dev", company="B", description="Django job", link="https://b"),
+            ]
+            results = processor.process_listings(listings)
+
+            processor.embed_texts.assert_called_once_with(["python, django", "python, django"])
+            assert [r.link for r in results] == ["https://a", "https://b"]
+            assert results[0].embedding == [0.1, 0.2]
+
+    @pytest.mark.asyncio
+    async def test_keyword_extraction_off_event_loop(self):
+        """Test that async keyword extraction runs on the inference executor threads."""
+        import threading
+
+        with patch('src.processing.listing_processor.Processor.__init__'):
+            processor = ListingProcessor()
+            threads = []
+            processor.extract_keywords = MagicMock(
+                side_effect=lambda text, **kwargs: threads.append(threading.current_thread().name) or ["python"]
+            )
+
+            keywords = await processor.extract_keywords_async("Python job", top_n=8)
+
+            assert keywords == ["python"]
+            processor.extract_keywords.assert_called_once_with("Python job", top_n=8)
+            assert threads[0].startswith("inference_")
+
+class TestBatchedListingKeywords:
+    """Test LLM keyword extraction with several listings per prompt."""
+
+    @pytest.fixture
+    def processor(self):
+        with patch('src.processing.listing_processor.Processor.__init__'):
+            processor = ListingProcessor()
+            processor.llm_model_name = "llama3"
+            processor.extract_keywords = MagicMock(return_value=["keybert"])
+            yield processor
+
+    @pytest.fixture
+    def llm_settings(self):
+        with patch('src.processing.listing_processor.settings') as mock_settings:
+            mock_settings.LISTING_LLM_KEYWORDS = True
+            mock_settings.OLLAMA_ENABLED = True
+            mock_settings.OLLAMA_CONTEXT_SIZE = 2048
+            mock_settings.LISTING_LLM_BATCH_MAX_ITEMS = 16
+            yield mock_settings
+
+    def _listings(self, count, description="Python developer"):
+        return [
+            Listing(title="Dev", company="A", description=f"{description} {i}", link=f"https://a/{i}")
+            for i in range(count)
+        ]
+
+    def test_parse_batch_keywords(self):
+        """Test that list and string values are cleaned and unknown numbers are dropped."""
+        response = 'Sure: {"1": ["Python", "Django."], "2": "SQL, Power BI", "3": [], "9": ["go"]}'
+
+        parsed = parse_batch_keywords(response, 3)
+
+        assert parsed == {0: ["python", "django"], 1: ["sql", "power bi"]}
+        assert parse_batch_keywords("not json", 3) == {}
+
+    def test_parse_truncated_batch_keeps_complete_entries(self):
+        """Test that an answer cut off at the token limit keeps the listings it completed."""
+        response = '{"1": ["python", "sql"], "2": "rust, go", "3": ["java", "spr'
+
+        assert parse_batch_keywords(response, 3) == {0: ["python", "sql"], 1: ["rust", "go"]}
+
+    @pytest.mark.asyncio
+    async def test_truncated_batch_retries_only_missing(self, processor, llm_settings):
+        """Test that only listings cut off from a truncated answer get their own prompt."""
+        llm_call = AsyncMock(side_effect=['{"1": ["python"], "2": ["dja', "django"])
+        with patch('src.processing.listing_processor.ollama_api_call_async', llm_call):
+            keywords = await processor.extract_listing_keywords_async(self._listings(2))
+
+        assert keywords == [["python"], ["django"]]
+        assert llm_call.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_one_prompt_for_a_batch(self, processor, llm_settings):
+        """Test that a batch is extracted with one JSON-mode call sized for its items."""
+        llm_call = AsyncMock(return_value='{"1": ["python"], "2": ["django"], "3": ["sql"]}')
+        with patch('src.processing.listing_processor.ollama_api_call_async', llm_call):
+            keywords = await processor.extract_listing_keywords_async(self._listings(3))
+
+        assert keywords == [["python"], ["django"], ["sql"]]
+        llm_call.assert_awaited_once()
+        prompt = llm_call.await_args.args[0]
+        assert "[1] Python developer 0" in prompt and "[3] Python developer 2" in prompt
+        assert llm_call.await_args.kwargs["response_format"] == "json"
+        assert llm_call.await_args.kwargs["max_tokens"] == 3 * OUTPUT_TOKENS_PER_ITEM
+
+    @pytest.mark.asyncio
+    async def test_missing_item_retried_alone(self, processor, llm_settings):
+        """Test that a listing absent from the batched answer gets its own prompt."""
+        llm_call = AsyncMock(side_effect=['{"1": ["python"]}', "rust\ngo"])
+        with patch('src.processing.listing_processor.ollama_api_call_async', llm_call):
+            keywords = await processor.extract_listing_keywords_async(self._listings(2))
+
+        assert keywords == [["python"], ["rust", "go"]]
+        assert llm_call.await_count == 2
+        assert "[1]" not in llm_call.await_args_list[1].args[0]
+
+    @pytest.mark.asyncio
+    async def test_failed_batch_falls_back_to_keybert(self, processor, llm_settings):
+        """Test that a failing batched call falls back to local extraction for every listing."""
+        llm_call = AsyncMock(side_effect=RuntimeError("Ollama down"))
+        with patch('src.processing.listing_processor.ollama_api_call_async', llm_call):
+            keywords = await processor.extract_listing_keywords_async(self._listings(2))
+
+        assert keywords == [["keybert"], ["keybert"]]
+        llm_call.assert_awaited_once()
+
+    def test_batches_fit_context_size(self, processor, llm_settings):
+        """Test that batch sizes follow the context size and the item cap, keeping order."""
+        listings = self._listings(10, description="word " * 200)
+
+        batches = processor._llm_batches(listings)
+        llm_settings.OLLAMA_CONTEXT_SIZE = 8192
+        larger_batches = processor._llm_batches(listings)
+        llm_settings.LISTING_LLM_BATCH_MAX_ITEMS = 4
+        capped_batches = processor._llm_batches(listings)
+
+        assert [listing for batch in batches for listing in batch] == listings
+        assert len(batches) > len(larger_batches)
+        assert max(len(batch) for batch in capped_batches) == 4
+
+    @pytest.mark.asyncio
+    async def test_keybert_when_disabled(self, processor):
+        """Test that listing keywords come from KeyBERT unless LLM keywords are enabled."""
+        llm_call = AsyncMock()
+        with patch('src.processing.listing_processor.ollama_api_call_async', llm_call):
+            keywords = await processor.extract_listing_keywords_async(self._listings(2))
+
+        assert keywords == [["keybert"], ["keybert"]]
+        llm_call.assert_not_awaited()
+
+class TestEmbeddingCache:
+    """Test the content-addressed embedding cache."""
+
+    @pytest.fixture
+    def cache(self):
+        """Memory-only cache."""
+        from src.processing.embedding_cache import EmbeddingCache
+        return EmbeddingCache(memory_entries=2, persistent=False)
+
+    def test_normalize_text(self):
+        """Test that formatting differences normalize to the same text."""
+        from src.processing.embedding_cache import normalize_text
+
+        assert normalize_text("Python,\n  Django ,") == "python, django"
+        assert normalize_text("python, django") == "python, django"
+
+    @pytest.mark.asyncio
+    async def test_hit_and_miss_counters(self, cache):
+        """Test hits, misses and keying by model name."""
+        await cache.put_many("model-a", ["python"], [[0.1, 0.2]])
+
+        hit, miss = await cache.get_many("model-a", ["python", "java"])
+        other_model = await cache.get_many("model-b", ["python"])
+
+        assert np.allclose(hit, [0.1, 0.2])
+        assert miss is None
+        assert other_model == [None]
+        stats = cache.stats()
+        assert stats.memory_hits == 1
+        assert stats.misses == 2
+
+    @pytest.mark.asyncio
+    async def test_trim_keeps_most_recently_used(self):
+        """Test that trimming deletes the rows past max_rows by least recent use."""
+        from sqlalchemy.dialects import postgresql
+        from src.db.schemas.embedding_cache import EmbeddingCacheEntry
+        from src.utils.cache_stats import trim_least_recently_used
+
+        session = MagicMock()
+        session.execute = AsyncMock()
+
+        await trim_least_recently_used(session, EmbeddingCacheEntry, 100)
+
+        sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert sql.startswith("DELETE FROM embedding_cache")
+        assert "ORDER BY embedding_cache.last_used_at DESC" in sql
+        assert "OFFSET" in sql
+
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self, cache):
+        """Test that the memory tier evicts least recently used entries."""
+        await cache.put_many("m", ["a", "b"], [[1.0], [2.0]])
+        await cache.get_many("m", ["a"])
+        await cache.put_many("m", ["c"], [[3.0]])
+
+        a, b, c = await cache.get_many("m", ["a", "b", "c"])
+
+        assert a is not None and c is not None
+        assert b is None
+
+    @pytest.mark.asyncio
+    async def test_processor_encodes_only_misses(self, cache):
+        """Test that the processor encodes each unseen text once."""
+        with patch('src.processing.listing_processor.Processor.__init__'):
+            processor = ListingProcessor()
+            processor.embed_model_name = "m"
+            batcher = MagicMock()
+            batcher.embed_many = AsyncMock(side_effect=lambda texts: [np.array([1.0]) for _ in texts])
+            processor._get_embedding_batcher = MagicMock(return_value=batcher)
+
+            with patch('src.processing.processor.get_embedding_cache', return_value=cache):
+                await processor.embed_texts_async(["Python", "python", "java"])
+                await processor.embed_texts_async(["python"])
+
+            batcher.embed_many.assert_called_once_with(["python", "java"])
@@ -0,0 +1,60 @@
+"""
+Unit tests for the fake Ollama server used by the LLM benchmarks
+"""
+import json
+
+from fastapi.testclient import TestClient
+
+from benchmarks.fake_ollama import FakeOllamaConfig, create_app, render_response
+from src.prompts.llama3.listing_keywords import PROMPT as PROMPT_LISTING_KEYWORDS
+from src.prompts.llama3.listing_keywords_batch import PROMPT as PROMPT_LISTING_KEYWORDS_BATCH
+from src.prompts.llama3.matching_keywords import PROMPT as KEYWORD_MATCHING_PROMPT
+
+class TestFakeOllama:
+    """Test prompt handling, failure injection and the chat protocol."""
+
+    def test_listing_keywords_come_from_the_listing(self):
+        """Test that keyword prompts are answered with words of the given text."""
+        prompt = PROMPT_LISTING_KEYWORDS.format("Senior Python developer, Django and PostgreSQL, Python daily")
+
+        keywords = render_response(prompt).splitlines()
+
+        assert keywords[0] == "python"
+        assert {"django", "postgresql"} <= set(keywords)
+
+    def test_batched_listing_keywords(self):
+        """Test that batched keyword prompts are answered with a JSON object per listing number."""
+        prompt = PROMPT_LISTING_KEYWORDS_BATCH.format("[1] Python and Django\n\n[2] Rust engineer")
+
+        assert json.loads(render_response(prompt)) == {"1": ["python", "django"], "2": ["rust", "engineer"]}
+
+    def test_missing_keywords(self):
+        """Test that missing keyword prompts return job keywords absent from the resume."""
+        prompt = KEYWORD_MATCHING_PROMPT.format("python\nsql", "python\ndocker\nkubernetes")
+
+        assert render_response(prompt).splitlines() == ["docker", "kubernetes"]
+
+    def test_chat_protocol_and_stats(self):
+        """Test that /api/chat answers like Ollama and requests are counted."""
+        client = TestClient(create_app(FakeOllamaConfig(first_token_ms=0, token_ms=0)))
+        prompt = PROMPT_LISTING_KEYWORDS.format("Rust and Go engineer")
+
+        response = client.post("/api/chat", json={
+            "model": "llama3",
+            "messages": [{"role": "user", "content": prompt}],
+            "stream": False
+        })
+
+        assert response.status_code == 200
+        assert response.json()["message"]["content"].splitlines() == ["rust", "go", "engineer"]
+        assert response.json()["done"] is True
+        assert client.get("/stats").json()["by_kind"] == {"listing_keywords": 1}
+
+    def test_failure_injection(self):
+        """Test that a failure rate of one answers every chat request with an error."""
+        client = TestClient(create_app(FakeOllamaConfig(failure_rate=1.0)))
+
+        response = client.post("/api/chat", json={"model": "llama3", "messages": [], "stream": False})
+
+        assert response.status_code == 500
+        assert "error" in response.json()
@@ -0,0 +1,117 @@
+"""
+Unit tests for the durable job queue
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.jobs.job_queue import JobQueue, ClaimedJob
+
+def _session_maker(session):
+    session_cm = MagicMock()
+    session_cm.__aenter__ = AsyncMock(return_value=session)
+    session_cm.__aexit__ = AsyncMock(return_value=False)
+    return MagicMock(return_value=session_cm)
+
+class TestJobQueue:
+    """Test claiming, completion, retries and dead-lettering of jobs."""
+
+    @pytest.fixture
+    def session(self):
+        session = MagicMock()
+        session.execute = AsyncMock()
+        session.commit = AsyncMock()
+        return session
+
+    @pytest.fixture
+    def queue(self):
+        return JobQueue("test", AsyncMock(), workers=2, lease_seconds=30, max_attempts=3, poll_interval=0.01)
+
+    def test_claim_skips_locked_rows(self, queue):
+        """Test that claiming is a single UPDATE over a SKIP LOCKED subquery, by priority."""
+        from sqlalchemy.dialects import postgresql
+
+        sql = str(queue._claim_statement().compile(dialect=postgresql.dialect()))
+
+        assert "FOR UPDATE SKIP LOCKED" in sql
+        assert "ORDER BY jobs.priority DESC" in sql
+        assert "RETURNING" in sql
+
+    @pytest.mark.asyncio
+    async def test_enqueue_in_caller_transaction(self, queue, session):
+        """Test that jobs added through a caller's session are left for the caller to commit."""
+        await queue.enqueue_many([{"a": 1}, {"a": 2}], priority=5, db_session=session)
+
+        session.execute.assert_awaited_once()
+        session.commit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_execute_completes_on_success(self, queue):
+        """Test that a successful job is completed."""
+        job = ClaimedJob(id=1, payload={"x": 1}, attempts=1, max_attempts=3)
+        with patch.object(queue, '_complete', AsyncMock()) as mock_complete, \
+             patch.object(queue, '_fail', AsyncMock()) as mock_fail:
+            await queue._execute(job)
+
+        queue._handler.assert_awaited_once_with({"x": 1})
+        mock_complete.assert_awaited_once_with(job)
+        mock_fail.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_execute_fails_on_error(self, queue):
+        """Test that a handler error is recorded as a failed attempt."""
+        queue._handler.side_effect = RuntimeError("boom")
+        job = ClaimedJob(id=1, payload={}, attempts=1, max_attempts=3)
+        with patch.object(queue, '_complete', AsyncMock()) as mock_complete, \
+             patch.object(queue, '_fail', AsyncMock()) as mock_fail:
+            await queue._execute(job)
+
+        mock_fail.assert_awaited_once_with(job, "boom")
+        mock_complete.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_fail_retries_then_dead_letters(self, queue, session):
+        """Test that failures are retried until max_attempts and then dead-lettered."""
+        with patch('src.jobs.job_queue.async_session_maker', _session_maker(session)):
+            await queue._fail(ClaimedJob(id=1, payload={}, attempts=1, max_attempts=3), "boom")
+            await queue._fail(ClaimedJob(id=1, payload={}, attempts=3, max_attempts=3), "boom")
+
+        retry, dead = (call.args[0].compile().params for call in session.execute.call_args_list)
+        assert retry["status"] == "pending"
+        assert dead["status"] == "dead"
+        assert dead["last_error"] == "boom"
+
+    @pytest.mark.asyncio
+    async def test_fail_requires_own_lease(self, queue, session):
+        """Test that a failure is only recorded while this worker still holds the job."""
+        from sqlalchemy.dialects import postgresql
+
+        with patch('src.jobs.job_queue.async_session_maker', _session_maker(session)):
+            await queue._fail(ClaimedJob(id=1, payload={}, attempts=1, max_attempts=3), "boom")
+
+        sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "jobs.locked_by = " in sql
+
+    @pytest.mark.asyncio
+    async def test_expired_final_attempt_is_dead_lettered(self, queue):
+        """Test that a job reclaimed after its last lease expired is not run again."""
+        job = ClaimedJob(id=1, payload={}, attempts=4, max_attempts=3)
+        with patch.object(queue, '_fail', AsyncMock()) as mock_fail:
+            await queue._execute(job)
+
+        queue._handler.assert_not_called()
+        mock_fail.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_workers_drain_claimed_jobs(self, queue):
+        """Test that workers keep claiming until the queue is empty."""
+        import asyncio
+
+        jobs = [ClaimedJob(id=i, payload={"i": i}, attempts=1, max_attempts=3) for i in range(3)]
+        claims = iter(jobs)
+        with patch.object(queue, '_claim', AsyncMock(side_effect=lambda: next(claims, None))), \
+             patch.object(queue, '_complete', AsyncMock()) as mock_complete:
+            await queue.start()
+            await asyncio.sleep(0.05)
+            await queue.stop()
+
+        assert mock_complete.await_count == 3
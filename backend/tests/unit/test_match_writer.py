@@ -0,0 +1,122 @@
+"""
+Unit tests for batched match persistence
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from sqlalchemy.exc import IntegrityError
+
+from src.matching.match_writer import MatchWriter
+from src.models.match import Match
+
+def _match(resume_id: str, listing_id: str, similarity: float = 0.8) -> Match:
+    return Match(resume_id=resume_id, listing_id=listing_id, missing_keywords=["go"], cosine_similarity=similarity)
+
+class TestMatchWriter:
+    """Test buffering, flushing and upserting of matches."""
+
+    @pytest.fixture
+    def session(self):
+        session = MagicMock()
+        session.execute = AsyncMock()
+        session.commit = AsyncMock()
+        session.rollback = AsyncMock()
+        return session
+
+    @pytest.fixture
+    def session_maker(self, session):
+        session_cm = MagicMock()
+        session_cm.__aenter__ = AsyncMock(return_value=session)
+        session_cm.__aexit__ = AsyncMock(return_value=False)
+        with patch('src.matching.match_writer.async_session_maker', MagicMock(return_value=session_cm)):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_concurrent_writes_share_a_batch(self, session, session_maker):
+        """Test that matches written in the same loop iteration go out in one upsert statement."""
+        writer = MatchWriter(max_batch_size=100)
+
+        await asyncio.gather(*(writer.write(_match("1", str(i))) for i in range(3)))
+
+        session.execute.assert_awaited_once()
+        session.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_writes_during_a_batch_form_the_next(self, session, session_maker):
+        """Test that matches arriving while a batch is written are flushed together when it commits."""
+        release = asyncio.Event()
+
+        async def slow_execute(statement):
+            await release.wait()
+
+        session.execute.side_effect = slow_execute
+        writer = MatchWriter(max_batch_size=100)
+        first = asyncio.create_task(writer.write(_match("1", "1")))
+        await asyncio.sleep(0.01)
+        rest = [asyncio.create_task(writer.write(_match("1", str(i)))) for i in range(2, 5)]
+        await asyncio.sleep(0.01)
+
+        assert session.execute.await_count == 1
+        release.set()
+        await asyncio.gather(first, *rest)
+
+        assert session.execute.await_count == 2
+        params = session.execute.call_args.args[0].compile().params
+        assert sorted(value for key, value in params.items() if key.startswith("listing_id")) == [2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_flush_by_size(self, session, session_maker):
+        """Test that a full batch is flushed without waiting for the loop iteration."""
+        writer = MatchWriter(max_batch_size=2)
+
+        await asyncio.gather(*(writer.write(_match("1", str(i))) for i in range(4)))
+
+        assert session.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_upsert_statement(self, session, session_maker):
+        """Test that duplicates in a batch collapse and conflicts update the existing row."""
+        from sqlalchemy.dialects import postgresql
+
+        writer = MatchWriter(max_batch_size=2)
+        await asyncio.gather(writer.write(_match("1", "2", 0.5)), writer.write(_match("1", "2", 0.9)))
+
+        statement = session.execute.call_args.args[0]
+        compiled = statement.compile(dialect=postgresql.dialect())
+        assert "ON CONFLICT (resume_id, listing_id) DO UPDATE" in str(compiled)
+        assert [value for key, value in compiled.params.items() if key.startswith("cosine_similarity")] == [0.9]
+
+    @pytest.mark.asyncio
+    async def test_foreign_key_violation_drops_orphans(self, session, session_maker):
+        """Test that matches for deleted resumes are dropped and the rest retried."""
+        existing_resumes = MagicMock()
+        existing_resumes.scalars.return_value.all.return_value = [1]
+        existing_listings = MagicMock()
+        existing_listings.scalars.return_value.all.return_value = [2, 3]
+        session.execute.side_effect = [
+            IntegrityError("insert", {}, Exception("fk")),
+            existing_resumes,
+            existing_listings,
+            MagicMock()
+        ]
+        writer = MatchWriter(max_batch_size=2)
+
+        await asyncio.gather(writer.write(_match("1", "2")), writer.write(_match("9", "3")))
+
+        session.rollback.assert_awaited_once()
+        retry = session.execute.call_args_list[3].args[0]
+        assert retry.compile().params["resume_id_m0"] == 1
+        assert "resume_id_m1" not in retry.compile().params
+
+    @pytest.mark.asyncio
+    async def test_write_error_propagates(self, session, session_maker):
+        """Test that every waiting writer sees a failed batch."""
+        session.execute.side_effect = RuntimeError("db down")
+        writer = MatchWriter(max_batch_size=2)
+
+        results = await asyncio.gather(
+            writer.write(_match("1", "2")), writer.write(_match("1", "3")), return_exceptions=True
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,278 @@
+"""
+Unit tests for candidate retrieval and the matching pipeline
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.matching.candidate_retrieval import find_listing_candidates, find_resume_candidates
+
+class TestCandidateRetrieval:
+    """Test nearest-neighbour candidate retrieval."""
+
+    @pytest.fixture
+    def db_session(self):
+        """Session whose second execute returns the candidate rows."""
+        session = MagicMock()
+        session.execute = AsyncMock()
+        return session
+
+    @pytest.mark.asyncio
+    async def test_listing_candidates_thresholded(self, db_session):
+        """Test that distances are converted to similarities and thresholded."""
+        rows = MagicMock()
+        rows.all.return_value = [("listing-1", "company-1", 0.1), ("listing-2", "company-2", 0.8)]
+        db_session.execute.side_effect = [MagicMock(), rows]
+
+        candidates = await find_listing_candidates(db_session, [0.1, 0.2], top_k=10, threshold=0.5)
+
+        assert len(candidates) == 1
+        listing, company, similarity = candidates[0]
+        assert listing == "listing-1"
+        assert similarity == pytest.approx(0.9)
+
+    @pytest.mark.asyncio
+    async def test_query_orders_by_distance_with_limit(self, db_session):
+        """Test that the query is an ORDER BY distance LIMIT k scan usable by the HNSW index."""
+        from sqlalchemy.dialects import postgresql
+
+        rows = MagicMock()
+        rows.all.return_value = []
+        db_session.execute.side_effect = [MagicMock(), rows]
+
+        await find_resume_candidates(db_session, [0.1, 0.2], top_k=7, threshold=0.3)
+
+        statement = db_session.execute.call_args_list[1].args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert "<=>" in sql
+        assert "ORDER BY distance" in sql
+        assert "LIMIT" in sql
+
+class TestListingIndex:
+    """Test the in-memory listing embedding index."""
+
+    @pytest.fixture
+    def index(self):
+        """Small index with three listings."""
+        from src.matching.listing_index import ListingIndex
+        index = ListingIndex(dimensions=2, initial_capacity=2)
+        index.add_many([1, 2, 3], [[1.0, 0.0], [0.6, 0.8], [0.0, 1.0]])
+        return index
+
+    def test_search_top_k(self, index):
+        """Test exact top-K search ordering and threshold."""
+        hits = index.search([1.0, 0.0], top_k=2, threshold=0.0)
+
+        assert [listing_id for listing_id, _ in hits] == [1, 2]
+        assert hits[1][1] == pytest.approx(0.6)
+        assert index.search([1.0, 0.0], top_k=3, threshold=0.5) == [(1, pytest.approx(1.0)), (2, pytest.approx(0.6))]
+
+    def test_update_and_remove_use_tombstones(self, index):
+        """Test that updates replace and removals hide listings until compaction."""
+        index.add(1, [0.0, 1.0])
+        index.remove(3)
+
+        hits = index.search([0.0, 1.0], top_k=5)
+
+        assert [listing_id for listing_id, _ in hits][:2] == [1, 2]
+        assert 3 not in [listing_id for listing_id, _ in hits]
+        assert index.tombstone_ratio == pytest.approx(2 / 4)
+
+    def test_compact_preserves_results(self, index):
+        """Test that compaction drops tombstones without changing results."""
+        index.add(2, [1.0, 0.0])
+        before = index.search([1.0, 0.0], top_k=5)
+
+        index.compact()
+
+        assert index.tombstone_ratio == 0.0
+        assert len(index) == 3
+        assert index.search([1.0, 0.0], top_k=5) == before
+
+    def test_exclude(self, index):
+        """Test excluding listing ids from a search."""
+        hits = index.search([1.0, 0.0], top_k=3, exclude={1})
+
+        assert 1 not in [listing_id for listing_id, _ in hits]
+
+    @pytest.mark.asyncio
+    async def test_load_keeps_changes_made_during_fetch(self, index):
+        """Test that listings added or removed while load reads the database survive the swap."""
+        from types import SimpleNamespace
+
+        async def fetch(since=None):
+            index.add(4, [1.0, 0.0])
+            index.remove(2)
+            return [
+                SimpleNamespace(id=1, embedding=[0.0, 1.0], scraped_at=None),
+                SimpleNamespace(id=2, embedding=[0.6, 0.8], scraped_at=None)
+            ]
+
+        with patch.object(index, '_fetch', fetch):
+            await index.load()
+
+        hits = index.search([1.0, 0.0], top_k=5, threshold=-1.0)
+        assert index.loaded
+        assert sorted(listing_id for listing_id, _ in hits) == [1, 4]
+        assert hits[0] == (4, pytest.approx(1.0))
+
+    @pytest.mark.asyncio
+    async def test_sync_replaces_changed_embeddings(self, index):
+        """Test that sync re-reads from its scraped_at watermark and only re-adds changed listings."""
+        from datetime import datetime, timezone
+        from types import SimpleNamespace
+
+        first = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        later = datetime(2024, 1, 2, tzinfo=timezone.utc)
+        fetch = AsyncMock(return_value=[SimpleNamespace(id=1, embedding=[1.0, 0.0], scraped_at=first)])
+        with patch.object(index, '_fetch', fetch):
+            await index.sync()
+            size = index._size
+            await index.sync()
+            assert index._size == size
+            fetch.return_value = [
+                SimpleNamespace(id=1, embedding=[1.0, 0.0], scraped_at=first),
+                SimpleNamespace(id=3, embedding=[1.0, 0.0], scraped_at=later)
+            ]
+            await index.sync()
+
+        assert fetch.await_args_list[1].args[0] < first
+        assert fetch.await_args_list[2].args[0] < first
+        assert index._size == size + 1
+        assert index.search([1.0, 0.0], top_k=2)[1] == (3, pytest.approx(1.0))
+
+class TestIncrementalMatching:
+    """Test that evaluated pairs are recorded and not scored again."""
+
+    def test_resume_needs_sweep(self):
+        """Test the resume watermark against its last embedding change."""
+        from datetime import datetime, timedelta
+        from src.matching.match_evaluations import resume_needs_sweep
+
+        now = datetime.now()
+        assert resume_needs_sweep(MagicMock(last_evaluated_at=None, embedding_updated_at=now))
+        assert resume_needs_sweep(MagicMock(last_evaluated_at=now - timedelta(minutes=1), embedding_updated_at=now))
+        assert not resume_needs_sweep(MagicMock(last_evaluated_at=now, embedding_updated_at=now - timedelta(minutes=1)))
+
+    @pytest.mark.asyncio
+    async def test_record_evaluations_upserts(self):
+        """Test that evaluations are written with a single ON CONFLICT statement."""
+        from sqlalchemy.dialects import postgresql
+        from src.matching.match_evaluations import record_evaluations
+
+        db_session = MagicMock()
+        db_session.execute = AsyncMock()
+
+        await record_evaluations(db_session, [(1, 10, 0.9), (1, 11, 0.2)])
+
+        db_session.execute.assert_awaited_once()
+        statement = db_session.execute.call_args.args[0]
+        sql = str(statement.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (resume_id, listing_id) DO UPDATE" in sql
+
+    @pytest.mark.asyncio
+    async def test_listing_records_below_threshold_pairs(self):
+        """Test that every scored pair is recorded while only good pairs are enqueued."""
+        from unittest.mock import patch
+        from src.scraping import listing_callbacks
+        from src.models.listing.listing_keyword_data import ListingKeywordData
+
+        listing = ListingKeywordData(
+            id=5, title="Engineer", company="Acme", description="desc", remote=True,
+            link="https://example.com/5", keywords=["python"], embedding=[0.1, 0.2]
+        )
+        good = MagicMock(id=1, user_id=1, file_name="a.pdf", file_path="", keywords="python", embedding=[0.1, 0.2])
+        poor = MagicMock(id=2, user_id=1, file_name="b.pdf", file_path="", keywords="cooking", embedding=[0.9, 0.1])
+        session = MagicMock()
+        session.commit = AsyncMock()
+        session_cm = MagicMock()
+        session_cm.__aenter__ = AsyncMock(return_value=session)
+        session_cm.__aexit__ = AsyncMock(return_value=False)
+        queue = MagicMock()
+        queue.enqueue_many = AsyncMock()
+
+        with patch.object(listing_callbacks, 'async_session_maker', return_value=session_cm), \
+             patch('src.matching.candidate_retrieval.find_resume_candidates', AsyncMock(return_value=[(good, 0.95), (poor, 0.1)])), \
+             patch('src.matching.match_evaluations.record_evaluations', AsyncMock()) as mock_record, \
+             patch('src.matching.matching_queue.get_matching_queue', return_value=queue):
+            await listing_callbacks.enqueue_matches(listing)
+
+        mock_record.assert_awaited_once_with(session, [(1, 5, 0.95), (2, 5, 0.1)])
+        pairs = queue.enqueue_many.call_args.args[0]
+        assert [(resume.id, similarity) for resume, _, similarity in pairs] == [(1, 0.95)]
+
+class TestMatchingQueue:
+    """Test the durable matching queue payloads."""
+
+    @pytest.fixture
+    def resume(self):
+        from src.models.resume.resume_keyword_data import ResumeKeywordData
+        return ResumeKeywordData(
+            id=1, user_id=1, file_name="a.pdf", file_path="a.pdf", content="long resume text",
+            keywords=["python"], embedding=[0.1, 0.2]
+        )
+
+    @pytest.fixture
+    def listing(self):
+        from src.models.listing.listing_keyword_data import ListingKeywordData
+        return ListingKeywordData(id=2, description="long description", keywords=["python"], embedding=[0.1, 0.2])
+
+    def test_payload_is_stripped(self, resume, listing):
+        """Test that queued pairs carry neither text bodies nor embeddings once scored."""
+        from src.matching.matching_queue import MatchingQueue
+
+        payload = MatchingQueue._to_payload(resume, listing, 0.9)
+
+        assert payload["resume"]["content"] == ""
+        assert payload["listing"]["description"] is None
+        assert payload["resume"]["embedding"] == []
+        assert payload["similarity"] == 0.9
+        assert resume.content == "long resume text"
+
+    def test_payload_keeps_embeddings_without_similarity(self, resume, listing):
+        """Test that embeddings are kept when the cosine stage still has to run."""
+        from src.matching.matching_queue import MatchingQueue
+
+        payload = MatchingQueue._to_payload(resume, listing, None)
+
+        assert payload["resume"]["embedding"] == [0.1, 0.2]
+        assert payload["listing"]["embedding"] == [0.1, 0.2]
+
+    @pytest.mark.asyncio
+    async def test_process_job_round_trip(self, resume, listing):
+        """Test that a job payload is matched and its match passed to the callbacks."""
+        from src.matching.matching_queue import MatchingQueue
+        from src.models.match import Match
+
+        match = Match(resume_id="1", listing_id="2", missing_keywords=[], cosine_similarity=0.9)
+        processor = MagicMock()
+        processor.match = AsyncMock(return_value=match)
+        callback = AsyncMock()
+        queue = MatchingQueue(processor, workers=1)
+        queue.register_on_match_callback(callback)
+
+        await queue._process_job(MatchingQueue._to_payload(resume, listing, 0.9))
+
+        queued_resume, queued_listing, similarity = processor.match.call_args.args
+        assert queued_resume.id == 1
+        assert queued_listing.keywords == ["python"]
+        assert similarity == 0.9
+        callback.assert_awaited_once_with(match)
+
+    @pytest.mark.asyncio
+    async def test_failed_match_write_fails_the_job(self, resume, listing):
+        """Test that a match that could not be stored fails the job instead of completing it."""
+        from src.matching.matching_queue import MatchingQueue
+        from src.matching.matching_callbacks import commit_match_to_db
+        from src.models.match import Match
+
+        match = Match(resume_id="1", listing_id="2", missing_keywords=[], cosine_similarity=0.9)
+        processor = MagicMock()
+        processor.match = AsyncMock(return_value=match)
+        writer = MagicMock()
+        writer.write = AsyncMock(side_effect=RuntimeError("db down"))
+        queue = MatchingQueue(processor, workers=1)
+        queue.register_on_match_callback(commit_match_to_db)
+
+        with patch('src.matching.matching_callbacks.get_match_writer', return_value=writer):
+            with pytest.raises(RuntimeError, match="db down"):
+                await queue._process_job(MatchingQueue._to_payload(resume, listing, 0.9))
@@ -48,7 +48,8 @@ class TestMatchingProcessor:
         with patch('config.settings') as mock_settings:
             mock_settings.MATCHING_COSINE_THRESHOLD = 0.9
             
-            with patch.object(processor, '_calculate_cosine_similarity') as mock_similarity:
+            with patch.object(processor, '_calculate_cosine_similarity') as mock_similarity, \
+                 patch('src.processing.matching_processor.ollama_api_call_async', AsyncMock(return_value=None)):
                 mock_similarity.return_value = 0.5  # Below threshold
                 
                 result = await processor.match(sample_resume_keyword_data, sample_listing_keyword_data)
@@ -91,6 +92,10 @@ class TestMatchingProcessor:
         # Should return 0 for zero vector
         similarity = processor._calculate_cosine_similarity(vec1, vec2)
         assert similarity == 0.0
+
+    def test_calculate_cosine_similarity_dimension_mismatch(self, processor):
+        """Test that mismatched dimensions score 0."""
+        assert processor._calculate_cosine_similarity([1.0, 0.0], [1.0, 0.0, 0.0]) == 0.0
     
     def test_find_missing_keywords(self, processor):
         """Test missing keywords identification."""
@@ -161,6 +166,18 @@ class TestMatchingProcessor:
             # Should return the simple set difference: ["rest", "api"]
             assert set(missing) == {"rest", "api"}
     
+    @pytest.mark.asyncio
+    async def test_match_raises_transient_llm_errors(self, processor, sample_resume_keyword_data, sample_listing_keyword_data):
+        """Test that an unreachable LLM fails the match so its job is retried."""
+        import httpx
+
+        with patch.object(processor, '_calculate_cosine_similarity', return_value=0.9):
+            with patch('src.processing.matching_processor.ollama_api_call_async') as mock_ollama:
+                mock_ollama.side_effect = httpx.ConnectError("connection refused")
+
+                with pytest.raises(httpx.ConnectError):
+                    await processor.match(sample_resume_keyword_data, sample_listing_keyword_data)
+
     def test_generate_summary(self, processor):
         """Test summary generation."""
         resume_keywords = ["python", "django", "sql"]
@@ -206,4 +223,73 @@ class TestMatchingProcessor:
             assert "2 matching skills" in summary
             assert "4 required" in summary
             assert "python" in summary
-            assert "django" in summary
\ No newline at end of file
+            assert "django" in summary
+
+class TestPrecomputedSimilarity:
+    """Test matching with a similarity taken from candidate retrieval."""
+
+    @pytest.fixture
+    def processor(self):
+        """Create matching processor without models."""
+        with patch('src.processing.matching_processor.Processor.__init__'):
+            return MatchingProcessor()
+
+    @pytest.mark.asyncio
+    async def test_match_uses_precomputed_similarity(self, processor, sample_resume_keyword_data, sample_listing_keyword_data):
+        """Test that a precomputed similarity skips the per-pair calculation."""
+        processor.llm_model_name = "test_model"
+        with patch.object(processor, '_calculate_cosine_similarity') as mock_similarity:
+            with patch.object(processor, '_find_missing_keywords_async', AsyncMock(return_value=[])):
+                with patch.object(processor, '_generate_summary_async', AsyncMock(return_value="summary")):
+                    result = await processor.match(sample_resume_keyword_data, sample_listing_keyword_data, 0.95)
+
+                    mock_similarity.assert_not_called()
+                    assert result.cosine_similarity == 0.95
+
+class TestLLMCache:
+    """Test the LLM response cache keys, expiry and use by the Ollama call."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create a memory-only LLM cache."""
+        from src.processing.llm_cache import LLMCache
+        return LLMCache(memory_entries=10, ttl_seconds=60, persistent=False)
+
+    @pytest.mark.asyncio
+    async def test_key_includes_model_version_and_temperature(self, cache):
+        """Test that a response is only served for the same model, template version and temperature."""
+        await cache.put("llama3", "1", 0.1, "prompt", "python\ndocker")
+
+        assert await cache.get("llama3", "1", 0.1, "prompt") == "python\ndocker"
+        assert await cache.get("llama3", "2", 0.1, "prompt") is None
+        assert await cache.get("llama3", "1", 0.3, "prompt") is None
+        assert await cache.get("mistral", "1", 0.1, "prompt") is None
+        stats = cache.stats()
+        assert (stats.memory_hits, stats.misses) == (1, 3)
+        assert stats.hit_rate == 0.25
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_misses(self):
+        """Test that entries older than the TTL are not served."""
+        from src.processing.llm_cache import LLMCache
+
+        cache = LLMCache(memory_entries=10, ttl_seconds=0, persistent=False)
+        await cache.put("llama3", "1", 0.1, "prompt", "python")
+
+        assert await cache.get("llama3", "1", 0.1, "prompt") is None
+
+    @pytest.mark.asyncio
+    async def test_repeated_prompt_calls_llm_once(self, cache):
+        """Test that a versioned prompt is answered from the cache the second time."""
+        from src.utils.processing_utils import ollama_api_call_async
+
+        with patch('src.processing.llm_cache.get_llm_cache', return_value=cache), \
+                patch('src.utils.processing_utils.get_ollama_client') as mock_get_client:
+            mock_get_client.return_value.chat = AsyncMock(return_value="docker\nkubernetes")
+
+            first = await ollama_api_call_async("prompt", "llama3", temperature=0.1, template_version="1")
+            second = await ollama_api_call_async("prompt", "llama3", temperature=0.1, template_version="1")
+            await ollama_api_call_async("prompt", "llama3", temperature=0.1)
+
+        assert first == second == "docker\nkubernetes"
+        assert mock_get_client.return_value.chat.await_count == 2
@@ -0,0 +1,89 @@
+"""
+Unit tests for the shared model registry
+"""
+import pytest
+from unittest.mock import MagicMock, patch
+
+from src.processing.model_registry import ModelRegistry, SPACY, KEYBERT, SENTENCE_TRANSFORMER
+
+class TestModelRegistry:
+    """Test loading, sharing and releasing of NLP models."""
+
+    @pytest.fixture
+    def registry(self):
+        """Create a registry whose loaders return mock models."""
+        registry = ModelRegistry()
+        registry._loaders = {
+            SPACY: MagicMock(side_effect=lambda name: MagicMock(name=f"spacy:{name}")),
+            SENTENCE_TRANSFORMER: MagicMock(side_effect=lambda name: MagicMock(name=f"st:{name}")),
+            KEYBERT: MagicMock(side_effect=lambda name: MagicMock(name=f"keybert:{name}")),
+        }
+        return registry
+
+    def test_acquire_loads_once(self, registry):
+        """Test that repeated acquires share one model instance."""
+        first = registry.acquire(SPACY, "en_core_web_sm")
+        second = registry.acquire(SPACY, "en_core_web_sm")
+
+        assert first is second
+        registry._loaders[SPACY].assert_called_once_with("en_core_web_sm")
+        assert registry.memory_report()["spacy:en_core_web_sm"].ref_count == 2
+
+    def test_keybert_shares_encoder(self, registry):
+        """Test that KeyBERT holds a reference to the shared SentenceTransformer."""
+        registry.acquire(KEYBERT, "all-MiniLM-L6-v2")
+        registry.acquire(SENTENCE_TRANSFORMER, "all-MiniLM-L6-v2")
+
+        registry._loaders[SENTENCE_TRANSFORMER].assert_called_once()
+        assert registry.memory_report()["sentence_transformer:all-MiniLM-L6-v2"].ref_count == 2
+
+    def test_release_unloads_at_zero(self, registry):
+        """Test that a model is unloaded when its last reference is released."""
+        registry.acquire(KEYBERT, "all-MiniLM-L6-v2")
+        registry.release(KEYBERT, "all-MiniLM-L6-v2")
+
+        assert not registry.is_loaded(KEYBERT, "all-MiniLM-L6-v2")
+        assert not registry.is_loaded(SENTENCE_TRANSFORMER, "all-MiniLM-L6-v2")
+
+    def test_unknown_kind(self, registry):
+        """Test that unknown model kinds are rejected."""
+        with pytest.raises(ValueError):
+            registry.acquire("unknown", "model")
+
+class TestLazyModelLoading:
+    """Test that processors defer model loading until first use."""
+
+    def test_processor_construction_loads_nothing(self):
+        """Test that constructing a processor does not touch the registry."""
+        from src.processing.listing_processor import ListingProcessor
+
+        with patch('src.processing.processor.get_model_registry') as mock_get_registry:
+            ListingProcessor()
+
+            mock_get_registry.assert_not_called()
+
+    def test_model_acquired_on_first_use(self):
+        """Test that a model is acquired once, when first accessed."""
+        from src.processing.listing_processor import ListingProcessor
+
+        with patch('src.processing.processor.get_model_registry') as mock_get_registry:
+            processor = ListingProcessor()
+            first = processor.embed_model
+            second = processor.embed_model
+
+            assert first is second
+            mock_get_registry.return_value.acquire.assert_called_once_with(
+                SENTENCE_TRANSFORMER, "all-MiniLM-L6-v2"
+            )
+
+    def test_readiness_endpoint(self):
+        """Test that the readiness endpoint reports warm-up state and loaded models."""
+        from fastapi.testclient import TestClient
+        from src.app import app
+
+        response = TestClient(app).get("/health/ready")
+
+        assert response.status_code == 200
+        body = response.json()
+        assert body["inference_ready"] is False
+        assert "models" in body
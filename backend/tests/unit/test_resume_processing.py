@@ -19,6 +19,7 @@ class TestResumeProcessor:
         with patch('src.processing.resume_processor.Processor.__init__'):
             processor = ResumeProcessor()
             processor.embed_text = mock_embedding_model.embed_text
+            processor.embed_text_async = mock_embedding_model.embed_text_async
             processor.extract_keywords = MagicMock(return_value=["python", "django", "fastapi"])
             processor.llm_model_name = "test_model"
             return processor
@@ -62,29 +63,6 @@ class TestResumeProcessor:
             
             assert isinstance(result, ResumeKeywordData)
             assert result.keywords == ["python", "django", "fastapi"]  # From fallback
-    
-    @pytest.mark.asyncio
-    async def test_process_resumes_multiple(self, processor):
-        """Test processing multiple resumes."""
-        resumes = [
-            Resume(id="1", user_id=1, file_name="resume1.pdf", file_path="/tmp/1.pdf", content="Python developer"),
-            Resume(id="2", user_id=1, file_name="resume2.pdf", file_path="/tmp/2.pdf", content="Java developer")
-        ]
-        
-        with patch.object(processor, 'process_resume') as mock_process:
-            mock_process.side_effect = [
-                ResumeKeywordData(id="1", user_id=1, file_name="resume1.pdf", file_path="/tmp/1.pdf", 
-                                content="Python developer", keywords=["python"], embedding=[0.1]),
-                ResumeKeywordData(id="2", user_id=1, file_name="resume2.pdf", file_path="/tmp/2.pdf",
-                                content="Java developer", keywords=["java"], embedding=[0.2])
-            ]
-            
-            results = await processor.process_resumes(resumes)
-            
-            assert len(results) == 2
-            assert results[0].keywords == ["python"]
-            assert results[1].keywords == ["java"]
-            assert mock_process.call_count == 2
 
 class TestResumeFileHandling:
     """Test resume file handling utilities."""
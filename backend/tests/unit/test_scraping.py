@@ -1,12 +1,14 @@
 """
 Unit tests for job scraping functionality
 """
+import asyncio
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 from datetime import datetime
 import httpx
 
 from src.scraping.scrapers.jooble_scraper import JoobleScraper
+from src.utils.resilient_http import ResilientHttpClient
 from src.models.listing.listing import Listing
 from src.models.query import Query
 
@@ -18,7 +20,7 @@ class TestJoobleScraper:
         """Create Jooble scraper instance."""
         with patch('config.settings') as mock_settings:
             mock_settings.JOOBLE_API_KEY = "test_api_key"
-            return JoobleScraper("test_api_key", "https://jooble.org")
+            return JoobleScraper("test_api_key", "https://jooble.org", http=ResilientHttpClient(base_delay=0))
     
     @pytest.fixture
     def sample_query(self):
@@ -112,6 +114,94 @@ class TestJoobleScraper:
             
             assert listings == []
     
+    @staticmethod
+    def _page_response(page, jobs_per_page, total_count, updated="2024-01-15T10:00:00Z"):
+        """Build a mock response for one page of distinct jobs."""
+        response = MagicMock()
+        response.raise_for_status.return_value = None
+        response.json.return_value = {
+            "totalCount": total_count,
+            "jobs": [
+                {"id": f"{page}-{i}", "title": "Developer", "updated": updated, "link": f"https://example.com/{page}/{i}"}
+                for i in range(jobs_per_page)
+            ]
+        }
+        return response
+
+    @pytest.mark.asyncio
+    async def test_execute_query_paginates_until_short_page(self, sample_query):
+        """Test that pages are fetched until one comes back short."""
+        scraper = JoobleScraper("test_api_key", "https://jooble.org", page_size=2, max_results=20, page_concurrency=2)
+        jobs_per_page = {1: 2, 2: 2, 3: 1, 4: 2}
+
+        async def post(url, json, **kwargs):
+            page = int(json["page"])
+            assert json["ResultOnPage"] == "2"
+            return self._page_response(page, jobs_per_page.get(page, 0), total_count=100)
+
+        with patch('httpx.AsyncClient.post', side_effect=post) as mock_post:
+            listings = await scraper.execute_query(sample_query)
+
+        assert len(listings) == 5
+        assert mock_post.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_execute_query_stops_at_watermark(self, sample_query):
+        """Test that paging stops at a page older than the stored watermark, which advances on commit."""
+        from datetime import timezone
+
+        scraper = JoobleScraper("test_api_key", "https://jooble.org", page_size=2, max_results=20, page_concurrency=1, use_watermarks=True)
+        updated = {1: "2024-02-01T00:00:00Z", 2: "2024-01-01T00:00:00Z"}
+
+        async def post(url, json, **kwargs):
+            page = int(json["page"])
+            return self._page_response(page, 2, total_count=100, updated=updated.get(page, "2023-01-01T00:00:00Z"))
+
+        with patch('httpx.AsyncClient.post', side_effect=post) as mock_post, \
+                patch('src.scraping.scrapers.jooble_scraper.get_watermark',
+                      AsyncMock(return_value=datetime(2024, 1, 10, tzinfo=timezone.utc))), \
+                patch('src.scraping.scrapers.jooble_scraper.set_watermark', AsyncMock()) as mock_set:
+            listings = await scraper.execute_query(sample_query)
+            mock_set.assert_not_awaited()
+            await scraper.commit_query(sample_query)
+
+        assert len(listings) == 4
+        assert mock_post.await_count == 2
+        assert mock_set.await_args.args[2] == datetime(2024, 2, 1, tzinfo=timezone.utc)
+
+    @pytest.mark.asyncio
+    async def test_incomplete_run_drops_uncommitted_watermark(self, sample_query):
+        """Test that a failed run's watermark is not committed after a later incomplete run."""
+        scraper = JoobleScraper("test_api_key", "https://jooble.org", page_size=2, max_results=20, page_concurrency=1, use_watermarks=True)
+        failing_page = None
+
+        async def post(url, json, **kwargs):
+            page = int(json["page"])
+            if page == failing_page:
+                raise httpx.ConnectError("Connection failed")
+            return self._page_response(page, 2 if page < 3 else 1, total_count=100)
+
+        with patch('httpx.AsyncClient.post', side_effect=post), \
+                patch('src.scraping.scrapers.jooble_scraper.get_watermark', AsyncMock(return_value=None)), \
+                patch('src.scraping.scrapers.jooble_scraper.set_watermark', AsyncMock()) as mock_set:
+            assert len(await scraper.execute_query(sample_query)) == 5
+            failing_page = 2
+            assert len(await scraper.execute_query(sample_query)) == 2
+            await scraper.commit_query(sample_query)
+
+        mock_set.assert_not_awaited()
+
+    def test_watermark_key_is_stable(self):
+        """Test that equal queries share a watermark key regardless of keyword order and sources are kept apart."""
+        from src.scraping.scrape_watermarks import query_watermark_key
+
+        query = Query(keywords=("python",), location="Berlin")
+
+        assert query_watermark_key("jooble", query) == query_watermark_key("jooble", Query(keywords=("python",), location="Berlin"))
+        assert query_watermark_key("jooble", query) != query_watermark_key("other", query)
+        assert query_watermark_key("jooble", query) != query_watermark_key("jooble", Query(keywords=("python",)))
+        assert query_watermark_key("jooble", Query(keywords=("python", "sql"))) == query_watermark_key("jooble", Query(keywords=("sql", "python")))
+
     def test_parse_response_empty(self, scraper):
         """Test parsing empty response."""
         empty_response = {"jobs": []}
@@ -229,14 +319,21 @@ class TestProcessingUtils:
         
         assert kw_list == []
     
+    def test_vector_to_list(self):
+        """Test converting pgvector values to float lists."""
+        import numpy as np
+        from src.utils.processing_utils import vector_to_list
+
+        assert vector_to_list(np.array([0.5, 0.25], dtype=np.float32)) == [0.5, 0.25]
+        assert vector_to_list(None) == []
+
     @pytest.mark.asyncio
     async def test_ollama_api_call_async_success(self):
         """Test successful Ollama API call."""
-        with patch('src.utils.processing_utils.ollama') as mock_ollama:
+        with patch('src.utils.processing_utils.get_ollama_client') as mock_get_client:
             from src.utils.processing_utils import ollama_api_call_async
             
-            mock_response = {"message": {"content": "python, django, fastapi"}}
-            mock_ollama.chat.return_value = mock_response
+            mock_get_client.return_value.chat = AsyncMock(return_value="python, django, fastapi")
             
             result = await ollama_api_call_async("Test prompt", "llama3")
             
@@ -261,11 +358,618 @@ class TestProcessingUtils:
         with patch('config.settings') as mock_settings:
             mock_settings.OLLAMA_ENABLED = True
             
-            with patch('src.utils.processing_utils.ollama') as mock_ollama:
+            with patch('src.utils.processing_utils.get_ollama_client') as mock_get_client:
                 from src.utils.processing_utils import ollama_api_call_async
                 
-                mock_ollama.chat.side_effect = Exception("API Error")
+                mock_get_client.return_value.chat = AsyncMock(side_effect=Exception("API Error"))
                 
                 # The function should handle the exception and re-raise it
                 with pytest.raises(Exception, match="API Error"):
-                    await ollama_api_call_async("Test prompt", "llama3")
\ No newline at end of file
+                    await ollama_api_call_async("Test prompt", "llama3")
+class TestListingIngestion:
+    """Test batched listing and company writes."""
+
+    @pytest.fixture
+    def session(self):
+        session = MagicMock()
+        session.execute = AsyncMock()
+        session.commit = AsyncMock()
+        return session
+
+    @pytest.fixture
+    def session_maker(self, session):
+        session_cm = MagicMock()
+        session_cm.__aenter__ = AsyncMock(return_value=session)
+        session_cm.__aexit__ = AsyncMock(return_value=False)
+        with patch('src.scraping.listing_ingestion.async_session_maker', MagicMock(return_value=session_cm)):
+            yield
+
+    def _listing(self, link, company="Acme"):
+        from src.models.listing.listing_keyword_data import ListingKeywordData
+        return ListingKeywordData(
+            id=None, title="Engineer", company=company, description="desc", link=link,
+            keywords=["python"], embedding=[0.1, 0.2]
+        )
+
+    def _result(self, rows):
+        result = MagicMock()
+        result.all.return_value = rows
+        return result
+
+    @pytest.mark.asyncio
+    async def test_ingest_batch(self, session, session_maker):
+        """Test that a batch costs one company upsert, one listing upsert and one commit."""
+        from src.scraping.listing_ingestion import ListingIngestor
+
+        listing_rows = [
+            MagicMock(id=10, link="https://a", inserted=True),
+            MagicMock(id=11, link="https://b", inserted=False)
+        ]
+        session.execute.side_effect = [
+            self._result([(1, "Acme")]),
+            self._result(listing_rows),
+            MagicMock()
+        ]
+        ingestor = ListingIngestor()
+
+        committed = await ingestor.ingest([
+            self._listing("https://a"), self._listing("https://b"), self._listing("https://c")
+        ])
+
+        assert [(listing.id, listing.link) for listing in committed] == [(10, "https://a"), (11, "https://b")]
+        assert session.execute.await_count == 3
+        session.commit.assert_awaited_once()
+        invalidation = str(session.execute.call_args_list[2].args[0])
+        assert "DELETE FROM match_evaluations" in invalidation
+
+    @pytest.mark.asyncio
+    async def test_company_ids_cached(self, session, session_maker):
+        """Test that a known company costs no query in later batches."""
+        from src.scraping.listing_ingestion import ListingIngestor
+
+        session.execute.side_effect = [
+            self._result([(1, "Acme")]),
+            self._result([MagicMock(id=10, link="https://a", inserted=True)]),
+            self._result([MagicMock(id=11, link="https://b", inserted=True)])
+        ]
+        ingestor = ListingIngestor()
+
+        await ingestor.ingest([self._listing("https://a")])
+        await ingestor.ingest([self._listing("https://b")])
+
+        assert session.execute.await_count == 3
+
+    def test_upsert_statement(self):
+        """Test that listings upsert on link and only rewrite changed rows."""
+        from sqlalchemy.dialects import postgresql
+        from src.scraping.listing_ingestion import ListingIngestor
+
+        row = ListingIngestor._to_row(self._listing("https://a"), company_id=1)
+        sql = str(ListingIngestor._upsert_statement([row]).compile(dialect=postgresql.dialect()))
+
+        assert "ON CONFLICT (link) DO UPDATE" in sql
+        assert "IS DISTINCT FROM" in sql
+        assert "RETURNING listings.id, listings.link, xmax = 0 AS inserted" in sql
+
+class TestListingDedup:
+    """Test skipping of already-known listings before processing."""
+
+    def _listing(self, link, description="desc"):
+        return Listing(title="Engineer", company="Acme", description=description, link=link)
+
+    def test_content_hash_ignores_whitespace(self):
+        """Test that formatting-only differences hash the same."""
+        from src.scraping.listing_dedup import listing_content_hash
+
+        assert listing_content_hash("Engineer", "Acme", "Build  things\n") == listing_content_hash("Engineer", "Acme", "Build things")
+        assert listing_content_hash("Engineer", "Acme", "Build things") != listing_content_hash("Engineer", "Acme", "Break things")
+
+    @pytest.mark.asyncio
+    async def test_filter_unseen_listings(self):
+        """Test that only new or changed listings are kept, once per link."""
+        from src.scraping.listing_dedup import filter_unseen_listings, listing_content_hash
+
+        result = MagicMock()
+        result.all.return_value = [
+            ("https://same", listing_content_hash("Engineer", "Acme", "desc")),
+            ("https://changed", listing_content_hash("Engineer", "Acme", "old desc")),
+        ]
+        session = MagicMock()
+        session.execute = AsyncMock(return_value=result)
+        session_cm = MagicMock()
+        session_cm.__aenter__ = AsyncMock(return_value=session)
+        session_cm.__aexit__ = AsyncMock(return_value=False)
+
+        with patch('src.scraping.listing_dedup.async_session_maker', MagicMock(return_value=session_cm)):
+            unseen = await filter_unseen_listings([
+                self._listing("https://same"),
+                self._listing("https://changed"),
+                self._listing("https://new"),
+                self._listing("https://new"),
+            ])
+
+        assert [listing.link for listing in unseen] == ["https://changed", "https://new"]
+        session.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_filter_runs_before_processing(self):
+        """Test that filtered-out listings never reach the listing processor."""
+        from src.scraping.scraping_manager import ScrapingManager
+
+        scraper = MagicMock()
+        scraper.execute_query = AsyncMock(return_value=[self._listing("https://a"), self._listing("https://b")])
+        scraper.commit_query = AsyncMock()
+        query_manager = MagicMock(spec=["get_queries"])
+        query_manager.get_queries.return_value = [Query(keywords=("python",))]
+        processor = MagicMock()
+        processor.extract_listing_keywords_async = AsyncMock(return_value=[])
+        processor.embed_listings_async = AsyncMock(return_value=[])
+        manager = ScrapingManager(scraper, query_manager, processor)
+        manager.register_listing_filter(AsyncMock(side_effect=lambda listings: listings[:1]))
+
+        await manager.run_scraper()
+
+        processed = processor.extract_listing_keywords_async.call_args.args[0]
+        assert [listing.link for listing in processed] == ["https://a"]
+
+class TestConcurrentScraping:
+    """Test concurrent query execution, rate limiting and the shared HTTP client."""
+
+    @pytest.mark.asyncio
+    async def test_token_bucket_limits_rate(self):
+        """Test that requests beyond the burst wait for new tokens."""
+        import time
+        from src.utils.rate_limiter import TokenBucket
+
+        bucket = TokenBucket(rate=50, capacity=2)
+        start = time.monotonic()
+        for _ in range(4):
+            await bucket.acquire()
+
+        assert time.monotonic() - start >= 0.03
+
+    @pytest.mark.asyncio
+    async def test_queries_run_concurrently(self):
+        """Test that queries overlap up to the configured concurrency."""
+        import asyncio
+        from src.scraping.scraping_manager import ScrapingManager
+
+        in_flight = 0
+        peak = 0
+
+        async def execute_query(query):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return []
+
+        scraper = MagicMock()
+        scraper.execute_query = execute_query
+        scraper.commit_query = AsyncMock()
+        query_manager = MagicMock(spec=["get_queries"])
+        query_manager.get_queries.return_value = [Query(keywords=(f"kw{i}",)) for i in range(6)]
+        rate_limiter = MagicMock()
+        rate_limiter.acquire = AsyncMock()
+        manager = ScrapingManager(scraper, query_manager, MagicMock(), rate_limiter=rate_limiter, query_concurrency=3)
+
+        await manager.run_scraper()
+
+        assert peak == 3
+        assert rate_limiter.acquire.await_count == 6
+
+    @pytest.mark.asyncio
+    async def test_http_client_is_shared(self):
+        """Test that requests reuse one pooled client until it is closed."""
+        from src.utils.http_client import get_http_client, close_http_client
+
+        client = get_http_client()
+        assert get_http_client() is client
+        await close_http_client()
+        assert client.is_closed
+        assert get_http_client() is not client
+        await close_http_client()
+
+class TestScrapingPipeline:
+    """Test the staged scrape, process, persist and match pipeline."""
+
+    @pytest.mark.asyncio
+    async def test_items_stream_through_stages(self):
+        """Test that early items finish the pipeline before later ones are fetched."""
+        import asyncio
+        from src.scraping.pipeline import PipelineStage, run_pipeline
+
+        events = []
+
+        async def fetch(item):
+            events.append(f"fetch {item}")
+            await asyncio.sleep(0.01 * item)
+            return item
+
+        async def persist(item):
+            events.append(f"persist {item}")
+            return item
+
+        emitted = await run_pipeline(
+            [1, 2, 3, 4],
+            [PipelineStage("fetch", fetch), PipelineStage("persist", persist)],
+            channel_size=1
+        )
+
+        assert emitted == {"fetch": 4, "persist": 4}
+        assert events.index("persist 1") < events.index("fetch 3")
+
+    @pytest.mark.asyncio
+    async def test_failing_item_is_dropped(self):
+        """Test that an error in one stage drops only that item."""
+        from src.scraping.pipeline import PipelineStage, run_pipeline
+
+        async def parse(item):
+            if item == 2:
+                raise ValueError("bad item")
+            return item
+
+        seen = []
+
+        async def collect(item):
+            seen.append(item)
+            return item
+
+        await run_pipeline(
+            [1, 2, 3],
+            [PipelineStage("parse", parse, 2), PipelineStage("collect", collect)]
+        )
+
+        assert sorted(seen) == [1, 3]
+
+    @pytest.mark.asyncio
+    async def test_failing_feed_cancels_stages(self):
+        """Test that an error while iterating the items is raised and no stage is left running."""
+        import asyncio
+        from src.scraping.pipeline import PipelineStage, run_pipeline
+
+        def items():
+            yield 1
+            raise RuntimeError("Set changed size during iteration")
+
+        async def slow(item):
+            await asyncio.sleep(10)
+            return item
+
+        with pytest.raises(RuntimeError):
+            await asyncio.wait_for(run_pipeline(items(), [PipelineStage("slow", slow)]), timeout=1)
+
+        pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        assert pending == []
+
+    @pytest.mark.asyncio
+    async def test_manager_runs_batch_then_listing_callbacks(self):
+        """Test that processed batches are persisted before their listings are matched."""
+        from src.scraping.scraping_manager import ScrapingManager
+
+        listing = MagicMock()
+        processed = MagicMock()
+        scraper = MagicMock()
+        scraper.execute_query = AsyncMock(return_value=[listing])
+        scraper.commit_query = AsyncMock(side_effect=lambda query: calls.append(("commit", query)))
+        query_manager = MagicMock(spec=["get_queries"])
+        query_manager.get_queries.return_value = [Query(keywords=("python",))]
+        processor = MagicMock()
+        processor.extract_listing_keywords_async = AsyncMock(return_value=[["python"]])
+        processor.embed_listings_async = AsyncMock(return_value=[processed])
+        calls = []
+
+        async def persist(listings):
+            calls.append(("persist", listings))
+            return listings
+
+        async def match(listing):
+            calls.append(("match", listing))
+
+        manager = ScrapingManager(scraper, query_manager, processor)
+        manager.register_batch_callback(persist)
+        manager.register_listing_callback(match)
+
+        await manager.run_scraper()
+
+        processor.embed_listings_async.assert_awaited_once_with([listing], [["python"]])
+        assert calls == [
+            ("persist", [processed]),
+            ("commit", Query(keywords=("python",))),
+            ("match", processed)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_failed_persist_does_not_commit_query(self):
+        """Test that a query whose listings were not stored is not committed, keeping its watermark."""
+        from src.scraping.scraping_manager import ScrapingManager
+
+        scraper = MagicMock()
+        scraper.execute_query = AsyncMock(return_value=[MagicMock()])
+        scraper.commit_query = AsyncMock()
+        query_manager = MagicMock(spec=["get_queries"])
+        query_manager.get_queries.return_value = [Query(keywords=("python",))]
+        processor = MagicMock()
+        processor.extract_listing_keywords_async = AsyncMock(return_value=[["python"]])
+        processor.embed_listings_async = AsyncMock(return_value=[MagicMock()])
+        async def persist(listings):
+            raise RuntimeError("db down")
+
+        manager = ScrapingManager(scraper, query_manager, processor)
+        manager.register_batch_callback(persist)
+
+        await manager.run_scraper()
+
+        scraper.commit_query.assert_not_awaited()
+
+class TestResilientHttp:
+    """Test retries, Retry-After handling, the circuit breaker and request metrics."""
+
+    @staticmethod
+    def _response(status_code, headers=None):
+        return httpx.Response(status_code, headers=headers, request=httpx.Request("POST", "https://jooble.org/api/key"))
+
+    @pytest.mark.asyncio
+    async def test_retries_server_errors_honouring_retry_after(self):
+        """Test that a 503 is retried after the server's Retry-After delay."""
+        from src.utils.resilient_http import HttpMetrics
+
+        metrics = HttpMetrics()
+        client = ResilientHttpClient(max_retries=2, base_delay=0, metrics=metrics)
+        responses = [self._response(503, {"Retry-After": "0.01"}), self._response(200)]
+
+        with patch('httpx.AsyncClient.post', AsyncMock(side_effect=responses)) as mock_post, \
+                patch('src.utils.resilient_http.asyncio.sleep', AsyncMock()) as mock_sleep:
+            response = await client.post("https://jooble.org/api/key", json={})
+
+        assert response.status_code == 200
+        assert mock_post.await_count == 2
+        mock_sleep.assert_awaited_once_with(0.01)
+        snapshot = metrics.snapshot()["jooble.org"]
+        assert snapshot["errors"] == {"status_503": 1}
+        assert snapshot["retries"] == 1
+        assert snapshot["latency_seconds"]["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_client_errors_are_not_retried(self):
+        """Test that a 404 is returned to the caller without retrying."""
+        client = ResilientHttpClient(max_retries=3, base_delay=0)
+
+        with patch('httpx.AsyncClient.post', AsyncMock(return_value=self._response(404))) as mock_post:
+            response = await client.post("https://jooble.org/api/key", json={})
+
+        assert response.status_code == 404
+        assert mock_post.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_circuit_opens_after_repeated_failures(self):
+        """Test that an open circuit skips requests until the reset period has passed."""
+        from src.utils.resilient_http import CircuitOpenError
+
+        client = ResilientHttpClient(max_retries=0, failure_threshold=2, reset_seconds=60)
+
+        with patch('httpx.AsyncClient.post', AsyncMock(side_effect=httpx.ConnectError("down"))) as mock_post:
+            for _ in range(2):
+                with pytest.raises(httpx.ConnectError):
+                    await client.post("https://jooble.org/api/key", json={})
+            with pytest.raises(CircuitOpenError):
+                await client.post("https://jooble.org/api/key", json={})
+
+        assert mock_post.await_count == 2
+        assert client.breaker("https://jooble.org").is_open
+
+    def test_half_open_breaker_allows_one_trial(self):
+        """Test that after the reset period one trial request decides the breaker state."""
+        from src.utils.resilient_http import CircuitBreaker
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+        breaker.record_failure()
+
+        assert breaker.allow() is True
+        assert breaker.allow() is False
+        breaker.record_success()
+        assert breaker.allow() is True
+
+    @pytest.mark.asyncio
+    async def test_cancelled_trial_reopens_the_half_open_breaker(self):
+        """Test that cancelling the half-open trial request lets the next trial through."""
+        client = ResilientHttpClient(max_retries=0, failure_threshold=1, reset_seconds=0)
+        started = asyncio.Event()
+
+        async def hang(url, **kwargs):
+            started.set()
+            await asyncio.Event().wait()
+
+        with patch('httpx.AsyncClient.post', AsyncMock(side_effect=httpx.ConnectError("down"))):
+            with pytest.raises(httpx.ConnectError):
+                await client.post("https://jooble.org/api/key", json={})
+        with patch('httpx.AsyncClient.post', side_effect=hang):
+            trial = asyncio.create_task(client.post("https://jooble.org/api/key", json={}))
+            await started.wait()
+            trial.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await trial
+
+        assert client.breaker("https://jooble.org").allow() is True
+
+class TestOfflineScrapers:
+    """Test the replay scraper and the synthetic listing generator."""
+
+    def test_generator_is_deterministic_and_skewed(self):
+        """Test that postings depend only on seed and index, and common skills dominate."""
+        from collections import Counter
+        from src.scraping.scrapers.synthetic_scraper import SyntheticListingGenerator, SKILLS
+
+        reference_time = datetime(2024, 1, 1)
+        generator = SyntheticListingGenerator(seed=7, vocabulary_size=200, reference_time=reference_time)
+        jobs = list(generator.jobs(0, 300))
+
+        assert jobs[5] == SyntheticListingGenerator(seed=7, vocabulary_size=200, reference_time=reference_time).job(5)
+        assert len({job["link"] for job in jobs}) == 300
+        counts = Counter(skill for job in jobs for skill in SKILLS if skill in job["snippet"].split(", "))
+        assert counts.most_common(1)[0][0] in SKILLS[:5]
+
+    @pytest.mark.asyncio
+    async def test_synthetic_scraper_includes_query_keywords_and_wraps(self):
+        """Test that generated listings mention the query and repeat unchanged after the total."""
+        from src.scraping.scrapers.synthetic_scraper import SyntheticScraper
+
+        scraper = SyntheticScraper(listings_per_query=3, total_listings=6)
+        query = Query(keywords=("rust",))
+
+        first = await scraper.execute_query(query)
+        other = await scraper.execute_query(Query(keywords=("go",)))
+        await scraper.execute_query(query)
+        third = await scraper.execute_query(query)
+
+        assert len(first) == 3
+        assert all("rust" in listing.description for listing in first)
+        assert [(listing.link, listing.description) for listing in third] == [(listing.link, listing.description) for listing in first]
+        assert not {listing.link for listing in other} & {listing.link for listing in first}
+        assert first[0].salary_min is None or first[0].currency == "PLN"
+
+    @pytest.mark.asyncio
+    async def test_replay_scraper_serves_recordings_in_order(self, tmp_path):
+        """Test that recorded responses are replayed page by page and wrap around."""
+        import json
+        from src.scraping.scrapers.replay_scraper import ReplayScraper
+
+        for page in range(2):
+            job = {"id": page, "title": f"Job {page}", "link": f"https://example.com/{page}"}
+            (tmp_path / f"page_{page}.json").write_text(json.dumps({"jobs": [job]}))
+        scraper = ReplayScraper(str(tmp_path))
+        query = Query(keywords=("python",))
+
+        titles = [(await scraper.execute_query(query))[0].title for _ in range(3)]
+
+        assert titles == ["Job 0", "Job 1", "Job 0"]
+
+    @pytest.mark.asyncio
+    async def test_replay_scraper_injects_errors(self, tmp_path):
+        """Test that an error rate of one fails every query like a failed request."""
+        import json
+        from src.scraping.scrapers.replay_scraper import ReplayScraper
+
+        (tmp_path / "page.json").write_text(json.dumps({"jobs": [{"id": 1, "title": "Job"}]}))
+        scraper = ReplayScraper(str(tmp_path), error_rate=1.0)
+
+        assert await scraper.execute_query(Query(keywords=("python",))) == []
+
+    def test_registry_rejects_unknown_source(self):
+        """Test that an unknown scraper source is reported."""
+        from src.scraping.scraper_registry import create_scraper
+
+        with pytest.raises(ValueError):
+            create_scraper("unknown")
+
+class TestOllamaClient:
+    """Test the async Ollama client's in-flight limit, timeout and response handling."""
+
+    @staticmethod
+    def _response(content):
+        return httpx.Response(
+            200,
+            json={"message": {"role": "assistant", "content": content}, "done": True},
+            request=httpx.Request("POST", "http://ollama/api/chat")
+        )
+
+    @pytest.mark.asyncio
+    async def test_limits_requests_in_flight(self):
+        """Test that no more than max_in_flight requests are sent at once."""
+        import asyncio
+        from src.utils.ollama_client import OllamaClient
+
+        in_flight = 0
+        peak = 0
+
+        async def post(self, url, json):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return TestOllamaClient._response(f" {json['messages'][0]['content']} ")
+
+        client = OllamaClient("http://ollama", max_in_flight=2, timeout=5)
+        with patch('httpx.AsyncClient.post', post):
+            results = await asyncio.gather(*(client.chat(f"prompt {i}", "llama3") for i in range(6)))
+        await client.close()
+
+        assert peak == 2
+        assert results[3] == "prompt 3"
+
+    @pytest.mark.asyncio
+    async def test_timeout_is_enforced(self):
+        """Test that a request running past the timeout is cancelled."""
+        import asyncio
+        from src.utils.ollama_client import OllamaClient
+
+        async def post(self, url, json):
+            await asyncio.sleep(1)
+
+        client = OllamaClient("http://ollama", max_in_flight=1, timeout=0.01)
+        with patch('httpx.AsyncClient.post', post):
+            with pytest.raises(asyncio.TimeoutError):
+                await client.chat("prompt", "llama3")
+            # The slot is released, so the next call is not stuck behind the timed out one
+            with pytest.raises(asyncio.TimeoutError):
+                await client.chat("prompt", "llama3")
+        await client.close()
+
+class TestAggregatingQueryManager:
+    """Test that saving queries only writes this process's own changes."""
+
+    @pytest.mark.asyncio
+    async def test_save_upserts_merged_and_deletes_replaced(self):
+        """Test that a merge upserts the merged query, deletes the replaced one and never clears the table."""
+        from sqlalchemy.dialects import postgresql
+        from src.scraping.query_managers.aggregating_query_manager import AggregatingQueryManager, stored_query_key
+
+        manager = AggregatingQueryManager()
+        manager._loaded = True
+        original = Query(keywords=("python", "django", "sql"))
+        manager._queries = {original}
+        manager.add_query(Query(keywords=("python", "django", "sql", "docker")))
+
+        session = MagicMock()
+        session.execute = AsyncMock()
+        session.commit = AsyncMock()
+        session_cm = MagicMock()
+        session_cm.__aenter__ = AsyncMock(return_value=session)
+        session_cm.__aexit__ = AsyncMock(return_value=False)
+        with patch('src.db.session.async_session_maker', MagicMock(return_value=session_cm)):
+            await manager.save()
+            await manager.save()
+
+        delete_sql, insert_sql = (
+            str(call.args[0].compile(dialect=postgresql.dialect())) for call in session.execute.call_args_list
+        )
+        assert "WHERE stored_queries.query_key IN" in delete_sql
+        assert "ON CONFLICT (query_key) DO NOTHING" in insert_sql
+        session.commit.assert_awaited_once()
+        merged = next(iter(manager._queries))
+        assert set(merged.keywords) == {"python", "django", "sql", "docker"}
+        assert stored_query_key(merged) == stored_query_key(Query(keywords=tuple(sorted(merged.keywords))))
+
+    @pytest.mark.asyncio
+    async def test_reload_keeps_queries_on_failure_and_merges_unsaved_changes(self):
+        """Test that a failed reload keeps the current queries and a successful one keeps unsaved changes."""
+        from src.scraping.query_managers.aggregating_query_manager import AggregatingQueryManager
+
+        manager = AggregatingQueryManager()
+        manager._loaded = True
+        original = Query(keywords=("python", "django", "sql"))
+        manager._queries = {original}
+        manager.add_query(Query(keywords=("python", "django", "sql", "docker")))
+        manager.add_query(Query(keywords=("rust",)))
+        current = set(manager._queries)
+
+        with patch.object(manager, '_fetch_queries_from_db', AsyncMock(side_effect=OSError("db down"))):
+            await manager.reload()
+        assert manager._queries == current
+
+        stored = Query(keywords=("java",))
+        with patch.object(manager, '_fetch_queries_from_db', AsyncMock(return_value={original, stored})):
+            await manager.reload()
+        assert manager._queries == current | {stored}
@@ -0,0 +1,71 @@
+"""
+Unit tests for the standalone worker entry point
+"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src import worker
+from src.worker import parse_roles, ROLE_RESUME, ROLE_MATCH, ROLE_SCRAPE
+
+class TestWorkerRoles:
+    """Test role parsing and per-role startup."""
+
+    def test_parse_roles(self):
+        """Test repeated, comma separated and 'all' role arguments."""
+        assert parse_roles(["resume", "match"]) == {ROLE_RESUME, ROLE_MATCH}
+        assert parse_roles(["resume,scrape"]) == {ROLE_RESUME, ROLE_SCRAPE}
+        assert parse_roles(["all"]) == {ROLE_RESUME, ROLE_MATCH, ROLE_SCRAPE}
+        assert parse_roles([""]) == set()
+
+    def test_parse_unknown_role(self):
+        """Test that unknown roles are rejected."""
+        with pytest.raises(ValueError):
+            parse_roles(["resume", "mining"])
+
+    def test_main_rejects_unknown_role(self):
+        """Test that the command line exits on an unknown role."""
+        with pytest.raises(SystemExit):
+            worker.main(["--role", "mining"])
+
+    @pytest.mark.asyncio
+    async def test_match_role_starts_only_matching(self):
+        """Test that a match worker neither scrapes nor processes resumes."""
+        with patch.object(worker, 'setup_matching_queue', AsyncMock()) as mock_matching, \
+             patch.object(worker, 'setup_resume_processing_queue', AsyncMock()) as mock_resume, \
+             patch.object(worker, 'setup_query_manager', AsyncMock()) as mock_queries, \
+             patch.object(worker, 'setup_scrapers', MagicMock()) as mock_scrapers, \
+             patch.object(worker, 'start_warmup', MagicMock()), \
+             patch('src.scraping.scheduler.start_scraping_scheduler') as mock_scheduler:
+            await worker.start_workers({ROLE_MATCH})
+
+        mock_matching.assert_awaited_once()
+        mock_resume.assert_not_called()
+        mock_queries.assert_not_called()
+        mock_scrapers.assert_not_called()
+        mock_scheduler.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_no_roles_starts_nothing(self):
+        """Test that an API process without roles only serves requests."""
+        with patch.object(worker, 'setup_matching_queue', AsyncMock()) as mock_matching, \
+             patch.object(worker, 'setup_query_manager', AsyncMock()) as mock_queries:
+            await worker.start_workers(set())
+
+        mock_matching.assert_not_called()
+        mock_queries.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_listing_index_compacts_where_it_is_loaded(self):
+        """Test that the process loading the listing index also compacts it and stops it."""
+        with patch('src.matching.listing_index.load_listing_index', AsyncMock()) as mock_load, \
+             patch('src.matching.listing_index.compact_listing_index') as mock_compact, \
+             patch.object(worker.settings, 'LISTING_INDEX_COMPACT_INTERVAL_SECONDS', 0):
+            worker.start_listing_index()
+            for _ in range(5):
+                await asyncio.sleep(0)
+            await worker.stop_listing_index()
+
+        mock_load.assert_awaited_once()
+        assert mock_compact.call_count >= 1
+        assert worker._listing_index_task is None